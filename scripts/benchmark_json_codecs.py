@@ -0,0 +1,101 @@
+"""Compare JSON codec backends on representative core snapshot payloads."""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+from decimal import Decimal
+from typing import Any
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+
+
+def build_snapshot(holdings: int, transactions: int) -> dict[str, Any]:
+    asset_classes = ["Equity", "Fixed Income", "Cash", "Alternatives"]
+    return {
+        "portfolioId": "BENCH_001",
+        "asOfDate": "2026-02-24",
+        "snapshot": {
+            "overview": {
+                "total_market_value": Decimal("125000000.25"),
+                "total_cash": Decimal("2500000.00"),
+                "pnl_summary": {"total_pnl": Decimal("1200000.75")},
+            },
+            "holdings": {
+                "holdingsByAssetClass": {
+                    asset_class: [
+                        {
+                            "security_id": f"SEC{index:06d}",
+                            "instrument_name": f"Instrument {index} ({asset_class})",
+                            "quantity": Decimal(f"{index}.125000"),
+                            "market_value_base": Decimal(f"{index * 1000}.55"),
+                            "weight": index / holdings,
+                            "currency": "USD",
+                        }
+                        for index in range(holdings // len(asset_classes))
+                    ]
+                    for asset_class in asset_classes
+                }
+            },
+            "transactions": {
+                "transactionsByAssetClass": {
+                    asset_class: [
+                        {
+                            "transaction_id": f"TX{index:08d}",
+                            "transaction_date": "2026-01-15",
+                            "transaction_type": "BUY",
+                            "gross_transaction_amount": Decimal(f"{index * 10}.10"),
+                            "net_cost": index * 10.1,
+                        }
+                        for index in range(transactions // len(asset_classes))
+                    ]
+                    for asset_class in asset_classes
+                }
+            },
+        },
+    }
+
+
+def _best_of(repeat: int, call: Any) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    from app.codec import JSON_CODEC_BACKENDS, build_codec
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--holdings", type=int, default=20_000)
+    parser.add_argument("--transactions", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot = build_snapshot(args.holdings, args.transactions)
+    reference = build_codec("stdlib")
+    document = reference.dumps(snapshot)
+    decoded_reference = reference.loads(document)
+    print(f"payload: {len(document) / 1_000_000:.1f} MB")
+    print(f"{'backend':<10}{'encode ms':>12}{'decode ms':>12}")
+    for backend in JSON_CODEC_BACKENDS:
+        codec = build_codec(backend)
+        if codec.name != backend:
+            print(f"{backend:<10}{'not installed':>12}")
+            continue
+        if codec.loads(codec.dumps(snapshot)) != decoded_reference:
+            print(f"{backend:<10} output differs from stdlib")
+            return 1
+        encode = _best_of(args.repeat, lambda: codec.dumps(snapshot))
+        decode = _best_of(args.repeat, lambda: codec.loads(document))
+        print(f"{backend:<10}{encode * 1000:>12.1f}{decode * 1000:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
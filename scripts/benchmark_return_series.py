@@ -0,0 +1,96 @@
+"""Time daily return extraction from a lotus-performance TWR response as dict rows and as arrays."""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+
+
+def build_twr_response(days: int, as_of_date: str, seed: int) -> dict[str, Any]:
+    rng = random.Random(seed)
+    end = date.fromisoformat(as_of_date)
+    daily = [
+        {
+            "period": (end - timedelta(days=days - day - 1)).isoformat(),
+            "summary": {"period_return_pct": round(rng.gauss(0.03, 1.0), 6)},
+        }
+        for day in range(days)
+    ]
+    return {"results_by_period": {"EXPLICIT": {"breakdowns": {"daily": daily}}}}
+
+
+def dict_rows(daily_items: list[Any]) -> list[dict[str, object]]:
+    """The previous extraction: isinstance checks and one dict per day."""
+    rows: list[dict[str, object]] = []
+    for item in daily_items:
+        if not isinstance(item, dict):
+            continue
+        period = item.get("period")
+        summary = item.get("summary") if isinstance(item.get("summary"), dict) else {}
+        pct = summary.get("period_return_pct")
+        if not isinstance(period, str) or not isinstance(pct, (int, float)):
+            continue
+        rows.append({"date": period[:10], "value": pct})
+    return rows
+
+
+def measure(label: str, run: Callable[[], object], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        run()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {label:<38} {elapsed * 1000:8.3f} ms")
+    return elapsed
+
+
+def main() -> int:
+    from app.analytics.return_index import ReturnIndex
+    from app.analytics.return_series import ReturnSeries
+    from app.clients.columnar import to_columnar
+    from app.precision_policy import to_decimal
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=1096)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--as-of-date", default="2026-02-24")
+    args = parser.parse_args()
+
+    daily = build_twr_response(args.days, args.as_of_date, 1)["results_by_period"]["EXPLICIT"][
+        "breakdowns"
+    ]["daily"]
+    rows = dict_rows(daily)
+    series = ReturnSeries.from_twr_daily(daily)
+    print(f"daily returns: {args.days}")
+    print("extract")
+    measure("dict rows", lambda: dict_rows(daily), args.repeat)
+    measure("ReturnSeries", lambda: ReturnSeries.from_twr_daily(daily), args.repeat)
+    print("return index")
+    measure(
+        "from dict rows",
+        lambda: ReturnIndex.from_returns(
+            (str(item["date"])[:10], to_decimal(item["value"])) for item in rows
+        ),
+        args.repeat,
+    )
+    measure("from ReturnSeries", lambda: ReturnIndex.from_returns(series.decimals()), args.repeat)
+    print("risk request series")
+    measure("ReturnSeries.to_rows", series.to_rows, args.repeat)
+    measure("columnar from ReturnSeries", lambda: to_columnar(series, "date"), args.repeat)
+    print("memory")
+    row_bytes = sum(sys.getsizeof(row) for row in rows) + sys.getsizeof(rows)
+    series_bytes = series.ordinals.nbytes + series.values.nbytes
+    print(f"  {'dict rows (containers only)':<38} {row_bytes:>9,d} bytes")
+    print(f"  {'ReturnSeries buffers':<38} {series_bytes:>9,d} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
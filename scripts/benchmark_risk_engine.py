@@ -0,0 +1,49 @@
+"""Time the local risk engine on three-year daily return series for many portfolios."""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+
+
+def build_series(days: int, as_of_date: str, seed: int) -> list[tuple[str, Decimal]]:
+    rng = random.Random(seed)
+    end = date.fromisoformat(as_of_date)
+    business_days: list[str] = []
+    current = end
+    while len(business_days) < days:
+        if current.weekday() < 5:
+            business_days.append(current.isoformat())
+        current -= timedelta(days=1)
+    return [(day, Decimal(f"{rng.gauss(0.03, 1.0):.6f}")) for day in reversed(business_days)]
+
+
+def main() -> int:
+    from app.analytics.risk import risk_metrics
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--portfolios", type=int, default=2_000)
+    parser.add_argument("--days", type=int, default=756)
+    parser.add_argument("--as-of-date", default="2026-02-24")
+    args = parser.parse_args()
+
+    series = [build_series(args.days, args.as_of_date, seed) for seed in range(args.portfolios)]
+    started = time.perf_counter()
+    for returns_pct in series:
+        risk_metrics(returns_pct, args.as_of_date)
+    elapsed = time.perf_counter() - started
+    print(f"portfolios: {args.portfolios}  daily returns each: {args.days}")
+    print(f"total: {elapsed:.2f} s  per portfolio: {elapsed / args.portfolios * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+"""Compare row and columnar encodings of long daily series sent to lotus-performance and risk."""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable
+
+repo_root = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root / "src"))
+
+
+def build_valuation_points(days: int, as_of_date: str, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    end = date.fromisoformat(as_of_date)
+    market_value = 1_000_000.0
+    points = []
+    for day in range(days):
+        begin_mv = market_value
+        market_value = round(begin_mv * (1 + rng.gauss(0.0003, 0.01)), 2)
+        points.append(
+            {
+                "day": day + 1,
+                "perf_date": (end - timedelta(days=days - day - 1)).isoformat(),
+                "begin_mv": begin_mv,
+                "bod_cf": 0.0,
+                "eod_cf": 0.0,
+                "mgmt_fees": 0.0,
+                "end_mv": market_value,
+            }
+        )
+    return points
+
+
+def build_returns(days: int, as_of_date: str, seed: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    end = date.fromisoformat(as_of_date)
+    return [
+        {
+            "date": (end - timedelta(days=days - day - 1)).isoformat(),
+            "value": round(rng.gauss(0.03, 1.0), 6),
+        }
+        for day in range(days)
+    ]
+
+
+def measure(label: str, encode: Callable[[], bytes], repeat: int) -> tuple[int, float]:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = encode()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {label:<9} {len(body):>9,d} bytes  {elapsed * 1000:8.3f} ms")
+    return len(body), elapsed
+
+
+def main() -> int:
+    from app.clients.columnar import to_columnar
+    from app.codec import build_codec
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=1200)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--as-of-date", default="2026-02-24")
+    parser.add_argument("--codec", default="auto", help="auto, orjson, msgspec or stdlib")
+    args = parser.parse_args()
+
+    codec = build_codec(args.codec)
+    print(f"codec: {codec.name}  days: {args.days}")
+    series = [
+        ("valuation_points", "perf_date", build_valuation_points(args.days, args.as_of_date, 1)),
+        ("returns", "date", build_returns(args.days, args.as_of_date, 2)),
+    ]
+    for field, date_key, rows in series:
+        print(field)
+        row_bytes, row_seconds = measure(
+            "rows", lambda rows=rows: codec.dumps({field: rows}), args.repeat
+        )
+        columnar_bytes, columnar_seconds = measure(
+            "columnar",
+            lambda rows=rows, date_key=date_key: codec.dumps({field: to_columnar(rows, date_key)}),
+            args.repeat,
+        )
+        print(
+            f"  ratio     {row_bytes / columnar_bytes:9.1f}x bytes"
+            f"  {row_seconds / columnar_seconds:8.1f}x time (columnar includes the transpose)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,31 @@
+from datetime import date, timedelta
+
+NAMED_PERIODS = ("MTD", "QTD", "YTD", "ONE_YEAR", "THREE_YEAR", "FIVE_YEAR", "SI")
+
+_TRAILING_YEARS = {"ONE_YEAR": 1, "THREE_YEAR": 3, "FIVE_YEAR": 5}
+
+
+def _years_before(as_of: date, years: int) -> date:
+    if as_of.month == 2 and as_of.day == 29:
+        as_of = as_of.replace(day=28)
+    return as_of.replace(year=as_of.year - years)
+
+
+def period_start(period: str, as_of_date: str, inception_date: str | None = None) -> str:
+    """First day (ISO, inclusive) of a named period ending on ``as_of_date``.
+
+    Trailing periods (``ONE_YEAR``, ``THREE_YEAR``, ``FIVE_YEAR``) start the day after the same
+    date the given number of years earlier; ``SI`` starts on ``inception_date``.
+    """
+    as_of = date.fromisoformat(as_of_date)
+    if period == "MTD":
+        return as_of.replace(day=1).isoformat()
+    if period == "QTD":
+        return as_of.replace(month=(as_of.month - 1) // 3 * 3 + 1, day=1).isoformat()
+    if period == "YTD":
+        return as_of.replace(month=1, day=1).isoformat()
+    if period in _TRAILING_YEARS:
+        return (_years_before(as_of, _TRAILING_YEARS[period]) + timedelta(days=1)).isoformat()
+    if period == "SI" and inception_date:
+        return date.fromisoformat(inception_date[:10]).isoformat()
+    raise ValueError(f"Unsupported period: {period}")
@@ -0,0 +1,230 @@
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+from itertools import accumulate
+from operator import mul
+from typing import Callable, Iterable
+
+from prometheus_client import Counter, Gauge
+
+from app.analytics.periods import period_start
+from app.analytics.return_series import ReturnSeries
+from app.analytics.twr import HUNDRED, ONE, ZERO
+from app.config import settings
+
+DAYS_PER_YEAR = Decimal(365)
+
+RETURN_INDEX_CACHE_LOOKUPS = Counter(
+    "lotus_report_return_index_cache_lookups_total",
+    "Daily return index cache lookups by outcome (hit, miss, bypass).",
+    ["outcome"],
+)
+RETURN_INDEX_CACHE_ENTRIES = Gauge(
+    "lotus_report_return_index_cache_entries",
+    "Daily return index cache entries currently held.",
+)
+
+
+class ReturnIndex:
+    """Prefix products of daily growth factors for one portfolio's daily return series.
+
+    ``growth[k]`` is the product of ``1 + r / 100`` over the first ``k`` days (``growth[0]`` is
+    one), so the cumulative return between any two dates is one ratio of two entries found by
+    binary search, whatever the period length. ``covers_from`` is the first day the series was
+    calculated from (the first date in the index unless given); nothing is known before it.
+    """
+
+    __slots__ = ("_dates", "_growth", "_covers_from")
+
+    def __init__(
+        self,
+        dates: tuple[str, ...],
+        growth: tuple[Decimal, ...],
+        covers_from: str | None = None,
+    ):
+        if len(growth) != len(dates) + 1:
+            raise ValueError("Return index needs one growth factor per date plus the base")
+        self._dates = dates
+        self._growth = growth
+        self._covers_from = covers_from or (dates[0] if dates else "")
+
+    @classmethod
+    def from_returns(
+        cls,
+        returns_pct: Iterable[tuple[str, Decimal]],
+        covers_from: str | None = None,
+    ) -> "ReturnIndex":
+        series = sorted(returns_pct)
+        factors = (ONE + value / HUNDRED for _, value in series)
+        return cls(
+            tuple(day for day, _ in series),
+            tuple(accumulate(factors, mul, initial=ONE)),
+            covers_from,
+        )
+
+    @property
+    def covers_from(self) -> str:
+        return self._covers_from
+
+    @property
+    def first_date(self) -> str | None:
+        return self._dates[0] if self._dates else None
+
+    @property
+    def last_date(self) -> str | None:
+        return self._dates[-1] if self._dates else None
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def _bounds(self, start_date: str, end_date: str) -> tuple[int, int] | None:
+        first = bisect_left(self._dates, start_date)
+        last = bisect_right(self._dates, end_date)
+        return (first, last) if first < last else None
+
+    def cumulative_return(self, start_date: str, end_date: str) -> Decimal | None:
+        """Compounded percent return over the days from ``start_date`` to ``end_date``."""
+        bounds = self._bounds(start_date, end_date)
+        if bounds is None:
+            return None
+        first, last = bounds
+        return (self._growth[last] / self._growth[first] - ONE) * HUNDRED
+
+    def annualized_return(self, start_date: str, end_date: str) -> Decimal | None:
+        """Cumulative return scaled to a year over the calendar days actually covered.
+
+        Periods of a year or less are not annualized and return the cumulative return.
+        """
+        bounds = self._bounds(start_date, end_date)
+        if bounds is None:
+            return None
+        first, last = bounds
+        ratio = self._growth[last] / self._growth[first]
+        covered = date.fromisoformat(self._dates[last - 1]) - date.fromisoformat(self._dates[first])
+        days = covered.days + 1
+        if days <= DAYS_PER_YEAR or ratio <= ZERO:
+            return (ratio - ONE) * HUNDRED
+        return (ratio ** (DAYS_PER_YEAR / days) - ONE) * HUNDRED
+
+    def period_returns(
+        self,
+        period: str,
+        as_of_date: str,
+        start_date: str | None = None,
+        inception_date: str | None = None,
+    ) -> tuple[str, Decimal, Decimal] | None:
+        """Start date, cumulative and annualized return of a period ending on ``as_of_date``.
+
+        The period is named unless an explicit ``start_date`` is given, and starts no earlier than
+        ``inception_date``; ``SI`` starts on it and is not served without it. The returned start
+        is the first day actually covered. A period starting before :attr:`covers_from` gives
+        ``None`` rather than a return over a shorter window. Returns are unrounded.
+        """
+        if start_date:
+            start = start_date
+        elif period == "SI" and not inception_date:
+            return None
+        else:
+            start = period_start(period, as_of_date, inception_date)
+        if inception_date:
+            start = max(start, inception_date[:10])
+        if start < self._covers_from:
+            return None
+        cumulative = self.cumulative_return(start, as_of_date)
+        annualized = self.annualized_return(start, as_of_date)
+        if cumulative is None or annualized is None:
+            return None
+        return start, cumulative, annualized
+
+
+class _IndexEntry:
+    def __init__(
+        self,
+        returns: ReturnSeries,
+        index: ReturnIndex,
+        start_date: str,
+        expires_at: float,
+    ):
+        self.returns = returns
+        self.index = index
+        self.start_date = start_date
+        self.expires_at = expires_at
+
+
+class ReturnIndexCache:
+    """TTL and size bounded cache of daily return series and their index.
+
+    Keyed by portfolio and as-of date. Each entry remembers the first day its series was
+    calculated from and only serves requests whose window starts on or after it. Cached series are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _IndexEntry] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_entries > 0
+
+    def get(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        start_date: str | None = None,
+    ) -> tuple[ReturnSeries, ReturnIndex] | None:
+        if not self.enabled:
+            RETURN_INDEX_CACHE_LOOKUPS.labels(outcome="bypass").inc()
+            return None
+        key = (portfolio_id, as_of_date)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            RETURN_INDEX_CACHE_ENTRIES.set(len(self._entries))
+            entry = None
+        if entry is None or entry.start_date > (start_date or ""):
+            RETURN_INDEX_CACHE_LOOKUPS.labels(outcome="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        RETURN_INDEX_CACHE_LOOKUPS.labels(outcome="hit").inc()
+        return entry.returns, entry.index
+
+    def store(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        returns: ReturnSeries,
+        index: ReturnIndex,
+        start_date: str | None = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (portfolio_id, as_of_date)
+        expires_at = self._clock() + self._ttl_seconds
+        self._entries[key] = _IndexEntry(returns, index, start_date or "", expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        RETURN_INDEX_CACHE_ENTRIES.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        RETURN_INDEX_CACHE_ENTRIES.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+return_index_cache = ReturnIndexCache(
+    ttl_seconds=settings.return_index_cache_ttl_seconds,
+    max_entries=settings.return_index_cache_max_entries,
+)
@@ -0,0 +1,85 @@
+from array import array
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+from app.precision_policy import to_decimal
+
+
+class ReturnSeries:
+    """Daily percent returns held as two parallel typed arrays.
+
+    Dates are day ordinals in an ``array("l")`` and returns are doubles in an ``array("d")``, the
+    same numbers lotus-performance and the local TWR engine hand back. One series is built per
+    review and shared read-only by the return index, the local risk engine and the risk client,
+    which sends it columnar from the arrays or expands it to ``{"date", "value"}`` rows only for
+    a risk service that takes rows.
+    ``ordinals`` and ``values`` expose the buffers without copying.
+    """
+
+    __slots__ = ("_ordinals", "_pcts")
+
+    def __init__(self) -> None:
+        self._ordinals = array("l")
+        self._pcts = array("d")
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[str, Any]]) -> "ReturnSeries":
+        """Series of ``(ISO date, percent)`` pairs in the order given."""
+        series = cls()
+        for day, pct in pairs:
+            series._ordinals.append(date.fromisoformat(day[:10]).toordinal())
+            series._pcts.append(float(pct))
+        return series
+
+    @classmethod
+    def from_twr_daily(cls, daily_items: Iterable[object]) -> "ReturnSeries":
+        """Series of a lotus-performance daily breakdown in one pass.
+
+        Items without a date, or without a numeric ``summary.period_return_pct``, are skipped.
+        """
+        series = cls()
+        ordinals, pcts = series._ordinals, series._pcts
+        for item in daily_items:
+            if not isinstance(item, dict):
+                continue
+            period = item.get("period")
+            summary = item.get("summary")
+            if not isinstance(period, str) or not isinstance(summary, dict):
+                continue
+            pct = summary.get("period_return_pct")
+            if not isinstance(pct, (int, float)):
+                continue
+            try:
+                ordinal = date.fromisoformat(period[:10]).toordinal()
+            except ValueError:
+                continue
+            ordinals.append(ordinal)
+            pcts.append(pct)
+        return series
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    @property
+    def ordinals(self) -> memoryview:
+        return memoryview(self._ordinals).toreadonly()
+
+    @property
+    def values(self) -> memoryview:
+        return memoryview(self._pcts).toreadonly()
+
+    def dates(self) -> Iterator[str]:
+        return (date.fromordinal(ordinal).isoformat() for ordinal in self._ordinals)
+
+    def pairs(self) -> Iterator[tuple[str, Any]]:
+        """``(ISO date, percent)`` pairs, percents as stored."""
+        return zip(self.dates(), self._pcts)
+
+    def decimals(self) -> Iterator[tuple[str, Decimal]]:
+        """``(ISO date, Decimal percent)`` pairs for Decimal analytics."""
+        return ((day, to_decimal(pct)) for day, pct in self.pairs())
+
+    def to_rows(self) -> list[dict[str, object]]:
+        """Wire form used by the risk service: one ``{"date", "value"}`` object per day."""
+        return [{"date": day, "value": pct} for day, pct in self.pairs()]
@@ -0,0 +1,135 @@
+import heapq
+from decimal import ROUND_CEILING, Decimal
+from typing import Callable, Iterable, Sequence
+
+from app.analytics.periods import period_start
+from app.analytics.twr import HUNDRED, ONE, ZERO
+from app.precision_policy import quantize_risk
+
+TRADING_DAYS_PER_YEAR = Decimal(252)
+VAR_CONFIDENCE = Decimal("0.95")
+RISK_PERIODS = ("YTD", "THREE_YEAR")
+RISK_METRICS = ("VOLATILITY", "SHARPE", "DRAWDOWN", "VAR")
+
+_ANNUALIZATION_SQRT = TRADING_DAYS_PER_YEAR.sqrt()
+
+
+def _mean(returns_pct: Sequence[Decimal]) -> Decimal:
+    return sum(returns_pct, ZERO) / len(returns_pct)
+
+
+def volatility(returns_pct: Sequence[Decimal]) -> Decimal | None:
+    """Annualized sample standard deviation of daily percent returns (percent)."""
+    if len(returns_pct) < 2:
+        return None
+    mean = _mean(returns_pct)
+    squares = sum(((value - mean) ** 2 for value in returns_pct), ZERO)
+    return (squares / (len(returns_pct) - 1)).sqrt() * _ANNUALIZATION_SQRT
+
+
+def sharpe_ratio(returns_pct: Sequence[Decimal]) -> Decimal | None:
+    """Annualized mean return over annualized volatility, with a zero risk-free rate."""
+    annualized_volatility = volatility(returns_pct)
+    if annualized_volatility is None or annualized_volatility == ZERO:
+        return None
+    return _mean(returns_pct) * TRADING_DAYS_PER_YEAR / annualized_volatility
+
+
+def max_drawdown(returns_pct: Sequence[Decimal]) -> Decimal | None:
+    """Deepest peak-to-trough fall of the compounded series in percent (zero or negative).
+
+    One pass with a running peak; the series starts from a wealth index of one.
+    """
+    if not returns_pct:
+        return None
+    wealth = peak = ONE
+    deepest = ZERO
+    for value in returns_pct:
+        wealth *= ONE + value / HUNDRED
+        if wealth > peak:
+            peak = wealth
+        else:
+            deepest = min(deepest, wealth / peak - ONE)
+    return deepest * HUNDRED
+
+
+def historical_var(
+    returns_pct: Sequence[Decimal], confidence: Decimal = VAR_CONFIDENCE
+) -> Decimal | None:
+    """One-day historical VaR in percent, reported as a positive loss.
+
+    The loss is the ``ceil(n * (1 - confidence))``-th worst daily return, picked with a bounded
+    heap instead of sorting the whole series.
+    """
+    if not returns_pct:
+        return None
+    tail = int((len(returns_pct) * (ONE - confidence)).to_integral_value(ROUND_CEILING))
+    return -heapq.nsmallest(max(1, tail), returns_pct)[-1]
+
+
+def window_start(period: str, as_of_date: str, inception_date: str | None = None) -> str:
+    """First day (ISO) of ``period``'s risk window, never before ``inception_date``."""
+    start = period_start(period, as_of_date, inception_date)
+    if inception_date:
+        return max(start, inception_date[:10])
+    return start
+
+
+_CALCULATORS: dict[str, Callable[[Sequence[Decimal]], Decimal | None]] = {
+    "VOLATILITY": volatility,
+    "SHARPE": sharpe_ratio,
+    "DRAWDOWN": max_drawdown,
+    "VAR": historical_var,
+}
+
+
+def risk_metrics(
+    returns_pct: Iterable[tuple[str, Decimal]],
+    as_of_date: str,
+    periods: Sequence[str] = RISK_PERIODS,
+    metrics: Sequence[str] = RISK_METRICS,
+    inception_date: str | None = None,
+) -> dict[str, dict[str, Decimal]]:
+    """Risk metrics per period from ``(ISO date, daily percent return)`` pairs.
+
+    Values are unrounded; apply ``quantize_risk`` at the output boundary. Metrics that are not
+    defined for a period's window (too few observations, zero volatility) are left out. Windows
+    of a portfolio younger than the period start at ``inception_date``, as lotus-risk does with
+    ``portfolioOpenDate``.
+    """
+    unsupported = [metric for metric in metrics if metric not in _CALCULATORS]
+    if unsupported:
+        raise ValueError(f"Unsupported risk metrics: {unsupported}")
+    series = sorted(returns_pct)
+    results: dict[str, dict[str, Decimal]] = {}
+    for period in periods:
+        start = window_start(period, as_of_date, inception_date)
+        window = [value for day, value in series if start <= day <= as_of_date]
+        period_metrics: dict[str, Decimal] = {}
+        for metric in metrics:
+            value = _CALCULATORS[metric](window)
+            if value is not None:
+                period_metrics[metric] = value
+        results[period] = period_metrics
+    return results
+
+
+def risk_results(
+    returns_pct: Iterable[tuple[str, Decimal]],
+    as_of_date: str,
+    periods: Sequence[str] = RISK_PERIODS,
+    inception_date: str | None = None,
+) -> dict[str, object]:
+    """:func:`risk_metrics` in the lotus-risk ``calculate`` response shape, quantized."""
+    metrics_by_period = risk_metrics(returns_pct, as_of_date, periods, RISK_METRICS, inception_date)
+    results = {
+        period: {
+            "startDate": window_start(period, as_of_date, inception_date),
+            "endDate": as_of_date,
+            "metrics": {
+                metric: {"value": float(quantize_risk(value))} for metric, value in metrics.items()
+            },
+        }
+        for period, metrics in metrics_by_period.items()
+    }
+    return {"results": results}
@@ -0,0 +1,69 @@
+from decimal import Decimal
+from itertools import accumulate
+from operator import mul
+from typing import Any, Iterable
+
+from app.precision_policy import normalize_input, quantize_performance
+
+HUNDRED = Decimal(100)
+ONE = Decimal(1)
+ZERO = Decimal(0)
+METRIC_BASES = ("NET", "GROSS")
+
+
+def _point_amounts(point: Any) -> tuple[Decimal, Decimal, Decimal, Decimal, Decimal]:
+    if not isinstance(point, dict):
+        raise ValueError(f"Invalid valuation point: {point!r}")
+    return (
+        normalize_input(point.get("begin_mv"), "money"),
+        normalize_input(point.get("end_mv"), "money"),
+        normalize_input(point.get("bod_cf"), "money"),
+        normalize_input(point.get("eod_cf"), "money"),
+        normalize_input(point.get("mgmt_fees"), "money"),
+    )
+
+
+def daily_returns(
+    valuation_points: Iterable[Any],
+    start_date: str | None = None,
+    end_date: str | None = None,
+    metric_basis: str = "NET",
+) -> list[tuple[str, Decimal]]:
+    """Daily returns in percent, matching the lotus-performance ``daily`` breakdown.
+
+    Each day returns ``(end_mv - bod_cf - begin_mv - eod_cf) / |begin_mv + bod_cf| * 100``;
+    the GROSS basis also adds management fees back (``- mgmt_fees``). Days with no invested
+    capital return zero. Points outside ``start_date``..``end_date`` (ISO dates, inclusive) are
+    skipped. Returns are left unrounded for chain-linking; apply ``quantize_performance`` at the
+    output boundary.
+    """
+    if metric_basis not in METRIC_BASES:
+        raise ValueError(f"Unsupported metric basis: {metric_basis}")
+    series: list[tuple[str, Decimal]] = []
+    for point in valuation_points:
+        perf_date = point.get("perf_date") if isinstance(point, dict) else None
+        if not isinstance(perf_date, str) or len(perf_date) < 10:
+            raise ValueError(f"Invalid valuation point date: {perf_date!r}")
+        day = perf_date[:10]
+        if (start_date and day < start_date) or (end_date and day > end_date):
+            continue
+        begin_mv, end_mv, bod_cf, eod_cf, mgmt_fees = _point_amounts(point)
+        invested = abs(begin_mv + bod_cf)
+        gain = end_mv - bod_cf - begin_mv - eod_cf
+        if metric_basis == "GROSS":
+            gain -= mgmt_fees
+        daily = gain / invested * HUNDRED if invested != ZERO else ZERO
+        series.append((day, daily))
+    return series
+
+
+def cumulative_returns(returns_pct: Iterable[Decimal]) -> list[Decimal]:
+    """Chain-links daily percent returns into the running cumulative percent return."""
+    growth = accumulate((ONE + value / HUNDRED for value in returns_pct), mul)
+    return [quantize_performance((factor - ONE) * HUNDRED) for factor in growth]
+
+
+def chain_link(returns_pct: Iterable[Decimal]) -> Decimal:
+    """Geometric link of percent returns over the whole series (zero for an empty series)."""
+    linked = cumulative_returns(returns_pct)
+    return linked[-1] if linked else ZERO
@@ -0,0 +1,156 @@
+import time
+from collections import deque
+from typing import Callable
+
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+CIRCUIT_STATES = (CLOSED, OPEN, HALF_OPEN)
+
+CIRCUIT_STATE = Gauge(
+    "lotus_report_upstream_circuit_state",
+    "Upstream circuit breaker state (1 for the current state, 0 otherwise).",
+    ["upstream", "state"],
+)
+CIRCUIT_TRANSITIONS = Counter(
+    "lotus_report_upstream_circuit_transitions_total",
+    "Upstream circuit breaker state transitions.",
+    ["upstream", "state"],
+)
+CIRCUIT_REJECTIONS = Counter(
+    "lotus_report_upstream_circuit_rejections_total",
+    "Upstream calls failed fast because the circuit was open.",
+    ["upstream"],
+)
+
+
+class CircuitBreaker:
+    """Count-based sliding-window circuit breaker for one upstream.
+
+    The circuit opens once at least ``minimum_calls`` outcomes are in the window and the failed
+    fraction reaches ``failure_threshold``. After ``open_seconds`` it lets up to
+    ``half_open_max_calls`` probes through: one failed probe re-opens it, and that many successful
+    probes close it with a fresh window.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        failure_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.upstream = upstream
+        self._minimum_calls = max(1, minimum_calls)
+        self._failure_threshold = failure_threshold
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=max(1, window_size))
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        self._export_state()
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_in_flight < self._half_open_max_calls:
+            self._half_open_in_flight += 1
+            return True
+        CIRCUIT_REJECTIONS.labels(upstream=self.upstream).inc()
+        return False
+
+    def record_success(self) -> None:
+        if self._state == HALF_OPEN:
+            self._release_probe()
+            self._half_open_successes += 1
+            if self._half_open_successes >= self._half_open_max_calls:
+                self._transition(CLOSED)
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        if self._state == HALF_OPEN:
+            self._release_probe()
+            self._transition(OPEN)
+            return
+        self._record(False)
+
+    def release(self) -> None:
+        """Returns a half-open probe slot for a call that ended without an outcome."""
+        if self._state == HALF_OPEN:
+            self._release_probe()
+
+    def failure_ratio(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _record(self, succeeded: bool) -> None:
+        self._outcomes.append(succeeded)
+        if (
+            self._state == CLOSED
+            and len(self._outcomes) >= self._minimum_calls
+            and self.failure_ratio() >= self._failure_threshold
+        ):
+            self._transition(OPEN)
+
+    def _release_probe(self) -> None:
+        self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+        if state == CLOSED:
+            self._outcomes.clear()
+        CIRCUIT_TRANSITIONS.labels(upstream=self.upstream, state=state).inc()
+        self._export_state()
+
+    def _export_state(self) -> None:
+        for state in CIRCUIT_STATES:
+            CIRCUIT_STATE.labels(upstream=self.upstream, state=state).set(
+                1 if state == self._state else 0
+            )
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker | None:
+    if not settings.circuit_breaker_enabled:
+        return None
+    breaker = _circuit_breakers.get(upstream)
+    if breaker is None:
+        breaker = CircuitBreaker(
+            upstream=upstream,
+            window_size=settings.circuit_breaker_window_size,
+            minimum_calls=settings.circuit_breaker_minimum_calls,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            open_seconds=settings.circuit_breaker_open_seconds,
+            half_open_max_calls=settings.circuit_breaker_half_open_max_calls,
+        )
+        _circuit_breakers[upstream] = breaker
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    _circuit_breakers.clear()
@@ -0,0 +1,175 @@
+from datetime import date
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter
+
+from app.analytics.return_series import ReturnSeries
+from app.clients.single_flight import UpstreamResult
+from app.config import settings
+
+COLUMNAR = "columnar"
+# Validation statuses that reject a columnar series when their detail names the series field.
+_VALIDATION_STATUS_CODES = (400, 422)
+_LIST_EXPECTED = ("list", "array")
+
+UPSTREAM_SERIES_ENCODING = Counter(
+    "lotus_report_upstream_series_encoding_total",
+    "Upstream calls carrying a daily series by encoding (columnar, rows, fallback to rows).",
+    ["upstream", "encoding"],
+)
+
+_unsupported_columnar: set[str] = set()
+
+
+def to_columnar(rows: Any, date_key: str) -> dict[str, Any] | None:
+    """Parallel-array form of a daily series, or None when the rows cannot be encoded losslessly.
+
+    Dates are sent once as a start date plus whole-day offsets and every other field as one array,
+    so the series no longer repeats its keys on every row::
+
+        {"encoding": "columnar", "date_key": "perf_date", "start_date": "2026-01-02",
+         "day_offsets": [0, 1, 4], "columns": {"begin_mv": [...], "end_mv": [...]}}
+
+    A :class:`ReturnSeries` is encoded straight from its arrays, with its percents as ``value``.
+    """
+    if isinstance(rows, ReturnSeries):
+        return _return_series_columnar(rows, date_key)
+    if not isinstance(rows, list) or not rows or not isinstance(rows[0], dict):
+        return None
+    keys = rows[0].keys()
+    if date_key not in keys or not all(
+        isinstance(row, dict) and row.keys() == keys for row in rows
+    ):
+        return None
+    try:
+        day_ordinals = [_day_ordinal(row[date_key]) for row in rows]
+    except (TypeError, ValueError):
+        return None
+    columns = {field: [row[field] for row in rows] for field in keys if field != date_key}
+    start = day_ordinals[0]
+    return {
+        "encoding": COLUMNAR,
+        "date_key": date_key,
+        "start_date": date.fromordinal(start).isoformat(),
+        "day_offsets": [ordinal - start for ordinal in day_ordinals],
+        "columns": columns,
+    }
+
+
+def _return_series_columnar(series: ReturnSeries, date_key: str) -> dict[str, Any] | None:
+    if not series:
+        return None
+    ordinals = series.ordinals
+    start = ordinals[0]
+    return {
+        "encoding": COLUMNAR,
+        "date_key": date_key,
+        "start_date": date.fromordinal(start).isoformat(),
+        "day_offsets": [ordinal - start for ordinal in ordinals],
+        "columns": {"value": series.values.tolist()},
+    }
+
+
+def _as_rows(payload: dict[str, Any], field: str) -> dict[str, Any]:
+    series = payload.get(field)
+    if isinstance(series, ReturnSeries):
+        return {**payload, field: series.to_rows()}
+    return payload
+
+
+def _day_ordinal(text: str) -> int:
+    # Only plain YYYY-MM-DD dates survive the round trip unchanged.
+    if len(text) != 10 or text[4] != "-" or text[7] != "-":
+        raise ValueError(f"not a calendar date: {text!r}")
+    return date.fromisoformat(text).toordinal()
+
+
+def from_columnar(series: dict[str, Any]) -> list[dict[str, Any]]:
+    """Rows of a series encoded by :func:`to_columnar`."""
+    if series.get("encoding") != COLUMNAR:
+        raise ValueError(f"unsupported series encoding: {series.get('encoding')!r}")
+    date_key = series["date_key"]
+    start = date.fromisoformat(series["start_date"]).toordinal()
+    columns: dict[str, list[Any]] = series["columns"]
+    day_offsets: list[int] = series["day_offsets"]
+    if any(len(column) != len(day_offsets) for column in columns.values()):
+        raise ValueError("columnar series columns differ in length")
+    return [
+        {
+            date_key: date.fromordinal(start + offset).isoformat(),
+            **{field: column[position] for field, column in columns.items()},
+        }
+        for position, offset in enumerate(day_offsets)
+    ]
+
+
+def columnar_series_enabled(upstream: str) -> bool:
+    enabled = {
+        name.strip() for name in settings.upstream_columnar_series.split(",") if name.strip()
+    }
+    return upstream in enabled and upstream not in _unsupported_columnar
+
+
+def rejects_columnar(status_code: int, response: Any, field: str) -> bool:
+    """True when an upstream answered a columnar ``field`` by refusing the encoding itself.
+
+    That is a ``415``, or a ``400``/``422`` whose detail says ``field`` should have been a list;
+    any other validation error is about the request's content and would fail as rows too.
+    """
+    if status_code == 415:
+        return True
+    if status_code not in _VALIDATION_STATUS_CODES or not isinstance(response, dict):
+        return False
+    detail = response.get("detail")
+    errors = detail if isinstance(detail, list) else [detail]
+    for error in errors:
+        if isinstance(error, dict):
+            location = error.get("loc")
+            names_field = isinstance(location, list) and field in location
+            message = f"{error.get('type', '')} {error.get('msg', '')}".lower()
+        elif isinstance(error, str):
+            names_field = field in error
+            message = error.lower()
+        else:
+            continue
+        if names_field and any(word in message for word in _LIST_EXPECTED):
+            return True
+    return False
+
+
+def mark_columnar_unsupported(upstream: str) -> None:
+    _unsupported_columnar.add(upstream)
+
+
+def reset_columnar_upstreams() -> None:
+    _unsupported_columnar.clear()
+
+
+async def post_series(
+    upstream: str,
+    payload: dict[str, Any],
+    field: str,
+    date_key: str,
+    post: Callable[[dict[str, Any]], Awaitable[UpstreamResult]],
+) -> UpstreamResult:
+    """Posts ``payload`` with its ``field`` series in columnar form when ``upstream`` takes it.
+
+    The series may be rows or a :class:`ReturnSeries`, which is only expanded to rows when the
+    row form is sent. Upstreams opt in through ``UPSTREAM_COLUMNAR_SERIES``. One that explicitly
+    rejects the columnar body (see :func:`rejects_columnar`) is sent the row form instead and
+    only the row form from then on; any other error is returned as it is.
+    """
+    columnar = None
+    if columnar_series_enabled(upstream):
+        columnar = to_columnar(payload.get(field), date_key)
+    if columnar is None:
+        UPSTREAM_SERIES_ENCODING.labels(upstream=upstream, encoding="rows").inc()
+        return await post(_as_rows(payload, field))
+
+    status_code, response = await post({**payload, field: columnar})
+    if not rejects_columnar(status_code, response, field):
+        UPSTREAM_SERIES_ENCODING.labels(upstream=upstream, encoding=COLUMNAR).inc()
+        return status_code, response
+    UPSTREAM_SERIES_ENCODING.labels(upstream=upstream, encoding="fallback").inc()
+    mark_columnar_unsupported(upstream)
+    return await post(_as_rows(payload, field))
@@ -0,0 +1,188 @@
+import asyncio
+from collections import deque
+
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+
+CONCURRENCY_LIMIT = Gauge(
+    "lotus_report_upstream_concurrency_limit",
+    "Current adaptive concurrency limit per upstream.",
+    ["upstream"],
+)
+CONCURRENCY_IN_FLIGHT = Gauge(
+    "lotus_report_upstream_concurrency_in_flight",
+    "Upstream calls currently holding a concurrency slot.",
+    ["upstream"],
+)
+CONCURRENCY_QUEUED = Gauge(
+    "lotus_report_upstream_concurrency_queued",
+    "Upstream calls waiting for a concurrency slot.",
+    ["upstream"],
+)
+CONCURRENCY_REJECTIONS = Counter(
+    "lotus_report_upstream_concurrency_rejections_total",
+    "Upstream calls rejected by the concurrency limiter.",
+    ["upstream", "reason"],
+)
+
+
+class ConcurrencyLimitExceeded(Exception):
+    def __init__(self, upstream: str, reason: str):
+        super().__init__(f"upstream concurrency limit exceeded: {upstream} ({reason})")
+        self.upstream = upstream
+        self.reason = reason
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit with a bounded wait queue for one upstream.
+
+    Each successful call completing within ``latency_tolerance`` times the no-load latency
+    estimate raises the limit by ``1 / limit`` (about one slot per window of calls); an error or a
+    slow call multiplies it by ``backoff_ratio``. Callers beyond the limit wait in a FIFO queue of
+    at most ``max_queue`` entries for up to ``queue_timeout_seconds``.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        initial_limit: int = 16,
+        min_limit: int = 2,
+        max_limit: int = 64,
+        max_queue: int = 64,
+        queue_timeout_seconds: float = 1.0,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+    ):
+        self.upstream = upstream
+        self._min_limit = max(1, min_limit)
+        self._max_limit = max(self._min_limit, max_limit)
+        self._limit = float(min(max(initial_limit, self._min_limit), self._max_limit))
+        self._max_queue = max(0, max_queue)
+        self._queue_timeout_seconds = queue_timeout_seconds
+        self._latency_tolerance = latency_tolerance
+        self._backoff_ratio = backoff_ratio
+        self._baseline_latency: float | None = None
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._export()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._export()
+            return
+        if len(self._waiters) >= self._max_queue:
+            self._reject("queue_full")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._export()
+        try:
+            async with asyncio.timeout(self._queue_timeout_seconds):
+                await waiter
+        except TimeoutError:
+            if self._granted(waiter):
+                return
+            self._discard(waiter)
+            self._reject("queue_timeout")
+        except asyncio.CancelledError:
+            if self._granted(waiter):
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+
+    def try_acquire(self) -> bool:
+        """Takes a slot only if one is free now, without queueing behind other callers."""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._export()
+            return True
+        return False
+
+    def release(self, latency_seconds: float | None = None, succeeded: bool = True) -> None:
+        self._in_flight = max(0, self._in_flight - 1)
+        if latency_seconds is not None:
+            self._adjust(latency_seconds, succeeded)
+        self._wake()
+        self._export()
+
+    def _adjust(self, latency_seconds: float, succeeded: bool) -> None:
+        baseline = self._baseline_latency
+        if baseline is None or latency_seconds < baseline:
+            self._baseline_latency = latency_seconds
+        else:
+            # Let the no-load estimate drift up slowly so a permanently slower upstream is learned.
+            self._baseline_latency = baseline + (latency_seconds - baseline) * 0.01
+        congested = baseline is not None and latency_seconds > baseline * self._latency_tolerance
+        if not succeeded or congested:
+            self._limit = max(float(self._min_limit), self._limit * self._backoff_ratio)
+        else:
+            self._limit = min(float(self._max_limit), self._limit + 1 / self._limit)
+
+    def _wake(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+    def _discard(self, waiter: "asyncio.Future[None]") -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._export()
+
+    @staticmethod
+    def _granted(waiter: "asyncio.Future[None]") -> bool:
+        return waiter.done() and not waiter.cancelled()
+
+    def _reject(self, reason: str) -> None:
+        CONCURRENCY_REJECTIONS.labels(upstream=self.upstream, reason=reason).inc()
+        raise ConcurrencyLimitExceeded(self.upstream, reason)
+
+    def _export(self) -> None:
+        CONCURRENCY_LIMIT.labels(upstream=self.upstream).set(self.limit)
+        CONCURRENCY_IN_FLIGHT.labels(upstream=self.upstream).set(self._in_flight)
+        CONCURRENCY_QUEUED.labels(upstream=self.upstream).set(len(self._waiters))
+
+
+_limiters: dict[str, AdaptiveConcurrencyLimiter] = {}
+
+
+def get_concurrency_limiter(upstream: str) -> AdaptiveConcurrencyLimiter | None:
+    if not settings.concurrency_limit_enabled:
+        return None
+    limiter = _limiters.get(upstream)
+    if limiter is None:
+        limiter = AdaptiveConcurrencyLimiter(
+            upstream=upstream,
+            initial_limit=settings.concurrency_limit_initial,
+            min_limit=settings.concurrency_limit_min,
+            max_limit=settings.concurrency_limit_max,
+            max_queue=settings.concurrency_limit_max_queue,
+            queue_timeout_seconds=settings.concurrency_limit_queue_timeout_seconds,
+            latency_tolerance=settings.concurrency_limit_latency_tolerance,
+            backoff_ratio=settings.concurrency_limit_backoff_ratio,
+        )
+        _limiters[upstream] = limiter
+    return limiter
+
+
+def reset_concurrency_limiters() -> None:
+    _limiters.clear()
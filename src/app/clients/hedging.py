@@ -0,0 +1,95 @@
+import math
+from collections import deque
+
+from prometheus_client import Counter
+
+from app.config import settings
+
+HEDGED_REQUESTS = Counter(
+    "lotus_report_upstream_hedged_requests_total",
+    "Hedged upstream reads by outcome (sent, won, budget_exhausted, no_slot).",
+    ["upstream", "endpoint", "outcome"],
+)
+
+
+class Hedger:
+    """Latency-percentile hedge trigger with a token budget for one idempotent endpoint.
+
+    The hedge delay is the ``percentile`` of the last ``window_size`` latencies, floored at
+    ``min_delay_seconds``; no hedge is sent until ``min_samples`` latencies are known. Every
+    primary request earns ``budget_ratio`` tokens (capped at ``max_tokens``) and every hedge
+    spends one, so hedges stay below that fraction of traffic.
+    """
+
+    def __init__(
+        self,
+        upstream: str,
+        endpoint: str,
+        percentile: float = 0.95,
+        window_size: int = 200,
+        min_samples: int = 20,
+        min_delay_seconds: float = 0.05,
+        budget_ratio: float = 0.1,
+        max_tokens: float = 10.0,
+    ):
+        self.upstream = upstream
+        self.endpoint = endpoint
+        self._percentile = min(max(percentile, 0.0), 1.0)
+        self._latencies: deque[float] = deque(maxlen=max(1, window_size))
+        self._min_samples = max(1, min_samples)
+        self._min_delay_seconds = min_delay_seconds
+        self._budget_ratio = budget_ratio
+        self._max_tokens = max_tokens
+        self._tokens = 0.0
+
+    def hedge_delay(self) -> float | None:
+        if len(self._latencies) < self._min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self._percentile * len(ordered)) - 1)
+        return max(self._min_delay_seconds, ordered[max(0, index)])
+
+    def record_latency(self, latency_seconds: float) -> None:
+        self._latencies.append(latency_seconds)
+
+    def record_request(self) -> None:
+        self._tokens = min(self._max_tokens, self._tokens + self._budget_ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            self.record_outcome("budget_exhausted")
+            return False
+        self._tokens -= 1.0
+        self.record_outcome("sent")
+        return True
+
+    def record_outcome(self, outcome: str) -> None:
+        HEDGED_REQUESTS.labels(
+            upstream=self.upstream, endpoint=self.endpoint, outcome=outcome
+        ).inc()
+
+
+_hedgers: dict[tuple[str, str], Hedger] = {}
+
+
+def get_hedger(upstream: str, endpoint: str) -> Hedger | None:
+    if not settings.hedging_enabled:
+        return None
+    key = (upstream, endpoint)
+    hedger = _hedgers.get(key)
+    if hedger is None:
+        hedger = Hedger(
+            upstream=upstream,
+            endpoint=endpoint,
+            percentile=settings.hedging_percentile,
+            window_size=settings.hedging_window_size,
+            min_samples=settings.hedging_min_samples,
+            min_delay_seconds=settings.hedging_min_delay_seconds,
+            budget_ratio=settings.hedging_budget_ratio,
+        )
+        _hedgers[key] = hedger
+    return hedger
+
+
+def reset_hedgers() -> None:
+    _hedgers.clear()
@@ -0,0 +1,102 @@
+from typing import Iterator
+
+import httpx
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import REGISTRY, Collector
+
+from app.compression import accept_encoding_header
+from app.config import Settings
+
+_upstream_clients: dict[str, httpx.AsyncClient] = {}
+_upstream_limits: dict[str, httpx.Limits] = {}
+
+
+def upstream_base_urls(app_settings: Settings) -> dict[str, str]:
+    return {
+        "pas": app_settings.pas_base_url,
+        "pa": app_settings.pa_base_url,
+        "risk": app_settings.risk_base_url,
+    }
+
+
+def build_upstream_limits(app_settings: Settings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=app_settings.upstream_pool_max_connections,
+        max_keepalive_connections=app_settings.upstream_pool_max_keepalive_connections,
+        keepalive_expiry=app_settings.upstream_pool_keepalive_expiry_seconds,
+    )
+
+
+def open_upstream_clients(app_settings: Settings) -> dict[str, httpx.AsyncClient]:
+    limits = build_upstream_limits(app_settings)
+    for upstream in upstream_base_urls(app_settings):
+        if upstream in _upstream_clients:
+            continue
+        _upstream_clients[upstream] = httpx.AsyncClient(
+            timeout=app_settings.upstream_timeout_seconds,
+            limits=limits,
+            headers={"Accept-Encoding": accept_encoding_header()},
+        )
+        _upstream_limits[upstream] = limits
+    return dict(_upstream_clients)
+
+
+async def close_upstream_clients() -> None:
+    clients = list(_upstream_clients.values())
+    _upstream_clients.clear()
+    _upstream_limits.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def get_upstream_client(upstream: str) -> httpx.AsyncClient | None:
+    return _upstream_clients.get(upstream)
+
+
+def upstream_pool_stats(upstream: str) -> dict[str, int]:
+    client = _upstream_clients.get(upstream)
+    if client is None:
+        return {}
+    # httpx does not expose pool state publicly; read the httpcore pool defensively.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for connection in connections if connection.is_idle())
+    limits = _upstream_limits.get(upstream)
+    return {
+        "open": len(connections),
+        "idle": idle,
+        "active": len(connections) - idle,
+        "pending_requests": len(getattr(pool, "_requests", []) or []),
+        "max_connections": (limits.max_connections or 0) if limits else 0,
+    }
+
+
+class _UpstreamPoolCollector(Collector):
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        connections = GaugeMetricFamily(
+            "lotus_report_upstream_pool_connections",
+            "Pooled upstream HTTP connections by state.",
+            labels=["upstream", "state"],
+        )
+        pending = GaugeMetricFamily(
+            "lotus_report_upstream_pool_pending_requests",
+            "Requests waiting for a pooled upstream connection.",
+            labels=["upstream"],
+        )
+        max_connections = GaugeMetricFamily(
+            "lotus_report_upstream_pool_max_connections",
+            "Configured upstream connection pool size.",
+            labels=["upstream"],
+        )
+        for upstream in sorted(_upstream_clients):
+            stats = upstream_pool_stats(upstream)
+            for state in ("open", "idle", "active"):
+                connections.add_metric([upstream, state], stats.get(state, 0))
+            pending.add_metric([upstream], stats.get("pending_requests", 0))
+            max_connections.add_metric([upstream], stats.get("max_connections", 0))
+        yield connections
+        yield pending
+        yield max_connections
+
+
+REGISTRY.register(_UpstreamPoolCollector())
@@ -1,12 +1,44 @@
 import asyncio
+import time
 from typing import Any
 
 import httpx
 
+from app.clients.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from app.clients.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceeded,
+    get_concurrency_limiter,
+)
+from app.clients.hedging import Hedger, get_hedger
+from app.clients.http_pool import get_upstream_client
+from app.clients.json_stream import KeepSpec, decode_json_stream
+from app.clients.retry_budget import (
+    full_jitter_backoff,
+    get_retry_budget,
+    parse_retry_after,
+    record_retry,
+)
+from app.clients.revalidation_cache import ConditionalRead
+from app.codec import codec
+from app.compression import (
+    compress_body,
+    mark_request_encoding_unsupported,
+    upstream_request_encoding,
+)
+from app.config import settings
+from app.observability import (
+    DEADLINE_EXCEEDED_DETAIL,
+    DEADLINE_HEADER,
+    remaining_budget_seconds,
+)
+
+RETRY_AFTER_STATUS_CODES = (429, 503)
+
 
 def response_payload(response: httpx.Response) -> dict[str, Any]:
     try:
-        payload = response.json()
+        payload = codec.loads(response.content)
     except ValueError:
         payload = {"detail": response.text}
     if isinstance(payload, dict):
@@ -14,6 +46,185 @@ def response_payload(response: httpx.Response) -> dict[str, Any]:
     return {"detail": payload}
 
 
+async def _send(
+    shared_client: httpx.AsyncClient | None,
+    url: str,
+    timeout_seconds: float,
+    json_body: dict[str, Any],
+    headers: dict[str, str],
+    stream: bool = False,
+    content: bytes | None = None,
+) -> httpx.Response:
+    body: dict[str, Any] = {"json": json_body} if content is None else {"content": content}
+    if shared_client is not None:
+        if stream:
+            request = shared_client.build_request(
+                "POST", url, headers=headers, timeout=timeout_seconds, **body
+            )
+            return await shared_client.send(request, stream=True)
+        return await shared_client.post(url, headers=headers, timeout=timeout_seconds, **body)
+    async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+        return await client.post(url, headers=headers, **body)
+
+
+async def _encode_request_body(
+    upstream: str | None,
+    json_body: dict[str, Any],
+    headers: dict[str, str],
+) -> tuple[bytes | None, dict[str, str]]:
+    encoding = upstream_request_encoding(upstream) if upstream else None
+    if encoding is None:
+        return None, headers
+    body = codec.dumps(json_body)
+    if len(body) < settings.upstream_request_compression_min_bytes:
+        return None, headers
+    content = await compress_body(body, encoding, direction="upstream_request")
+    return content, {**headers, "Content-Type": "application/json", "Content-Encoding": encoding}
+
+
+async def _read_payload(
+    response: httpx.Response,
+    streamed: bool,
+    keep: KeepSpec,
+) -> dict[str, Any]:
+    if response.status_code == 304:
+        if streamed:
+            await response.aclose()
+        return {}
+    if not streamed:
+        return response_payload(response)
+    try:
+        if response.status_code >= 400:
+            await response.aread()
+            return response_payload(response)
+        try:
+            payload = await decode_json_stream(response.aiter_bytes(), keep)
+        except ValueError as exc:
+            payload = {"detail": f"upstream returned malformed JSON: {exc}"}
+    finally:
+        await response.aclose()
+    if isinstance(payload, dict):
+        return payload
+    return {"detail": payload}
+
+
+def _take_hedge_slot(hedger: Hedger, limiter: AdaptiveConcurrencyLimiter | None) -> bool:
+    # A hedge is extra load on the upstream, so it needs its own concurrency slot; it is
+    # skipped rather than queued when none is free.
+    if limiter is not None and not limiter.try_acquire():
+        hedger.record_outcome("no_slot")
+        return False
+    if hedger.try_spend():
+        return True
+    if limiter is not None:
+        limiter.release()
+    return False
+
+
+async def _hedged_send(
+    hedger: Hedger,
+    limiter: AdaptiveConcurrencyLimiter | None,
+    shared_client: httpx.AsyncClient | None,
+    url: str,
+    timeout_seconds: float,
+    json_body: dict[str, Any],
+    headers: dict[str, str],
+    stream: bool = False,
+    content: bytes | None = None,
+) -> httpx.Response:
+    hedger.record_request()
+    delay = hedger.hedge_delay()
+    started = time.perf_counter()
+    primary = asyncio.ensure_future(
+        _send(shared_client, url, timeout_seconds, json_body, headers, stream, content)
+    )
+    pending: set[asyncio.Future[httpx.Response]] = {primary}
+    hedge: asyncio.Future[httpx.Response] | None = None
+    winner: asyncio.Future[httpx.Response] | None = None
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and _take_hedge_slot(hedger, limiter):
+                hedge = asyncio.ensure_future(
+                    _send(shared_client, url, timeout_seconds, json_body, headers, stream, content)
+                )
+                if limiter is not None:
+                    hedge.add_done_callback(lambda _: limiter.release())
+                pending.add(hedge)
+        first_error: BaseException | None = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                if error is None:
+                    winner = task
+                    hedger.record_latency(time.perf_counter() - started)
+                    if task is hedge:
+                        hedger.record_outcome("won")
+                    return task.result()
+                if first_error is None or task is primary:
+                    first_error = error
+        if first_error is None:
+            raise RuntimeError("hedged upstream request finished without a result")
+        raise first_error
+    finally:
+        attempts = [primary] if hedge is None else [primary, hedge]
+        for task in attempts:
+            if task is winner:
+                continue
+            if not task.done():
+                task.cancel()
+            elif stream and not task.cancelled() and task.exception() is None:
+                await task.result().aclose()
+
+
+def _body_size(response: httpx.Response, streamed: bool) -> int:
+    downloaded = int(response.num_bytes_downloaded)
+    if streamed:
+        return downloaded
+    return downloaded or len(response.content)
+
+
+def _with_deadline(headers: dict[str, str], budget_seconds: float) -> dict[str, str]:
+    return {**headers, DEADLINE_HEADER: str(max(1, int(budget_seconds * 1000)))}
+
+
+def _healthy(status_code: int) -> bool:
+    return status_code < 500 and status_code != 429
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    if response.status_code not in RETRY_AFTER_STATUS_CODES:
+        return None
+    delay = parse_retry_after(response.headers.get("Retry-After"))
+    if delay is None or delay > settings.upstream_retry_after_max_seconds:
+        return None
+    return delay
+
+
+def _record_status(breaker: CircuitBreaker | None, status_code: int) -> None:
+    if breaker is None:
+        return
+    if status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+async def _acquire_slot(
+    limiter: AdaptiveConcurrencyLimiter | None,
+    breaker: CircuitBreaker | None,
+) -> None:
+    if limiter is None:
+        return
+    try:
+        await limiter.acquire()
+    except BaseException:
+        if breaker is not None:
+            breaker.release()
+        raise
+
+
 async def post_with_retry(
     *,
     url: str,
@@ -22,14 +233,124 @@ async def post_with_retry(
     headers: dict[str, str],
     max_retries: int = 2,
     backoff_seconds: float = 0.2,
+    upstream: str | None = None,
+    idempotent: bool = False,
+    endpoint: str = "default",
+    stream_decode: bool = False,
+    keep: KeepSpec = None,
+    conditional: ConditionalRead | None = None,
 ) -> tuple[int, dict[str, Any]]:
+    shared_client = get_upstream_client(upstream) if upstream else None
+    streamed = stream_decode and shared_client is not None
+    breaker = get_circuit_breaker(upstream) if upstream else None
+    limiter = get_concurrency_limiter(upstream) if upstream else None
+    hedger = get_hedger(upstream, endpoint) if upstream and idempotent else None
+    retry_budget = get_retry_budget(upstream) if upstream else None
+    if conditional is not None:
+        headers = {**headers, **conditional.headers()}
+    content, request_headers = await _encode_request_body(upstream, json_body, headers)
+    failure: tuple[int, dict[str, Any]] = (
+        503,
+        {"detail": "upstream communication failure: exhausted retries"},
+    )
     for attempt in range(max_retries + 1):
+        budget = remaining_budget_seconds()
+        if budget is not None and budget <= 0:
+            return 504, {"detail": DEADLINE_EXCEEDED_DETAIL}
+        attempt_timeout = timeout_seconds if budget is None else min(timeout_seconds, budget)
+        attempt_headers = (
+            request_headers if budget is None else _with_deadline(request_headers, budget)
+        )
+        if breaker is not None and not breaker.allow_request():
+            return 503, {"detail": f"upstream circuit open: {upstream}"}
         try:
-            async with httpx.AsyncClient(timeout=timeout_seconds) as client:
-                response = await client.post(url, json=json_body, headers=headers)
-            return response.status_code, response_payload(response)
+            await _acquire_slot(limiter, breaker)
+        except ConcurrencyLimitExceeded as exc:
+            return 503, {"detail": str(exc)}
+        started = time.perf_counter()
+        try:
+            if hedger is not None:
+                response = await _hedged_send(
+                    hedger,
+                    limiter,
+                    shared_client,
+                    url,
+                    attempt_timeout,
+                    json_body,
+                    attempt_headers,
+                    streamed,
+                    content,
+                )
+            else:
+                response = await _send(
+                    shared_client,
+                    url,
+                    attempt_timeout,
+                    json_body,
+                    attempt_headers,
+                    streamed,
+                    content,
+                )
+            payload = await _read_payload(response, streamed, keep)
         except (httpx.TimeoutException, httpx.NetworkError) as exc:
-            if attempt >= max_retries:
-                return 503, {"detail": f"upstream communication failure: {exc.__class__.__name__}"}
-            await asyncio.sleep(backoff_seconds * (2**attempt))
-    return 503, {"detail": "upstream communication failure: exhausted retries"}
+            if isinstance(exc, httpx.TimeoutException) and attempt_timeout < timeout_seconds:
+                # The caller's deadline ran out, which says nothing about upstream health.
+                if limiter is not None:
+                    limiter.release()
+                if breaker is not None:
+                    breaker.release()
+                return 504, {"detail": DEADLINE_EXCEEDED_DETAIL}
+            if limiter is not None:
+                limiter.release(time.perf_counter() - started, succeeded=False)
+            if breaker is not None:
+                breaker.record_failure()
+            failure = 503, {"detail": f"upstream communication failure: {exc.__class__.__name__}"}
+            delay = full_jitter_backoff(
+                backoff_seconds, attempt, settings.upstream_retry_backoff_max_seconds
+            )
+            trigger = "error"
+        except BaseException:
+            if limiter is not None:
+                limiter.release()
+            if breaker is not None:
+                breaker.release()
+            raise
+        else:
+            if limiter is not None:
+                limiter.release(
+                    time.perf_counter() - started, succeeded=_healthy(response.status_code)
+                )
+            _record_status(breaker, response.status_code)
+            if retry_budget is not None and _healthy(response.status_code):
+                retry_budget.record_success()
+            failure = response.status_code, payload
+            retry_after = _retry_after_seconds(response)
+            if content is not None and response.status_code == 415 and upstream:
+                # The upstream refused the compressed body; resend it plain from now on.
+                mark_request_encoding_unsupported(upstream)
+                content, request_headers = None, headers
+                delay = 0.0
+                trigger = "unsupported_encoding"
+            elif retry_after is None:
+                if conditional is not None:
+                    return conditional.resolve(
+                        response.status_code,
+                        payload,
+                        response.headers,
+                        _body_size(response, streamed),
+                    )
+                return failure
+            else:
+                delay = retry_after
+                trigger = "retry_after"
+
+        if attempt >= max_retries:
+            return failure
+        remaining = remaining_budget_seconds()
+        if remaining is not None and remaining <= delay:
+            return 504, {"detail": DEADLINE_EXCEEDED_DETAIL}
+        if retry_budget is not None and not retry_budget.try_withdraw():
+            return failure
+        record_retry(upstream or "unknown", trigger, delay)
+        await asyncio.sleep(delay)
+    return failure
@@ -0,0 +1,264 @@
+import re
+from itertools import accumulate, count
+from operator import sub
+from typing import Any, AsyncIterable, Mapping
+
+from app.codec import codec
+
+# A keep spec describes which object members to materialise. ``None`` keeps a value whole; a
+# mapping keeps only the listed members of an object, each with its own spec, and uses the "*"
+# entry (when present) for members that are not listed. Members without a spec are skipped
+# without being buffered.
+KeepSpec = Mapping[str, Any] | None
+
+_WILDCARD = "*"
+_SKIP = object()
+
+_WHITESPACE = frozenset(b" \t\r\n")
+_STRUCTURAL = re.compile(rb'[{}\[\]"]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+_COMPLETE_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_NON_BRACKETS = bytes(byte for byte in range(256) if byte not in b"{}[]")
+_BRACKET_STEPS = bytes.maketrans(b"{[}]", b"\x02\x02\x00\x00")
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+
+_KEY_OR_END = "key_or_end"
+_KEY = "key"
+_COLON = "colon"
+_VALUE = "value"
+_COMMA_OR_END = "comma_or_end"
+
+
+class _ValueScanner:
+    """Finds the end of one JSON value in a chunked byte stream, buffering it only if captured."""
+
+    def __init__(self, capture: bool):
+        self.capture = capture
+        self._parts: list[bytes] = []
+        self._kind: str | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def scan(self, data: bytes, pos: int) -> int | None:
+        """Consumes ``data`` from ``pos`` and returns the index just past the value, if reached."""
+        start = pos
+        end = len(data)
+        if self._kind is None:
+            first = data[pos]
+            if first in b"{[":
+                self._kind = "container"
+                self._depth = 1
+                pos += 1
+            elif first == _QUOTE:
+                self._kind = "string"
+                self._in_string = True
+                pos += 1
+            else:
+                self._kind = "scalar"
+        if self._kind == "scalar":
+            match = _SCALAR_END.search(data, pos)
+            return self._consumed(data, start, match.start() if match else None)
+
+        bulk = True
+        while pos < end:
+            if self._escape:
+                self._escape = False
+                pos += 1
+                continue
+            if self._in_string:
+                match = _STRING_SPECIAL.search(data, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if data[match.start()] == _BACKSLASH:
+                    self._escape = True
+                    continue
+                self._in_string = False
+                if self._kind == "string":
+                    return self._consumed(data, start, pos)
+                continue
+            if bulk:
+                bulk = False
+                if self._skip_chunk(data, pos):
+                    break
+            match = _STRUCTURAL.search(data, pos)
+            if match is None:
+                break
+            pos = match.end()
+            token = data[match.start()]
+            if token == _QUOTE:
+                self._in_string = True
+            elif token in b"{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return self._consumed(data, start, pos)
+        return self._consumed(data, start, None)
+
+    def _skip_chunk(self, data: bytes, pos: int) -> bool:
+        """Consumes the rest of ``data`` in bulk when the value cannot end inside it.
+
+        Complete strings are stripped and brackets counted at C speed; only the chunk in which the
+        value may close is walked token by token.
+        """
+        rest = data[pos:]
+        if _QUOTE in rest:
+            rest = _COMPLETE_STRING.sub(b"", rest)
+        open_quote = rest.find(b'"')
+        outside = rest if open_quote < 0 else rest[:open_quote]
+        # Each bracket becomes 2 (open) or 0 (close); running sum minus position is the depth delta.
+        steps = outside.translate(_BRACKET_STEPS, _NON_BRACKETS)
+        if self._depth + min(map(sub, accumulate(steps), count(1)), default=0) <= 0:
+            return False
+        self._depth += sum(steps) - len(steps)
+        if open_quote >= 0:
+            tail = rest[open_quote + 1 :]
+            self._in_string = True
+            self._escape = (len(tail) - len(tail.rstrip(b"\\"))) % 2 == 1
+        return True
+
+    def finish_at_eof(self) -> bool:
+        """A bare scalar (number, true, false, null) may legitimately end with the stream."""
+        return self._kind == "scalar"
+
+    def value(self) -> Any:
+        return codec.loads(b"".join(self._parts))
+
+    def _consumed(self, data: bytes, start: int, stop: int | None) -> int | None:
+        if self.capture:
+            self._parts.append(data[start:stop])
+        return stop
+
+
+class _ObjectFrame:
+    def __init__(self, spec: Mapping[str, Any]):
+        self.spec = spec
+        self.target: dict[str, Any] = {}
+        self.state = _KEY_OR_END
+        self.key = ""
+        self.child_spec: Any = _SKIP
+
+
+class JsonStreamDecoder:
+    """Incremental JSON decoder that prunes object members outside a keep spec.
+
+    Feed the body chunk by chunk with :meth:`feed` and call :meth:`close` for the decoded value.
+    Skipped subtrees are scanned but never buffered or decoded, so peak memory follows the kept
+    members rather than the payload size. Malformed input raises ``ValueError``.
+    """
+
+    def __init__(self, keep: KeepSpec = None):
+        self._keep = keep
+        self._stack: list[_ObjectFrame] = []
+        self._scanner: _ValueScanner | None = None
+        self._key_scanner: _ValueScanner | None = None
+        self._started = False
+        self._done = False
+        self._result: Any = None
+        # Nothing to prune: buffer the body and leave the decoding to the C parser.
+        self._passthrough: list[bytes] | None = [] if keep is None else None
+
+    def feed(self, data: bytes) -> None:
+        if self._passthrough is not None:
+            self._passthrough.append(data)
+            return
+        pos = 0
+        end = len(data)
+        while pos < end:
+            if self._scanner is not None:
+                stop = self._scanner.scan(data, pos)
+                if stop is None:
+                    return
+                scanner, self._scanner = self._scanner, None
+                self._complete(scanner.value() if scanner.capture else _SKIP)
+                pos = stop
+                continue
+            if self._key_scanner is not None:
+                stop = self._key_scanner.scan(data, pos)
+                if stop is None:
+                    return
+                frame = self._stack[-1]
+                frame.key = self._key_scanner.value()
+                frame.child_spec = _child_spec(frame.spec, frame.key)
+                frame.state = _COLON
+                self._key_scanner = None
+                pos = stop
+                continue
+            token = data[pos]
+            if token in _WHITESPACE:
+                pos += 1
+                continue
+            if self._done:
+                raise ValueError(f"Unexpected data after JSON value at byte {pos}")
+            if not self._stack:
+                self._started = True
+                self._start_value(self._keep, token)
+                pos += 0 if self._scanner is not None else 1
+                continue
+            pos = self._advance_object(self._stack[-1], token, pos)
+
+    def close(self) -> Any:
+        if self._passthrough is not None:
+            document = b"".join(self._passthrough)
+            if not document.strip():
+                raise ValueError("Empty JSON document")
+            return codec.loads(document)
+        if self._scanner is not None and self._scanner.finish_at_eof() and not self._stack:
+            scanner, self._scanner = self._scanner, None
+            self._complete(scanner.value() if scanner.capture else _SKIP)
+        if not self._done:
+            raise ValueError("Incomplete JSON document" if self._started else "Empty JSON document")
+        return self._result
+
+    def _advance_object(self, frame: _ObjectFrame, token: int, pos: int) -> int:
+        state = frame.state
+        if state in (_KEY_OR_END, _COMMA_OR_END) and token == ord("}"):
+            self._stack.pop()
+            self._complete(frame.target)
+            return pos + 1
+        if state in (_KEY_OR_END, _KEY) and token == _QUOTE:
+            self._key_scanner = _ValueScanner(capture=True)
+            return pos
+        if state == _COLON and token == ord(":"):
+            frame.state = _VALUE
+            return pos + 1
+        if state == _VALUE:
+            self._start_value(frame.child_spec, token)
+            return pos if self._scanner is not None else pos + 1
+        if state == _COMMA_OR_END and token == ord(","):
+            frame.state = _KEY
+            return pos + 1
+        raise ValueError(f"Unexpected {chr(token)!r} in JSON object ({state}) at byte {pos}")
+
+    def _start_value(self, spec: Any, token: int) -> None:
+        if isinstance(spec, Mapping) and token == ord("{"):
+            self._stack.append(_ObjectFrame(spec))
+            return
+        self._scanner = _ValueScanner(capture=spec is not _SKIP)
+
+    def _complete(self, value: Any) -> None:
+        if not self._stack:
+            self._result = value
+            self._done = True
+            return
+        frame = self._stack[-1]
+        if value is not _SKIP:
+            frame.target[frame.key] = value
+        frame.state = _COMMA_OR_END
+
+
+def _child_spec(spec: Mapping[str, Any], key: str) -> Any:
+    if key in spec:
+        return spec[key]
+    return spec.get(_WILDCARD, _SKIP)
+
+
+async def decode_json_stream(chunks: AsyncIterable[bytes], keep: KeepSpec = None) -> Any:
+    decoder = JsonStreamDecoder(keep)
+    async for chunk in chunks:
+        decoder.feed(chunk)
+    return decoder.close()
@@ -0,0 +1,237 @@
+import asyncio
+import contextvars
+import logging
+from typing import Any, Awaitable, Callable, Coroutine, Hashable
+
+from prometheus_client import Counter, Histogram
+
+from app.clients.http_resilience import post_with_retry
+from app.clients.single_flight import UpstreamResult
+from app.config import settings
+from app.observability import propagation_headers
+
+logger = logging.getLogger(__name__)
+
+SingleCall = Callable[[], Coroutine[Any, Any, UpstreamResult]]
+# Takes the batched items in order and returns one result per item, or None when the upstream has
+# no batch endpoint so the items must be sent one by one.
+BatchCall = Callable[[list[Any]], Awaitable[list[UpstreamResult] | None]]
+
+BATCH_UNSUPPORTED_STATUS_CODES = (404, 405, 501)
+
+MICRO_BATCHES = Counter(
+    "lotus_report_upstream_micro_batches_total",
+    "Dispatched micro-batches by mode (batch endpoint or bounded parallel single calls).",
+    ["endpoint", "mode"],
+)
+MICRO_BATCH_SIZE = Histogram(
+    "lotus_report_upstream_micro_batch_size",
+    "Distinct upstream calls collected into one micro-batch.",
+    ["endpoint"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+
+
+class _PendingCall:
+    def __init__(self, item: Any, single: SingleCall, batch: BatchCall | None):
+        self.item = item
+        self.single = single
+        self.batch = batch
+        # Single calls run in the first caller's context so its deadline and trace ids apply.
+        self.context = contextvars.copy_context()
+        self.future: asyncio.Future[UpstreamResult] = asyncio.get_running_loop().create_future()
+
+
+class MicroBatcher:
+    """Collects calls to one upstream endpoint for ``window_seconds`` and dispatches them together.
+
+    A window closes after ``window_seconds`` or once ``max_batch_size`` distinct calls are queued.
+    Calls with the same key inside a window share one result (a ``None`` key is never shared), so
+    shared results must be treated as read-only. A closed window is sent as one request through
+    the batch call when there is one, otherwise (or once the upstream has answered that it has no
+    batch endpoint) as single calls with at most ``max_parallel`` in flight.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        window_seconds: float = 0.005,
+        max_batch_size: int = 50,
+        max_parallel: int = 8,
+    ):
+        self.endpoint = endpoint
+        self._window_seconds = window_seconds
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_parallel = max(1, max_parallel)
+        self._pending: dict[Hashable, _PendingCall] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._dispatches: set[asyncio.Task[None]] = set()
+        self._batch_supported = True
+
+    async def load(
+        self,
+        key: Hashable | None,
+        item: Any,
+        single: SingleCall,
+        batch: BatchCall | None = None,
+    ) -> UpstreamResult:
+        call = None if key is None else self._pending.get(key)
+        if call is None:
+            call = _PendingCall(item, single, batch)
+            self._pending[object() if key is None else key] = call
+            if len(self._pending) >= self._max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(self._window_seconds, self._flush)
+        return await asyncio.shield(call.future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        calls, self._pending = list(self._pending.values()), {}
+        if not calls:
+            return
+        task = asyncio.ensure_future(self._dispatch(calls))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, calls: list[_PendingCall]) -> None:
+        MICRO_BATCH_SIZE.labels(endpoint=self.endpoint).observe(len(calls))
+        try:
+            await self._send(calls)
+        except Exception as exc:
+            for call in calls:
+                _settle(call, exception=exc)
+
+    async def _send(self, calls: list[_PendingCall]) -> None:
+        batch = calls[0].batch if self._batch_supported else None
+        if batch is not None and len(calls) > 1:
+            results = await batch([call.item for call in calls])
+            if results is not None:
+                MICRO_BATCHES.labels(endpoint=self.endpoint, mode="batch").inc()
+                for call, result in zip(calls, results, strict=True):
+                    _settle(call, result=result)
+                return
+            self._batch_supported = False
+            logger.warning(
+                "upstream batch endpoint unavailable, sending single calls",
+                extra={"extra_fields": {"endpoint": self.endpoint}},
+            )
+        MICRO_BATCHES.labels(endpoint=self.endpoint, mode="parallel").inc()
+        limit = asyncio.Semaphore(self._max_parallel)
+        await asyncio.gather(*(self._run_single(call, limit) for call in calls))
+
+    @staticmethod
+    async def _run_single(call: _PendingCall, limit: asyncio.Semaphore) -> None:
+        async with limit:
+            try:
+                result: UpstreamResult = await asyncio.create_task(
+                    call.single(), context=call.context
+                )
+            except Exception as exc:
+                _settle(call, exception=exc)
+            else:
+                _settle(call, result=result)
+
+
+def _settle(
+    call: _PendingCall,
+    result: UpstreamResult | None = None,
+    exception: BaseException | None = None,
+) -> None:
+    if call.future.done():
+        return
+    if exception is not None:
+        call.future.set_exception(exception)
+    elif result is not None:
+        call.future.set_result(result)
+
+
+def split_batch_response(
+    status_code: int,
+    payload: dict[str, Any],
+    size: int,
+) -> list[UpstreamResult] | None:
+    """Fans a ``{"results": [{"status": ..., "body": ...}]}`` batch response out per item."""
+    if status_code in BATCH_UNSUPPORTED_STATUS_CODES:
+        return None
+    if status_code >= 400:
+        return [(status_code, payload)] * size
+    results = payload.get("results")
+    if not isinstance(results, list) or len(results) != size:
+        mismatch = {"detail": "upstream batch response does not match the batched requests"}
+        return [(502, mismatch)] * size
+    split: list[UpstreamResult] = []
+    for result in results:
+        body = result.get("body") if isinstance(result, dict) else None
+        item_status = result.get("status", 200) if isinstance(result, dict) else 502
+        split.append(
+            (
+                item_status if isinstance(item_status, int) else 502,
+                body if isinstance(body, dict) else {"detail": body},
+            )
+        )
+    return split
+
+
+def batch_endpoint_call(
+    *,
+    url: str,
+    upstream: str,
+    timeout_seconds: float,
+    max_retries: int,
+    backoff_seconds: float,
+) -> BatchCall:
+    """Batch call posting ``{"requests": [...]}`` to an upstream batch endpoint."""
+
+    async def call(items: list[Any]) -> list[UpstreamResult] | None:
+        status_code, payload = await post_with_retry(
+            url=url,
+            timeout_seconds=timeout_seconds,
+            json_body={"requests": items},
+            headers=propagation_headers(),
+            max_retries=max_retries,
+            backoff_seconds=backoff_seconds,
+            upstream=upstream,
+        )
+        return split_batch_response(status_code, payload, len(items))
+
+    return call
+
+
+_batchers: dict[str, MicroBatcher] = {}
+
+
+def get_micro_batcher(endpoint: str) -> MicroBatcher | None:
+    if not settings.micro_batching_enabled:
+        return None
+    batcher = _batchers.get(endpoint)
+    if batcher is None:
+        batcher = MicroBatcher(
+            endpoint=endpoint,
+            window_seconds=settings.micro_batch_window_seconds,
+            max_batch_size=settings.micro_batch_max_size,
+            max_parallel=settings.micro_batch_max_parallel,
+        )
+        _batchers[endpoint] = batcher
+    return batcher
+
+
+def reset_micro_batchers() -> None:
+    _batchers.clear()
+
+
+async def batched(
+    endpoint: str,
+    key: Hashable | None,
+    item: Any,
+    single: SingleCall,
+    batch: BatchCall | None = None,
+) -> UpstreamResult:
+    """Runs ``single`` through the endpoint's micro-batcher, or directly when batching is off."""
+    batcher = get_micro_batcher(endpoint)
+    if batcher is None:
+        return await single()
+    return await batcher.load(key, item, single, batch)
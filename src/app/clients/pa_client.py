@@ -1,8 +1,13 @@
-from typing import Any
+from typing import Any, Awaitable, Coroutine
 
 import httpx
 
+from app.clients.columnar import post_series
 from app.clients.http_resilience import post_with_retry, response_payload
+from app.clients.micro_batcher import BatchCall, batch_endpoint_call, batched
+from app.clients.revalidation_cache import ConditionalRead, RevalidationCache
+from app.clients.single_flight import single_flight_key
+from app.config import settings
 from app.observability import propagation_headers
 
 
@@ -13,11 +18,13 @@ class PaClient:
         timeout_seconds: float,
         max_retries: int = 2,
         retry_backoff_seconds: float = 0.2,
+        revalidation_cache: RevalidationCache | None = None,
     ):
         self._base_url = base_url.rstrip("/")
         self._timeout_seconds = timeout_seconds
         self._max_retries = max_retries
         self._retry_backoff_seconds = retry_backoff_seconds
+        self._revalidation_cache = revalidation_cache
 
     async def get_pas_input_twr(
         self,
@@ -33,23 +40,51 @@ class PaClient:
             "consumerSystem": "REPORTING",
         }
         headers = propagation_headers()
-        return await post_with_retry(
-            url=url,
-            timeout_seconds=self._timeout_seconds,
-            json_body=payload,
-            headers=headers,
-            max_retries=self._max_retries,
-            backoff_seconds=self._retry_backoff_seconds,
+        key = single_flight_key("pas_input_twr", portfolio_id, as_of_date, payload)
+        conditional = None
+        if self._revalidation_cache is not None:
+            conditional = ConditionalRead(self._revalidation_cache, key, "pas_input_twr")
+
+        def fetch() -> Coroutine[Any, Any, tuple[int, dict[str, Any]]]:
+            return post_with_retry(
+                url=url,
+                timeout_seconds=self._timeout_seconds,
+                json_body=payload,
+                headers=headers,
+                max_retries=self._max_retries,
+                backoff_seconds=self._retry_backoff_seconds,
+                upstream="pa",
+                conditional=conditional,
+            )
+
+        return await batched(
+            "pas_input_twr", key, payload, fetch, self._batch_call(settings.pa_twr_input_batch_path)
         )
 
     async def calculate_twr(self, payload: dict[str, Any]) -> tuple[int, dict[str, Any]]:
         url = f"{self._base_url}/performance/twr"
         headers = propagation_headers()
-        return await post_with_retry(
-            url=url,
+
+        def calculate(body: dict[str, Any]) -> Awaitable[tuple[int, dict[str, Any]]]:
+            return post_with_retry(
+                url=url,
+                timeout_seconds=self._timeout_seconds,
+                json_body=body,
+                headers=headers,
+                max_retries=self._max_retries,
+                backoff_seconds=self._retry_backoff_seconds,
+                upstream="pa",
+            )
+
+        return await post_series("pa", payload, "valuation_points", "perf_date", calculate)
+
+    def _batch_call(self, path: str) -> BatchCall | None:
+        if not path:
+            return None
+        return batch_endpoint_call(
+            url=f"{self._base_url}{path}",
+            upstream="pa",
             timeout_seconds=self._timeout_seconds,
-            json_body=payload,
-            headers=headers,
             max_retries=self._max_retries,
             backoff_seconds=self._retry_backoff_seconds,
         )
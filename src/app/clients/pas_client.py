@@ -1,11 +1,26 @@
-from typing import Any
+from typing import Any, Coroutine, Hashable
 
 import httpx
 
 from app.clients.http_resilience import post_with_retry, response_payload
+from app.clients.json_stream import KeepSpec
+from app.clients.micro_batcher import BatchCall, batch_endpoint_call, batched
+from app.clients.revalidation_cache import ConditionalRead, RevalidationCache
+from app.clients.single_flight import single_flight_key, upstream_single_flight
+from app.clients.snapshot_cache import CORE_SNAPSHOT_SECTION_KEYS, CoreSnapshotCache
+from app.clients.valuation_cache import ValuationSeriesCache
+from app.config import settings
 from app.observability import propagation_headers
 
 
+def core_snapshot_keep_spec(include_sections: list[str]) -> KeepSpec:
+    """Keeps envelope fields and only the requested snapshot sections of a core snapshot."""
+    section_keys = [CORE_SNAPSHOT_SECTION_KEYS.get(section) for section in include_sections]
+    if any(key is None for key in section_keys):
+        return None
+    return {"*": None, "snapshot": {key: None for key in section_keys if key is not None}}
+
+
 class PasClient:
     def __init__(
         self,
@@ -13,17 +28,49 @@ class PasClient:
         timeout_seconds: float,
         max_retries: int = 2,
         retry_backoff_seconds: float = 0.2,
+        snapshot_cache: CoreSnapshotCache | None = None,
+        revalidation_cache: RevalidationCache | None = None,
+        valuation_cache: ValuationSeriesCache | None = None,
     ):
         self._base_url = base_url.rstrip("/")
         self._timeout_seconds = timeout_seconds
         self._max_retries = max_retries
         self._retry_backoff_seconds = retry_backoff_seconds
+        self._snapshot_cache = snapshot_cache
+        self._revalidation_cache = revalidation_cache
+        self._valuation_cache = valuation_cache
 
     async def get_core_snapshot(
         self,
         portfolio_id: str,
         as_of_date: str,
         include_sections: list[str],
+    ) -> tuple[int, dict[str, Any]]:
+        cache = self._snapshot_cache
+        if cache is None:
+            return await self._fetch_core_snapshot(portfolio_id, as_of_date, include_sections)
+
+        cached, missing_sections = cache.lookup(portfolio_id, as_of_date, include_sections)
+        if cached is not None:
+            return 200, cached
+        status_code, payload = await self._fetch_core_snapshot(
+            portfolio_id, as_of_date, missing_sections
+        )
+        if status_code >= 400:
+            return status_code, payload
+        cache.store(portfolio_id, as_of_date, missing_sections, payload)
+        merged = cache.get(portfolio_id, as_of_date, include_sections)
+        if merged is not None:
+            return status_code, merged
+        if missing_sections == include_sections:
+            return status_code, payload
+        return await self._fetch_core_snapshot(portfolio_id, as_of_date, include_sections)
+
+    async def _fetch_core_snapshot(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        include_sections: list[str],
     ) -> tuple[int, dict[str, Any]]:
         url = f"{self._base_url}/integration/portfolios/{portfolio_id}/core-snapshot"
         payload = {
@@ -32,13 +79,35 @@ class PasClient:
             "consumerSystem": "REPORTING",
         }
         headers = propagation_headers()
-        return await post_with_retry(
-            url=url,
-            timeout_seconds=self._timeout_seconds,
-            json_body=payload,
-            headers=headers,
-            max_retries=self._max_retries,
-            backoff_seconds=self._retry_backoff_seconds,
+        key = single_flight_key("core_snapshot", portfolio_id, as_of_date, payload)
+        conditional = self._conditional_read(key, "core_snapshot")
+
+        def fetch() -> Coroutine[Any, Any, tuple[int, dict[str, Any]]]:
+            return post_with_retry(
+                url=url,
+                timeout_seconds=self._timeout_seconds,
+                json_body=payload,
+                headers=headers,
+                max_retries=self._max_retries,
+                backoff_seconds=self._retry_backoff_seconds,
+                upstream="pas",
+                idempotent=True,
+                endpoint="core_snapshot",
+                stream_decode=settings.upstream_stream_decode_enabled,
+                keep=core_snapshot_keep_spec(include_sections),
+                conditional=conditional,
+            )
+
+        return await upstream_single_flight.do(
+            key,
+            lambda: batched(
+                "core_snapshot",
+                key,
+                {"portfolioId": portfolio_id, **payload},
+                fetch,
+                self._batch_call(settings.pas_core_snapshot_batch_path),
+            ),
+            endpoint="core_snapshot",
         )
 
     async def get_performance_input(
@@ -46,6 +115,22 @@ class PasClient:
         portfolio_id: str,
         as_of_date: str,
         lookback_days: int = 1200,
+    ) -> tuple[int, dict[str, Any]]:
+        cache = self._valuation_cache
+        if cache is None:
+            return await self._fetch_performance_input(portfolio_id, as_of_date, lookback_days)
+        return await cache.load(
+            portfolio_id,
+            as_of_date,
+            lookback_days,
+            lambda days: self._fetch_performance_input(portfolio_id, as_of_date, days),
+        )
+
+    async def _fetch_performance_input(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        lookback_days: int,
     ) -> tuple[int, dict[str, Any]]:
         url = f"{self._base_url}/integration/portfolios/{portfolio_id}/performance-input"
         payload = {
@@ -54,13 +139,23 @@ class PasClient:
             "consumerSystem": "REPORTING",
         }
         headers = propagation_headers()
-        return await post_with_retry(
-            url=url,
-            timeout_seconds=self._timeout_seconds,
-            json_body=payload,
-            headers=headers,
-            max_retries=self._max_retries,
-            backoff_seconds=self._retry_backoff_seconds,
+        key = single_flight_key("performance_input", portfolio_id, as_of_date, payload)
+        conditional = self._conditional_read(key, "performance_input")
+        return await upstream_single_flight.do(
+            key,
+            lambda: post_with_retry(
+                url=url,
+                timeout_seconds=self._timeout_seconds,
+                json_body=payload,
+                headers=headers,
+                max_retries=self._max_retries,
+                backoff_seconds=self._retry_backoff_seconds,
+                upstream="pas",
+                idempotent=True,
+                endpoint="performance_input",
+                conditional=conditional,
+            ),
+            endpoint="performance_input",
         )
 
     async def get_portfolio_summary(
@@ -78,6 +173,7 @@ class PasClient:
             headers=headers,
             max_retries=self._max_retries,
             backoff_seconds=self._retry_backoff_seconds,
+            upstream="pas",
         )
 
     async def get_portfolio_review(
@@ -95,8 +191,25 @@ class PasClient:
             headers=headers,
             max_retries=self._max_retries,
             backoff_seconds=self._retry_backoff_seconds,
+            upstream="pas",
         )
 
+    def _batch_call(self, path: str) -> BatchCall | None:
+        if not path:
+            return None
+        return batch_endpoint_call(
+            url=f"{self._base_url}{path}",
+            upstream="pas",
+            timeout_seconds=self._timeout_seconds,
+            max_retries=self._max_retries,
+            backoff_seconds=self._retry_backoff_seconds,
+        )
+
+    def _conditional_read(self, key: Hashable, endpoint: str) -> ConditionalRead | None:
+        if self._revalidation_cache is None:
+            return None
+        return ConditionalRead(self._revalidation_cache, key, endpoint)
+
     def _headers(self, correlation_id: str | None) -> dict[str, str]:
         if not correlation_id:
             return {}
@@ -0,0 +1,99 @@
+import random
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from prometheus_client import Counter, Histogram
+
+from app.config import settings
+
+UPSTREAM_RETRIES = Counter(
+    "lotus_report_upstream_retries_total",
+    "Upstream call retries by trigger (error, retry_after, unsupported_encoding).",
+    ["upstream", "trigger"],
+)
+RETRY_BUDGET_EXHAUSTED = Counter(
+    "lotus_report_upstream_retry_budget_exhausted_total",
+    "Upstream retries skipped because the retry budget was spent.",
+    ["upstream"],
+)
+RETRY_BACKOFF_SECONDS = Histogram(
+    "lotus_report_upstream_retry_backoff_seconds",
+    "Time slept before an upstream retry.",
+    ["upstream"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+class RetryBudget:
+    """Token bucket capping retries to a fraction of successful calls for one upstream.
+
+    Every successful call deposits ``ratio`` tokens (up to ``max_tokens``) and every retry
+    withdraws one. The bucket starts full so a cold process can still ride out a blip.
+    """
+
+    def __init__(self, upstream: str, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.upstream = upstream
+        self._ratio = ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def record_success(self) -> None:
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_withdraw(self) -> bool:
+        if self._tokens < 1.0:
+            RETRY_BUDGET_EXHAUSTED.labels(upstream=self.upstream).inc()
+            return False
+        self._tokens -= 1.0
+        return True
+
+
+def full_jitter_backoff(base_seconds: float, attempt: int, cap_seconds: float) -> float:
+    return random.uniform(0.0, min(cap_seconds, base_seconds * (2**attempt)))
+
+
+def parse_retry_after(header: str | None, now: float | None = None) -> float | None:
+    """Parses a ``Retry-After`` header (delta seconds or HTTP date) into seconds from now."""
+    if not header:
+        return None
+    header = header.strip()
+    if header.isdigit():
+        return int(header)
+    try:
+        retry_at = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    current = datetime.now(UTC).timestamp() if now is None else now
+    return max(0.0, retry_at.timestamp() - current)
+
+
+def record_retry(upstream: str, trigger: str, delay_seconds: float) -> None:
+    UPSTREAM_RETRIES.labels(upstream=upstream, trigger=trigger).inc()
+    RETRY_BACKOFF_SECONDS.labels(upstream=upstream).observe(delay_seconds)
+
+
+_retry_budgets: dict[str, RetryBudget] = {}
+
+
+def get_retry_budget(upstream: str) -> RetryBudget | None:
+    if not settings.retry_budget_enabled:
+        return None
+    budget = _retry_budgets.get(upstream)
+    if budget is None:
+        budget = RetryBudget(
+            upstream=upstream,
+            ratio=settings.retry_budget_ratio,
+            max_tokens=settings.retry_budget_max_tokens,
+        )
+        _retry_budgets[upstream] = budget
+    return budget
+
+
+def reset_retry_budgets() -> None:
+    _retry_budgets.clear()
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Mapping
+
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+
+UPSTREAM_REVALIDATIONS = Counter(
+    "lotus_report_upstream_revalidations_total",
+    "Cacheable upstream reads by outcome (not_modified, modified, uncached).",
+    ["endpoint", "outcome"],
+)
+UPSTREAM_REVALIDATION_BYTES_AVOIDED = Counter(
+    "lotus_report_upstream_revalidation_bytes_avoided_total",
+    "Upstream body bytes not downloaded because a cached body was revalidated with a 304.",
+    ["endpoint"],
+)
+REVALIDATION_CACHE_ENTRIES = Gauge(
+    "lotus_report_upstream_revalidation_cache_entries",
+    "Upstream bodies currently held for conditional reads.",
+)
+REVALIDATION_CACHE_BYTES = Gauge(
+    "lotus_report_upstream_revalidation_cache_bytes",
+    "Upstream body bytes (as downloaded) currently held for conditional reads.",
+)
+
+
+class _Representation:
+    def __init__(
+        self,
+        payload: dict[str, Any],
+        etag: str | None,
+        last_modified: str | None,
+        size_bytes: int,
+    ):
+        self.payload = payload
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size_bytes = size_bytes
+
+
+class RevalidationCache:
+    """LRU of upstream payloads with the ``ETag`` / ``Last-Modified`` validators they came with.
+
+    Unlike the core snapshot TTL cache, entries never go stale on their own: every reuse is
+    confirmed by the upstream answering a conditional request with ``304 Not Modified``. The cache
+    is bounded by entry count and by the downloaded size of the bodies it holds. Cached payloads
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, _Representation] = OrderedDict()
+        self._size_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._max_bytes > 0
+
+    def get(self, key: Hashable) -> _Representation | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(
+        self,
+        key: Hashable,
+        payload: dict[str, Any],
+        etag: str | None,
+        last_modified: str | None,
+        size_bytes: int,
+    ) -> None:
+        self._discard(key)
+        if not self.enabled or not (etag or last_modified) or size_bytes > self._max_bytes:
+            self._export()
+            return
+        self._entries[key] = _Representation(payload, etag, last_modified, size_bytes)
+        self._size_bytes += size_bytes
+        while len(self._entries) > self._max_entries or self._size_bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= evicted.size_bytes
+        self._export()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size_bytes = 0
+        self._export()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= entry.size_bytes
+
+    def _export(self) -> None:
+        REVALIDATION_CACHE_ENTRIES.set(len(self._entries))
+        REVALIDATION_CACHE_BYTES.set(self._size_bytes)
+
+
+class ConditionalRead:
+    """One cacheable upstream read: adds validators to the request and resolves a ``304``."""
+
+    def __init__(self, cache: RevalidationCache, key: Hashable, endpoint: str):
+        self._cache = cache
+        self._key = key
+        self._endpoint = endpoint
+        self._cached = cache.get(key) if cache.enabled else None
+
+    def headers(self) -> dict[str, str]:
+        cached = self._cached
+        if cached is None:
+            return {}
+        headers: dict[str, str] = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def resolve(
+        self,
+        status_code: int,
+        payload: dict[str, Any],
+        response_headers: Mapping[str, str],
+        size_bytes: int,
+    ) -> tuple[int, dict[str, Any]]:
+        cached = self._cached
+        if status_code == 304 and cached is not None:
+            UPSTREAM_REVALIDATIONS.labels(endpoint=self._endpoint, outcome="not_modified").inc()
+            UPSTREAM_REVALIDATION_BYTES_AVOIDED.labels(endpoint=self._endpoint).inc(
+                cached.size_bytes
+            )
+            # A 304 may carry refreshed validators for the same representation.
+            self._cache.store(
+                self._key,
+                cached.payload,
+                response_headers.get("ETag") or cached.etag,
+                response_headers.get("Last-Modified") or cached.last_modified,
+                cached.size_bytes,
+            )
+            return 200, cached.payload
+        if status_code == 200:
+            outcome = "uncached" if cached is None else "modified"
+            UPSTREAM_REVALIDATIONS.labels(endpoint=self._endpoint, outcome=outcome).inc()
+            self._cache.store(
+                self._key,
+                payload,
+                response_headers.get("ETag"),
+                response_headers.get("Last-Modified"),
+                size_bytes,
+            )
+        return status_code, payload
+
+
+upstream_revalidation_cache = RevalidationCache(
+    max_entries=settings.upstream_revalidation_cache_max_entries,
+    max_bytes=settings.upstream_revalidation_cache_max_bytes,
+)
@@ -1,6 +1,9 @@
-from typing import Any
+from typing import Any, Awaitable
 
+from app.clients.columnar import post_series
 from app.clients.http_resilience import post_with_retry
+from app.clients.micro_batcher import BatchCall, batch_endpoint_call, batched
+from app.config import settings
 from app.observability import propagation_headers
 
 
@@ -20,11 +23,33 @@ class RiskClient:
     async def calculate_risk(self, payload: dict[str, Any]) -> tuple[int, dict[str, Any]]:
         url = f"{self._base_url}/analytics/risk/calculate"
         headers = propagation_headers()
-        return await post_with_retry(
-            url=url,
+
+        def calculate(body: dict[str, Any]) -> Awaitable[tuple[int, dict[str, Any]]]:
+            return batched(
+                "calculate_risk",
+                None,
+                body,
+                lambda: post_with_retry(
+                    url=url,
+                    timeout_seconds=self._timeout_seconds,
+                    json_body=body,
+                    headers=headers,
+                    max_retries=self._max_retries,
+                    backoff_seconds=self._retry_backoff_seconds,
+                    upstream="risk",
+                ),
+                self._batch_call(settings.risk_calculate_batch_path),
+            )
+
+        return await post_series("risk", payload, "returns", "date", calculate)
+
+    def _batch_call(self, path: str) -> BatchCall | None:
+        if not path:
+            return None
+        return batch_endpoint_call(
+            url=f"{self._base_url}{path}",
+            upstream="risk",
             timeout_seconds=self._timeout_seconds,
-            json_body=payload,
-            headers=headers,
             max_retries=self._max_retries,
             backoff_seconds=self._retry_backoff_seconds,
         )
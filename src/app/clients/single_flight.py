@@ -0,0 +1,91 @@
+import asyncio
+import contextvars
+import json
+from typing import Any, Callable, Coroutine, Hashable
+
+from prometheus_client import Counter
+
+from app.observability import DEADLINE_EXCEEDED_DETAIL, deadline_var, remaining_budget_seconds
+
+UpstreamResult = tuple[int, dict[str, Any]]
+
+SINGLE_FLIGHT_CALLS = Counter(
+    "lotus_report_upstream_single_flight_total",
+    "Upstream reads by single-flight outcome (hit joined an in-flight call, miss started one).",
+    ["endpoint", "outcome"],
+)
+
+
+def single_flight_key(
+    endpoint: str,
+    portfolio_id: str,
+    as_of_date: str,
+    body: dict[str, Any],
+) -> tuple[str, str, str, str]:
+    normalized_body = json.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return endpoint, portfolio_id, as_of_date, normalized_body
+
+
+class _Flight:
+    def __init__(self, task: "asyncio.Future[UpstreamResult]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces identical concurrent upstream reads onto one shared call.
+
+    The shared call runs in its own task, so a waiter that is cancelled (for example because its
+    HTTP client disconnected) does not cancel the call for the remaining waiters. The call is only
+    cancelled once every waiter has gone. Waiters receive the same payload object and must treat
+    it as read-only.
+
+    Waiters can carry different request deadlines, so the shared call runs without one and each
+    waiter stops waiting at its own deadline with a ``504``. The call therefore lasts at most as
+    long as the waiter with the latest deadline.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def do(
+        self,
+        key: Hashable,
+        call: Callable[[], Coroutine[Any, Any, UpstreamResult]],
+        endpoint: str,
+    ) -> UpstreamResult:
+        flight = self._flights.get(key)
+        if flight is None:
+            SINGLE_FLIGHT_CALLS.labels(endpoint=endpoint, outcome="miss").inc()
+            # The shared call must not inherit the first caller's deadline.
+            context = contextvars.copy_context()
+            context.run(deadline_var.set, None)
+            flight = _Flight(asyncio.get_running_loop().create_task(call(), context=context))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            SINGLE_FLIGHT_CALLS.labels(endpoint=endpoint, outcome="hit").inc()
+
+        flight.waiters += 1
+        budget = remaining_budget_seconds()
+        try:
+            if budget is None:
+                return await asyncio.shield(flight.task)
+            return await asyncio.wait_for(asyncio.shield(flight.task), budget)
+        except TimeoutError:
+            return 504, {"detail": DEADLINE_EXCEEDED_DETAIL}
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+upstream_single_flight = SingleFlight()
@@ -0,0 +1,163 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from prometheus_client import Counter, Gauge
+
+from app.config import settings
+
+CORE_SNAPSHOT_SECTION_KEYS = {
+    "OVERVIEW": "overview",
+    "ALLOCATION": "allocation",
+    "INCOME_AND_ACTIVITY": "incomeAndActivity",
+    "HOLDINGS": "holdings",
+    "TRANSACTIONS": "transactions",
+}
+
+SNAPSHOT_CACHE_LOOKUPS = Counter(
+    "lotus_report_core_snapshot_cache_lookups_total",
+    "Core snapshot cache lookups by outcome (hit, partial, miss, bypass).",
+    ["outcome"],
+)
+SNAPSHOT_CACHE_ENTRIES = Gauge(
+    "lotus_report_core_snapshot_cache_entries",
+    "Core snapshot cache entries currently held.",
+)
+
+
+class _SnapshotEntry:
+    def __init__(self, payload: dict[str, Any], sections: set[str], expires_at: float):
+        self.payload = payload
+        self.sections = sections
+        self.expires_at = expires_at
+
+
+class CoreSnapshotCache:
+    """TTL and size bounded lotus-core snapshot cache keyed by portfolio and as-of date.
+
+    Entries remember which sections they hold. A request for a subset of cached sections is served
+    from the entry; missing sections are fetched on their own and merged in. Merged sections keep
+    the entry's original expiry, so no section is ever older than the TTL. Cached payloads are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _SnapshotEntry] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_entries > 0
+
+    def cacheable(self, sections: list[str]) -> bool:
+        return self.enabled and all(section in CORE_SNAPSHOT_SECTION_KEYS for section in sections)
+
+    def lookup(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        sections: list[str],
+    ) -> tuple[dict[str, Any] | None, list[str]]:
+        if not self.cacheable(sections):
+            SNAPSHOT_CACHE_LOOKUPS.labels(outcome="bypass").inc()
+            return None, list(sections)
+        entry = self._live_entry((portfolio_id, as_of_date))
+        if entry is None:
+            SNAPSHOT_CACHE_LOOKUPS.labels(outcome="miss").inc()
+            return None, list(sections)
+        missing = [section for section in sections if section not in entry.sections]
+        if missing:
+            SNAPSHOT_CACHE_LOOKUPS.labels(outcome="partial").inc()
+            return None, missing
+        SNAPSHOT_CACHE_LOOKUPS.labels(outcome="hit").inc()
+        return self._view(entry, sections), []
+
+    def store(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        sections: list[str],
+        payload: dict[str, Any],
+    ) -> None:
+        snapshot = payload.get("snapshot")
+        if not self.cacheable(sections) or not isinstance(snapshot, dict):
+            return
+        key = (portfolio_id, as_of_date)
+        entry = self._live_entry(key)
+        if entry is None:
+            entry = _SnapshotEntry(
+                payload={**payload, "snapshot": {}},
+                sections=set(),
+                expires_at=self._clock() + self._ttl_seconds,
+            )
+            self._entries[key] = entry
+        for section in sections:
+            section_key = CORE_SNAPSHOT_SECTION_KEYS[section]
+            entry.payload["snapshot"][section_key] = snapshot.get(section_key)
+            entry.sections.add(section)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        SNAPSHOT_CACHE_ENTRIES.set(len(self._entries))
+
+    def get(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        sections: list[str],
+    ) -> dict[str, Any] | None:
+        entry = self._live_entry((portfolio_id, as_of_date))
+        if entry is None or any(section not in entry.sections for section in sections):
+            return None
+        return self._view(entry, sections)
+
+    def invalidate(self, portfolio_id: str, as_of_date: str | None = None) -> int:
+        keys = [
+            key
+            for key in self._entries
+            if key[0] == portfolio_id and (as_of_date is None or key[1] == as_of_date)
+        ]
+        for key in keys:
+            del self._entries[key]
+        SNAPSHOT_CACHE_ENTRIES.set(len(self._entries))
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        SNAPSHOT_CACHE_ENTRIES.set(0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _live_entry(self, key: tuple[str, str]) -> _SnapshotEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            del self._entries[key]
+            SNAPSHOT_CACHE_ENTRIES.set(len(self._entries))
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    @staticmethod
+    def _view(entry: _SnapshotEntry, sections: list[str]) -> dict[str, Any]:
+        section_keys = [CORE_SNAPSHOT_SECTION_KEYS[section] for section in sections]
+        snapshot = entry.payload["snapshot"]
+        return {
+            **entry.payload,
+            "snapshot": {key: snapshot[key] for key in section_keys},
+        }
+
+
+core_snapshot_cache = CoreSnapshotCache(
+    ttl_seconds=settings.core_snapshot_cache_ttl_seconds,
+    max_entries=settings.core_snapshot_cache_max_entries,
+)
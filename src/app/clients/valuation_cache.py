@@ -0,0 +1,360 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable
+
+from prometheus_client import Counter, Gauge
+
+from app.clients.single_flight import UpstreamResult
+from app.config import settings
+
+# Envelope fields that identify the history a series belongs to; a change means restated history.
+_IDENTITY_FIELDS = ("performanceStartDate", "baseCurrency")
+
+VALUATION_SERIES_FETCHES = Counter(
+    "lotus_report_valuation_series_fetches_total",
+    "Performance input reads by mode (full history, delta of new days, restated or expired history"
+    " refetch).",
+    ["mode"],
+)
+VALUATION_SERIES_CACHE_ENTRIES = Gauge(
+    "lotus_report_valuation_series_cache_entries",
+    "Portfolios whose valuation series is currently cached.",
+)
+VALUATION_SERIES_CACHE_POINTS = Gauge(
+    "lotus_report_valuation_series_cache_points",
+    "Valuation points currently cached across all portfolios.",
+)
+VALUATION_SERIES_CACHE_BYTES = Gauge(
+    "lotus_report_valuation_series_cache_bytes",
+    "Bytes held by cached valuation series columns.",
+)
+
+FetchPerformanceInput = Callable[[int], Awaitable[UpstreamResult]]
+
+
+# Array typecodes for numeric fields lotus-core sends as JSON integers and as JSON floats.
+_INT_COLUMN = "q"
+_FLOAT_COLUMN = "d"
+_INT_RANGE = range(-(1 << 63), 1 << 63)
+
+
+class _EncodedPoints:
+    def __init__(
+        self,
+        ordinals: list[int],
+        columns: dict[str, list[int | float]],
+        typecodes: dict[str, str],
+    ):
+        self.ordinals = ordinals
+        self.columns = columns
+        self.typecodes = typecodes
+
+
+def _typecode(number: Any) -> str | None:
+    if type(number) is int and number in _INT_RANGE:
+        return _INT_COLUMN
+    if type(number) is float:
+        return _FLOAT_COLUMN
+    return None
+
+
+def _encode(
+    points: Any,
+    fields: tuple[str, ...],
+    numbered: bool,
+    typecodes: dict[str, str] | None = None,
+) -> _EncodedPoints | None:
+    """Column-wise copy of valuation points, or None when they do not fit the series layout.
+
+    Every value of a field must have the same JSON number type, taken from ``typecodes`` or else
+    from the first point, so the column can hold it without changing it.
+    """
+    if not isinstance(points, list):
+        return None
+    expected = {"perf_date", *fields, *(("day",) if numbered else ())}
+    ordinals: list[int] = []
+    columns: dict[str, list[int | float]] = {field: [] for field in fields}
+    if typecodes is None and points and isinstance(points[0], dict):
+        typecodes = {field: _typecode(points[0].get(field)) or "" for field in fields}
+    for point in points:
+        if not isinstance(point, dict) or point.keys() != expected:
+            return None
+        try:
+            ordinal = date.fromisoformat(str(point["perf_date"])).toordinal()
+        except ValueError:
+            return None
+        if ordinals and ordinal <= ordinals[-1]:
+            return None
+        ordinals.append(ordinal)
+        for field in fields:
+            number = point[field]
+            if typecodes is None or _typecode(number) != typecodes[field]:
+                return None
+            columns[field].append(number)
+    return _EncodedPoints(ordinals, columns, typecodes or {})
+
+
+class _ValuationSeries:
+    """One portfolio's valuation points held column-wise in typed arrays.
+
+    Dates are day ordinals and every numeric field is one typed array column, ``array("q")`` for
+    fields lotus-core sends as integers and ``array("d")`` for floats, so a point costs a few
+    machine words instead of a dict and rebuilt points carry the same numbers and types. ``day``
+    is not stored: like a fresh lotus-core read, rebuilt points are numbered from 1 at the start
+    of the window served.
+    """
+
+    __slots__ = (
+        "envelope",
+        "fields",
+        "numbered",
+        "typecodes",
+        "window_start",
+        "ordinals",
+        "columns",
+        "loaded_at",
+    )
+
+    def __init__(
+        self,
+        envelope: dict[str, Any],
+        fields: tuple[str, ...],
+        numbered: bool,
+        typecodes: dict[str, str],
+        window_start: int,
+        loaded_at: float,
+    ):
+        self.envelope = envelope
+        self.fields = fields
+        self.numbered = numbered
+        self.typecodes = typecodes
+        self.window_start = window_start
+        self.loaded_at = loaded_at
+        self.ordinals = array("l")
+        self.columns: dict[str, array[Any]] = {field: array(typecodes[field]) for field in fields}
+
+    @classmethod
+    def from_payload(
+        cls, payload: dict[str, Any], window_start: int, loaded_at: float
+    ) -> "_ValuationSeries | None":
+        points = payload.get("valuationPoints")
+        if not isinstance(points, list) or not points or not isinstance(points[0], dict):
+            return None
+        numbered = "day" in points[0]
+        fields = tuple(key for key in points[0] if key not in ("perf_date", "day"))
+        encoded = _encode(points, fields, numbered)
+        if encoded is None:
+            return None
+        series = cls(
+            _envelope(payload), fields, numbered, encoded.typecodes, window_start, loaded_at
+        )
+        series.extend(encoded)
+        return series
+
+    @property
+    def last_ordinal(self) -> int:
+        return self.ordinals[-1]
+
+    @property
+    def size_bytes(self) -> int:
+        columns = sum(column.itemsize * len(column) for column in self.columns.values())
+        return self.ordinals.itemsize * len(self.ordinals) + columns
+
+    def covers(self, window_start: int) -> bool:
+        if self.window_start <= window_start:
+            return True
+        start_date = self.envelope.get("performanceStartDate")
+        try:
+            return date.fromisoformat(str(start_date)[:10]).toordinal() >= self.window_start
+        except ValueError:
+            return False
+
+    def encode(self, points: Any) -> _EncodedPoints | None:
+        return _encode(points, self.fields, self.numbered, self.typecodes)
+
+    def extend(self, encoded: _EncodedPoints) -> None:
+        first = bisect_right(encoded.ordinals, self.ordinals[-1]) if self.ordinals else 0
+        self.ordinals.extend(encoded.ordinals[first:])
+        for field, column in self.columns.items():
+            column.extend(encoded.columns[field][first:])
+
+    def matches(self, encoded: _EncodedPoints, start: int, end: int) -> bool:
+        """True when ``encoded`` holds the same points as the cache between two ordinals."""
+        cached_first = bisect_left(self.ordinals, start)
+        cached_last = bisect_right(self.ordinals, end)
+        fresh_first = bisect_left(encoded.ordinals, start)
+        fresh_last = bisect_right(encoded.ordinals, end)
+        if cached_last - cached_first != fresh_last - fresh_first:
+            return False
+        for offset in range(cached_last - cached_first):
+            cached, fresh = cached_first + offset, fresh_first + offset
+            if self.ordinals[cached] != encoded.ordinals[fresh]:
+                return False
+            if any(
+                self.columns[field][cached] != encoded.columns[field][fresh]
+                for field in self.fields
+            ):
+                return False
+        return True
+
+    def points(self, start: int, end: int) -> list[dict[str, Any]]:
+        first = bisect_left(self.ordinals, start)
+        last = bisect_right(self.ordinals, end)
+        points: list[dict[str, Any]] = []
+        for day, position in enumerate(range(first, last), start=1):
+            point: dict[str, Any] = {}
+            if self.numbered:
+                point["day"] = day
+            point["perf_date"] = date.fromordinal(self.ordinals[position]).isoformat()
+            for field in self.fields:
+                point[field] = self.columns[field][position]
+            points.append(point)
+        return points
+
+
+def _envelope(payload: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in payload.items() if key != "valuationPoints"}
+
+
+class ValuationSeriesCache:
+    """Append-only per-portfolio cache of lotus-core valuation points.
+
+    The first read for a portfolio fetches the full lookback. Later reads fetch only the days after
+    the last cached date plus ``restatement_days`` already cached days; if those overlapping days
+    (or the portfolio's start date or currency) no longer match, history was restated, so the
+    series is dropped and the full lookback is fetched again. Restatements older than the overlap
+    are caught by ``max_age_seconds``: a series whose last full read is that old is dropped and
+    the full lookback is fetched again. Bounded by portfolio count and by the bytes held in the
+    series columns.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        restatement_days: int,
+        max_age_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._restatement_days = max(1, restatement_days)
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._series: OrderedDict[str, _ValuationSeries] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._max_bytes > 0 and self._max_age_seconds > 0
+
+    async def load(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        lookback_days: int,
+        fetch: FetchPerformanceInput,
+    ) -> UpstreamResult:
+        """Performance input for ``lookback_days`` ending on ``as_of_date``, fetching a delta
+        when the cached series covers the window."""
+        if not self.enabled:
+            return await fetch(lookback_days)
+        as_of = date.fromisoformat(as_of_date).toordinal()
+        window_start = as_of - lookback_days + 1
+        series = self._series.get(portfolio_id)
+        if series is not None and self._clock() - series.loaded_at >= self._max_age_seconds:
+            VALUATION_SERIES_FETCHES.labels(mode="expired").inc()
+            self.invalidate(portfolio_id)
+            series = None
+        if series is None or not series.covers(window_start):
+            return await self._load_full(portfolio_id, as_of, window_start, lookback_days, fetch)
+
+        anchor = min(series.last_ordinal, as_of)
+        delta_start = anchor - self._restatement_days + 1
+        if delta_start <= window_start:
+            return await self._load_full(portfolio_id, as_of, window_start, lookback_days, fetch)
+        status_code, payload = await fetch(as_of - delta_start + 1)
+        if status_code >= 400:
+            return status_code, payload
+        encoded = series.encode(payload.get("valuationPoints"))
+        if (
+            encoded is None
+            or not series.matches(encoded, delta_start, anchor)
+            or any(payload.get(field) != series.envelope.get(field) for field in _IDENTITY_FIELDS)
+        ):
+            VALUATION_SERIES_FETCHES.labels(mode="restated").inc()
+            self.invalidate(portfolio_id)
+            return await self._load_full(portfolio_id, as_of, window_start, lookback_days, fetch)
+
+        VALUATION_SERIES_FETCHES.labels(mode="delta").inc()
+        envelope = _envelope(payload)
+        if as_of >= series.last_ordinal:
+            series.envelope = envelope
+            series.extend(encoded)
+        self._series.move_to_end(portfolio_id)
+        self._evict()
+        return status_code, {**envelope, "valuationPoints": series.points(window_start, as_of)}
+
+    async def _load_full(
+        self,
+        portfolio_id: str,
+        as_of: int,
+        window_start: int,
+        lookback_days: int,
+        fetch: FetchPerformanceInput,
+    ) -> UpstreamResult:
+        VALUATION_SERIES_FETCHES.labels(mode="full").inc()
+        status_code, payload = await fetch(lookback_days)
+        if status_code >= 400:
+            return status_code, payload
+        series = _ValuationSeries.from_payload(payload, window_start, self._clock())
+        if series is not None and series.size_bytes <= self._max_bytes:
+            current = self._series.get(portfolio_id)
+            # Keep a longer cached history when a shorter window was requested for an earlier date.
+            if current is None or current.last_ordinal <= series.last_ordinal:
+                self._series[portfolio_id] = series
+                self._series.move_to_end(portfolio_id)
+                self._evict()
+        return status_code, payload
+
+    def invalidate(self, portfolio_id: str) -> bool:
+        removed = self._series.pop(portfolio_id, None) is not None
+        self._export()
+        return removed
+
+    def clear(self) -> None:
+        self._series.clear()
+        self._export()
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(series.size_bytes for series in self._series.values())
+
+    def _evict(self) -> None:
+        size_bytes = self.size_bytes
+        while self._series and (
+            len(self._series) > self._max_entries or size_bytes > self._max_bytes
+        ):
+            _, evicted = self._series.popitem(last=False)
+            size_bytes -= evicted.size_bytes
+        self._export(size_bytes)
+
+    def _export(self, size_bytes: int | None = None) -> None:
+        VALUATION_SERIES_CACHE_ENTRIES.set(len(self._series))
+        VALUATION_SERIES_CACHE_POINTS.set(
+            sum(len(series.ordinals) for series in self._series.values())
+        )
+        VALUATION_SERIES_CACHE_BYTES.set(self.size_bytes if size_bytes is None else size_bytes)
+
+
+valuation_series_cache = ValuationSeriesCache(
+    max_entries=settings.valuation_series_cache_max_entries,
+    max_bytes=settings.valuation_series_cache_max_bytes,
+    restatement_days=settings.valuation_series_restatement_days,
+    max_age_seconds=settings.valuation_series_max_age_seconds,
+)
@@ -0,0 +1,138 @@
+import json
+import logging
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+JSON_CODEC_BACKENDS = ("orjson", "msgspec", "stdlib")
+
+
+def _encode_default(obj: Any) -> Any:
+    # Decimals are emitted as exact strings so they never round-trip through binary floating point.
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    name: str
+    dumps: Callable[[Any], bytes]
+    _loads: Callable[[bytes | str], Any]
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decodes JSON; backend-specific decode errors are raised as ``ValueError``."""
+        return self._loads(data)
+
+    def dumps_str(self, obj: Any) -> str:
+        return self.dumps(obj).decode("utf-8")
+
+
+def _non_finite_as_null(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _non_finite_as_null(item) for key, item in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_non_finite_as_null(item) for item in obj]
+    return obj
+
+
+def _stdlib_codec() -> JsonCodec:
+    def _encode(obj: Any) -> bytes:
+        return json.dumps(
+            obj,
+            default=_encode_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def _dumps(obj: Any) -> bytes:
+        try:
+            return _encode(obj)
+        except ValueError as exc:
+            if "Out of range float" not in str(exc):
+                raise
+            # NaN and infinity are written as null, as orjson and msgspec do; the copy is only
+            # made for the rare payload that holds them.
+            return _encode(_non_finite_as_null(obj))
+
+    return JsonCodec(name="stdlib", dumps=_dumps, _loads=json.loads)
+
+
+def _orjson_codec() -> JsonCodec | None:
+    try:
+        import orjson
+    except ImportError:
+        return None
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+    return JsonCodec(name="orjson", dumps=_dumps, _loads=orjson.loads)
+
+
+def _msgspec_codec() -> JsonCodec | None:
+    try:
+        import msgspec
+    except ImportError:
+        return None
+
+    encoder = msgspec.json.Encoder(enc_hook=_encode_default, decimal_format="string")
+    decoder = msgspec.json.Decoder()
+
+    def _loads(data: bytes | str) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    return JsonCodec(name="msgspec", dumps=encoder.encode, _loads=_loads)
+
+
+_BACKEND_FACTORIES: dict[str, Callable[[], JsonCodec | None]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "stdlib": _stdlib_codec,
+}
+
+
+def build_codec(backend: str = "auto") -> JsonCodec:
+    """Returns the requested backend, or the fastest installed one for ``auto``.
+
+    A named backend that is not installed falls back to the stdlib codec with a warning.
+    """
+    candidates = JSON_CODEC_BACKENDS if backend == "auto" else (backend,)
+    for candidate in candidates:
+        factory = _BACKEND_FACTORIES.get(candidate)
+        if factory is None:
+            raise ValueError(f"Unsupported JSON codec backend: {candidate}")
+        built = factory()
+        if built is not None:
+            return built
+    logger.warning(
+        "json codec backend unavailable, using stdlib",
+        extra={"extra_fields": {"backend": backend}},
+    )
+    return _stdlib_codec()
+
+
+codec = build_codec(settings.json_codec)
+
+
+class CodecJSONResponse(JSONResponse):
+    """JSON response rendered through the configured codec."""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
@@ -0,0 +1,231 @@
+import asyncio
+import gzip
+import time
+from typing import Any
+
+from prometheus_client import Counter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+GZIP = "gzip"
+ZSTD = "zstd"
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+STREAMING_MEDIA_TYPES = ("application/x-ndjson", "text/event-stream")
+
+COMPRESSION_INPUT_BYTES = Counter(
+    "lotus_report_compression_input_bytes_total",
+    "Bytes handed to the compressor by direction (upstream_request, response) and encoding.",
+    ["direction", "encoding"],
+)
+COMPRESSION_BYTES_SAVED = Counter(
+    "lotus_report_compression_bytes_saved_total",
+    "Bytes removed from bodies by compression, by direction and encoding.",
+    ["direction", "encoding"],
+)
+COMPRESSION_CPU_SECONDS = Counter(
+    "lotus_report_compression_cpu_seconds_total",
+    "Thread CPU time spent compressing bodies, by direction and encoding.",
+    ["direction", "encoding"],
+)
+
+
+def _load_zstd() -> Any:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+_zstd = _load_zstd()
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Content codings this process can produce and decode, most preferred first."""
+    return (ZSTD, GZIP) if _zstd is not None else (GZIP,)
+
+
+def accept_encoding_header() -> str:
+    return ", ".join(supported_encodings())
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Picks the supported coding with the highest q-value in an ``Accept-Encoding`` header.
+
+    Ties go to the server preference order of :func:`supported_encodings`; ``*`` covers any
+    supported coding the header does not name.
+    """
+    if not accept_encoding:
+        return None
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        name, _, raw_quality = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(raw_quality)
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    wildcard = qualities.get("*", 0.0)
+    best: str | None = None
+    best_quality = 0.0
+    for coding in supported_encodings():
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _compress_timed(data: bytes, encoding: str) -> tuple[bytes, float]:
+    started = time.thread_time()
+    if encoding == ZSTD and _zstd is not None:
+        compressed = _zstd.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    elif encoding == GZIP:
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+    return compressed, time.thread_time() - started
+
+
+async def compress_body(data: bytes, encoding: str, direction: str) -> bytes:
+    """Compresses ``data``; bodies of ``COMPRESSION_OFFLOAD_MIN_BYTES`` or more run in a thread."""
+    if len(data) >= settings.compression_offload_min_bytes:
+        compressed, cpu_seconds = await asyncio.to_thread(_compress_timed, data, encoding)
+    else:
+        compressed, cpu_seconds = _compress_timed(data, encoding)
+    COMPRESSION_INPUT_BYTES.labels(direction=direction, encoding=encoding).inc(len(data))
+    COMPRESSION_BYTES_SAVED.labels(direction=direction, encoding=encoding).inc(
+        max(0, len(data) - len(compressed))
+    )
+    COMPRESSION_CPU_SECONDS.labels(direction=direction, encoding=encoding).inc(cpu_seconds)
+    return compressed
+
+
+_unsupported_request_encoding: set[str] = set()
+
+
+def upstream_request_encoding(upstream: str) -> str | None:
+    """Coding for request bodies sent to ``upstream``, or None to send them uncompressed."""
+    enabled = {
+        name.strip() for name in settings.upstream_request_compression.split(",") if name.strip()
+    }
+    if upstream not in enabled or upstream in _unsupported_request_encoding:
+        return None
+    encoding = settings.upstream_request_compression_encoding.strip().lower()
+    return encoding if encoding in supported_encodings() else GZIP
+
+
+def mark_request_encoding_unsupported(upstream: str) -> None:
+    _unsupported_request_encoding.add(upstream)
+
+
+def reset_upstream_request_encodings() -> None:
+    _unsupported_request_encoding.clear()
+
+
+def _header(headers: list[tuple[bytes, bytes]], name: bytes) -> str | None:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _negotiable(headers: list[tuple[bytes, bytes]]) -> bool:
+    content_type = (_header(headers, b"content-type") or "").split(";")[0].strip()
+    return not _header(headers, b"content-encoding") and content_type not in STREAMING_MEDIA_TYPES
+
+
+def _vary_on_accept_encoding(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    vary = _header(headers, b"vary")
+    if vary and "accept-encoding" in vary.lower():
+        return headers
+    kept = [(key, value) for key, value in headers if key.lower() != b"vary"]
+    value = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+    return kept + [(b"vary", value.encode("latin-1"))]
+
+
+class ResponseCompressionMiddleware:
+    """Compresses buffered responses under ``path_prefixes`` with the negotiated coding.
+
+    Bodies smaller than ``minimum_size``, responses that already carry a ``Content-Encoding`` and
+    streaming media types (NDJSON, server-sent events) are passed through unchanged. Every
+    response that could have been compressed carries ``Vary: Accept-Encoding``, whether or not it
+    was, so shared caches key it on the request's ``Accept-Encoding``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefixes: tuple[str, ...] = ("/reports", "/aggregations"),
+        minimum_size: int = 1024,
+    ):
+        self.app = app
+        self._path_prefixes = path_prefixes
+        self._minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not str(scope["path"]).startswith(self._path_prefixes):
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(_header(list(scope.get("headers", [])), b"accept-encoding"))
+        if encoding is None:
+
+            async def _send_with_vary(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    if _negotiable(headers):
+                        message = {**message, "headers": _vary_on_accept_encoding(headers)}
+                await send(message)
+
+            await self.app(scope, receive, _send_with_vary)
+            return
+        responder = _CompressingResponder(send, encoding, self._minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    def __init__(self, send: Send, encoding: str, minimum_size: int):
+        self._send = send
+        self._encoding = encoding
+        self._minimum_size = minimum_size
+        self._start: Message | None = None
+        self._passthrough = False
+        self._parts: list[bytes] = []
+
+    async def send(self, message: Message) -> None:
+        if self._passthrough:
+            await self._send(message)
+            return
+        if message["type"] == "http.response.start":
+            if not _negotiable(list(message.get("headers", []))):
+                self._passthrough = True
+                await self._send(message)
+                return
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._start is None:
+            await self._send(message)
+            return
+        self._parts.append(message.get("body", b""))
+        if message.get("more_body", False):
+            return
+        await self._flush(self._start, b"".join(self._parts))
+
+    async def _flush(self, start: Message, body: bytes) -> None:
+        headers = _vary_on_accept_encoding(list(start.get("headers", [])))
+        if len(body) < self._minimum_size:
+            await self._send({**start, "headers": headers})
+            await self._send({"type": "http.response.body", "body": body})
+            return
+        compressed = await compress_body(body, self._encoding, direction="response")
+        headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+        headers += [
+            (b"content-encoding", self._encoding.encode("latin-1")),
+            (b"content-length", str(len(compressed)).encode("latin-1")),
+        ]
+        await self._send({**start, "headers": headers})
+        await self._send({"type": "http.response.body", "body": compressed})
@@ -4,12 +4,105 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     contract_version: str = Field("v1", alias="CONTRACT_VERSION")
+    json_codec: str = Field("auto", alias="JSON_CODEC")
     pas_base_url: str = Field("http://localhost:8201", alias="PAS_BASE_URL")
     pa_base_url: str = Field("http://localhost:8002", alias="PA_BASE_URL")
     risk_base_url: str = Field("http://localhost:8130", alias="RISK_BASE_URL")
     upstream_timeout_seconds: float = Field(10.0, alias="UPSTREAM_TIMEOUT_SECONDS")
+    request_deadline_seconds: float = Field(15.0, alias="REQUEST_DEADLINE_SECONDS")
+    review_request_deadline_seconds: float = Field(25.0, alias="REVIEW_REQUEST_DEADLINE_SECONDS")
+    review_section_budget_seconds: float = Field(20.0, alias="REVIEW_SECTION_BUDGET_SECONDS")
+    review_batch_request_deadline_seconds: float = Field(
+        120.0, alias="REVIEW_BATCH_REQUEST_DEADLINE_SECONDS"
+    )
+    review_batch_max_portfolios: int = Field(200, alias="REVIEW_BATCH_MAX_PORTFOLIOS")
+    review_batch_concurrency: int = Field(8, alias="REVIEW_BATCH_CONCURRENCY")
     upstream_max_retries: int = Field(2, alias="UPSTREAM_MAX_RETRIES")
     upstream_retry_backoff_seconds: float = Field(0.2, alias="UPSTREAM_RETRY_BACKOFF_SECONDS")
+    upstream_retry_backoff_max_seconds: float = Field(
+        5.0, alias="UPSTREAM_RETRY_BACKOFF_MAX_SECONDS"
+    )
+    upstream_retry_after_max_seconds: float = Field(5.0, alias="UPSTREAM_RETRY_AFTER_MAX_SECONDS")
+    retry_budget_enabled: bool = Field(True, alias="RETRY_BUDGET_ENABLED")
+    retry_budget_ratio: float = Field(0.2, alias="RETRY_BUDGET_RATIO")
+    retry_budget_max_tokens: float = Field(10.0, alias="RETRY_BUDGET_MAX_TOKENS")
+    upstream_stream_decode_enabled: bool = Field(True, alias="UPSTREAM_STREAM_DECODE_ENABLED")
+    upstream_request_compression: str = Field("", alias="UPSTREAM_REQUEST_COMPRESSION")
+    upstream_request_compression_encoding: str = Field(
+        "gzip", alias="UPSTREAM_REQUEST_COMPRESSION_ENCODING"
+    )
+    upstream_request_compression_min_bytes: int = Field(
+        16384, alias="UPSTREAM_REQUEST_COMPRESSION_MIN_BYTES"
+    )
+    upstream_columnar_series: str = Field("", alias="UPSTREAM_COLUMNAR_SERIES")
+    response_compression_enabled: bool = Field(True, alias="RESPONSE_COMPRESSION_ENABLED")
+    response_compression_min_bytes: int = Field(1024, alias="RESPONSE_COMPRESSION_MIN_BYTES")
+    compression_offload_min_bytes: int = Field(262144, alias="COMPRESSION_OFFLOAD_MIN_BYTES")
+    upstream_pool_max_connections: int = Field(100, alias="UPSTREAM_POOL_MAX_CONNECTIONS")
+    upstream_pool_max_keepalive_connections: int = Field(
+        20, alias="UPSTREAM_POOL_MAX_KEEPALIVE_CONNECTIONS"
+    )
+    upstream_pool_keepalive_expiry_seconds: float = Field(
+        30.0, alias="UPSTREAM_POOL_KEEPALIVE_EXPIRY_SECONDS"
+    )
+    performance_input_max_lookback_days: int = Field(
+        1200, alias="PERFORMANCE_INPUT_MAX_LOOKBACK_DAYS"
+    )
+    aggregation_core_timeout_seconds: float = Field(5.0, alias="AGGREGATION_CORE_TIMEOUT_SECONDS")
+    aggregation_performance_timeout_seconds: float = Field(
+        5.0, alias="AGGREGATION_PERFORMANCE_TIMEOUT_SECONDS"
+    )
+    core_snapshot_cache_ttl_seconds: float = Field(30.0, alias="CORE_SNAPSHOT_CACHE_TTL_SECONDS")
+    core_snapshot_cache_max_entries: int = Field(512, alias="CORE_SNAPSHOT_CACHE_MAX_ENTRIES")
+    return_index_cache_ttl_seconds: float = Field(300.0, alias="RETURN_INDEX_CACHE_TTL_SECONDS")
+    return_index_cache_max_entries: int = Field(1024, alias="RETURN_INDEX_CACHE_MAX_ENTRIES")
+    valuation_series_cache_max_entries: int = Field(
+        1024, alias="VALUATION_SERIES_CACHE_MAX_ENTRIES"
+    )
+    valuation_series_cache_max_bytes: int = Field(
+        67108864, alias="VALUATION_SERIES_CACHE_MAX_BYTES"
+    )
+    valuation_series_restatement_days: int = Field(7, alias="VALUATION_SERIES_RESTATEMENT_DAYS")
+    valuation_series_max_age_seconds: float = Field(
+        3600.0, alias="VALUATION_SERIES_MAX_AGE_SECONDS"
+    )
+    upstream_revalidation_cache_max_entries: int = Field(
+        512, alias="UPSTREAM_REVALIDATION_CACHE_MAX_ENTRIES"
+    )
+    upstream_revalidation_cache_max_bytes: int = Field(
+        134217728, alias="UPSTREAM_REVALIDATION_CACHE_MAX_BYTES"
+    )
+    circuit_breaker_enabled: bool = Field(True, alias="CIRCUIT_BREAKER_ENABLED")
+    circuit_breaker_window_size: int = Field(20, alias="CIRCUIT_BREAKER_WINDOW_SIZE")
+    circuit_breaker_minimum_calls: int = Field(10, alias="CIRCUIT_BREAKER_MINIMUM_CALLS")
+    circuit_breaker_failure_threshold: float = Field(0.5, alias="CIRCUIT_BREAKER_FAILURE_THRESHOLD")
+    circuit_breaker_open_seconds: float = Field(30.0, alias="CIRCUIT_BREAKER_OPEN_SECONDS")
+    circuit_breaker_half_open_max_calls: int = Field(3, alias="CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS")
+    concurrency_limit_enabled: bool = Field(True, alias="CONCURRENCY_LIMIT_ENABLED")
+    concurrency_limit_initial: int = Field(16, alias="CONCURRENCY_LIMIT_INITIAL")
+    concurrency_limit_min: int = Field(2, alias="CONCURRENCY_LIMIT_MIN")
+    concurrency_limit_max: int = Field(64, alias="CONCURRENCY_LIMIT_MAX")
+    concurrency_limit_max_queue: int = Field(64, alias="CONCURRENCY_LIMIT_MAX_QUEUE")
+    concurrency_limit_queue_timeout_seconds: float = Field(
+        1.0, alias="CONCURRENCY_LIMIT_QUEUE_TIMEOUT_SECONDS"
+    )
+    concurrency_limit_latency_tolerance: float = Field(
+        2.0, alias="CONCURRENCY_LIMIT_LATENCY_TOLERANCE"
+    )
+    concurrency_limit_backoff_ratio: float = Field(0.9, alias="CONCURRENCY_LIMIT_BACKOFF_RATIO")
+    micro_batching_enabled: bool = Field(False, alias="MICRO_BATCHING_ENABLED")
+    micro_batch_window_seconds: float = Field(0.005, alias="MICRO_BATCH_WINDOW_SECONDS")
+    micro_batch_max_size: int = Field(50, alias="MICRO_BATCH_MAX_SIZE")
+    micro_batch_max_parallel: int = Field(8, alias="MICRO_BATCH_MAX_PARALLEL")
+    pas_core_snapshot_batch_path: str = Field("", alias="PAS_CORE_SNAPSHOT_BATCH_PATH")
+    pa_twr_input_batch_path: str = Field("", alias="PA_TWR_INPUT_BATCH_PATH")
+    risk_calculate_batch_path: str = Field("", alias="RISK_CALCULATE_BATCH_PATH")
+    hedging_enabled: bool = Field(False, alias="HEDGING_ENABLED")
+    hedging_percentile: float = Field(0.95, alias="HEDGING_PERCENTILE")
+    hedging_window_size: int = Field(200, alias="HEDGING_WINDOW_SIZE")
+    hedging_min_samples: int = Field(20, alias="HEDGING_MIN_SAMPLES")
+    hedging_min_delay_seconds: float = Field(0.05, alias="HEDGING_MIN_DELAY_SECONDS")
+    hedging_budget_ratio: float = Field(0.1, alias="HEDGING_BUDGET_RATIO")
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -3,6 +3,10 @@ from typing import AsyncIterator
 
 from fastapi import FastAPI
 
+from app.clients.http_pool import close_upstream_clients, open_upstream_clients
+from app.codec import CodecJSONResponse
+from app.compression import ResponseCompressionMiddleware
+from app.config import settings
 from app.enterprise_readiness import (
     build_enterprise_audit_middleware,
     validate_enterprise_runtime_config,
@@ -17,8 +21,12 @@ from app.routers.reports import router as reports_router
 @asynccontextmanager
 async def _app_lifespan(application: FastAPI) -> AsyncIterator[None]:
     application.state.is_draining = False
-    yield
-    application.state.is_draining = True
+    open_upstream_clients(settings)
+    try:
+        yield
+    finally:
+        application.state.is_draining = True
+        await close_upstream_clients()
 
 
 app = FastAPI(
@@ -36,10 +44,15 @@ app = FastAPI(
         {"name": "Reports", "description": "Report-generation APIs and report metadata."},
     ],
     lifespan=_app_lifespan,
+    default_response_class=CodecJSONResponse,
 )
 setup_observability(app)
 validate_enterprise_runtime_config()
 app.middleware("http")(build_enterprise_audit_middleware())
+if settings.response_compression_enabled:
+    app.add_middleware(
+        ResponseCompressionMiddleware, minimum_size=settings.response_compression_min_bytes
+    )
 
 app.include_router(health_router)
 app.include_router(integration_router)
@@ -22,6 +22,7 @@ class PortfolioAggregationResponse(BaseModel):
     scope: AggregationScope
     generated_at: datetime = Field(..., alias="generatedAt")
     rows: list[AggregationRow]
+    degraded_sources: list[str] = Field(default_factory=list, alias="degradedSources")
 
     model_config = {"populate_by_name": True}
 
@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import time
@@ -10,9 +9,18 @@ from uuid import uuid4
 from fastapi import FastAPI, Request, Response
 from prometheus_fastapi_instrumentator import Instrumentator
 
+from app.codec import codec
+from app.config import settings
+
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+DEADLINE_EXCEEDED_DETAIL = "upstream call skipped: request deadline exceeded"
+
 correlation_id_var: ContextVar[str] = ContextVar("correlation_id", default="")
 request_id_var: ContextVar[str] = ContextVar("request_id", default="")
 trace_id_var: ContextVar[str] = ContextVar("trace_id", default="")
+deadline_var: ContextVar[float | None] = ContextVar("deadline", default=None)
+tenant_id_var: ContextVar[str] = ContextVar("tenant_id", default="default")
+role_var: ContextVar[str] = ContextVar("role", default="unknown")
 
 
 class JsonFormatter(logging.Formatter):
@@ -30,7 +38,7 @@ class JsonFormatter(logging.Formatter):
         }
         if hasattr(record, "extra_fields") and isinstance(record.extra_fields, dict):
             payload.update(record.extra_fields)
-        return json.dumps({k: v for k, v in payload.items() if v is not None})
+        return codec.dumps_str({k: v for k, v in payload.items() if v is not None})
 
 
 def setup_logging() -> None:
@@ -65,6 +73,36 @@ def resolve_trace_id(request: Request) -> str:
     return uuid4().hex
 
 
+def default_deadline_seconds(path: str) -> float | None:
+    if path == "/reports/portfolios/review:batch":
+        return settings.review_batch_request_deadline_seconds
+    if path.startswith("/reports/portfolios/") and path.endswith("/review"):
+        return settings.review_request_deadline_seconds
+    if path.startswith(("/reports", "/aggregations")):
+        return settings.request_deadline_seconds
+    return None
+
+
+def resolve_deadline(request: Request) -> float | None:
+    budget_seconds = default_deadline_seconds(request.url.path)
+    incoming = request.headers.get(DEADLINE_HEADER)
+    if isinstance(incoming, str) and incoming.strip().isdigit():
+        incoming_seconds = int(incoming) / 1000
+        budget_seconds = (
+            incoming_seconds if budget_seconds is None else min(budget_seconds, incoming_seconds)
+        )
+    if budget_seconds is None or budget_seconds <= 0:
+        return None
+    return time.monotonic() + budget_seconds
+
+
+def remaining_budget_seconds() -> float | None:
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
 def propagation_headers(correlation_id: str | None = None) -> dict[str, str]:
     resolved_trace = trace_id_var.get() or uuid4().hex
     resolved_correlation_id = (
@@ -93,10 +131,14 @@ def setup_observability(app: FastAPI) -> None:
         correlation_id = resolve_correlation_id(request)
         request_id = resolve_request_id(request)
         trace_id = resolve_trace_id(request)
+        deadline = resolve_deadline(request)
 
         corr_token = correlation_id_var.set(correlation_id)
         req_token = request_id_var.set(request_id)
         trace_token = trace_id_var.set(trace_id)
+        deadline_token = deadline_var.set(deadline)
+        tenant_token = tenant_id_var.set(request.headers.get("X-Tenant-Id", "default"))
+        role_token = role_var.set(request.headers.get("X-Role", "unknown"))
         try:
             response = await call_next(request)
         finally:
@@ -114,6 +156,9 @@ def setup_observability(app: FastAPI) -> None:
             correlation_id_var.reset(corr_token)
             request_id_var.reset(req_token)
             trace_id_var.reset(trace_token)
+            deadline_var.reset(deadline_token)
+            tenant_id_var.reset(tenant_token)
+            role_var.reset(role_token)
 
         response.headers["X-Correlation-Id"] = correlation_id
         response.headers["X-Request-Id"] = request_id
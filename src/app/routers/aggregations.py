@@ -14,8 +14,9 @@ router = APIRouter(prefix="/aggregations", tags=["Aggregations"])
     summary="Get portfolio aggregation",
     description=(
         "Returns reporting-ready aggregated rows for a portfolio by as-of date. "
-        "Current slice uses deterministic placeholder rows while "
-        "lotus-core/lotus-performance connectors are integrated."
+        "Live mode fetches lotus-core and lotus-performance concurrently; unavailable "
+        "sources are listed in degradedSources and their rows are omitted. "
+        "Non-live mode returns deterministic placeholder rows."
     ),
 )
 async def get_portfolio_aggregation(
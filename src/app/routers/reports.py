@@ -1,16 +1,122 @@
-from typing import Annotated, Any
+from typing import Annotated, Any, AsyncIterator, Callable
 
 from fastapi import APIRouter, Depends, Header, Path, Query
+from fastapi.responses import StreamingResponse
 
+from app.analytics.return_index import return_index_cache
+from app.codec import codec
 from app.models.contracts import ReportRequest, ReportResponse
 from app.services.report_service import ReportService
 from app.services.reporting_read_service import ReportingReadService
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+_NDJSON_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}},
+        "description": "With `Accept: application/x-ndjson`, one JSON object per line.",
+    }
+}
+_REVIEW_RESPONSES: dict[int | str, dict[str, Any]] = {
+    200: {
+        "content": {
+            NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}},
+            SSE_MEDIA_TYPE: {"schema": {"type": "string"}},
+        },
+        "description": (
+            "With `Accept: application/x-ndjson`, one JSON object per line. With "
+            "`Accept: text/event-stream`, a `review` event, one `section` event per section and "
+            "a final `complete` event."
+        ),
+    }
+}
+# Proxies such as nginx buffer streamed responses unless told not to.
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
 
 def get_reporting_read_service() -> ReportingReadService:
-    return ReportingReadService()
+    return ReportingReadService(return_index_cache=return_index_cache)
+
+
+def _streaming_media_type(accept: str | None, media_types: tuple[str, ...]) -> str | None:
+    """Picks the streaming media type with the highest q-value in an ``Accept`` header.
+
+    Streaming types count only when named, and are chosen only if their q-value is at least the
+    one plain JSON gets from ``application/json``, ``application/*`` or ``*/*``. Ties between
+    streaming types go to the order of ``media_types``; ``q=0`` refuses a type.
+    """
+    if not accept:
+        return None
+    qualities: dict[str, float] = {}
+    for media_range in accept.split(","):
+        media_type, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, raw_quality = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(raw_quality)
+                except ValueError:
+                    quality = 0.0
+        qualities[media_type.strip().lower()] = quality
+    json_quality = next(
+        (
+            qualities[json_range]
+            for json_range in ("application/json", "application/*", "*/*")
+            if json_range in qualities
+        ),
+        0.0,
+    )
+    best: str | None = None
+    best_quality = 0.0
+    for media_type in media_types:
+        quality = qualities.get(media_type, 0.0)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best if best_quality >= json_quality else None
+
+
+async def _streaming_response(
+    lines: AsyncIterator[dict[str, Any]],
+    media_type: str,
+    encode: Callable[[AsyncIterator[dict[str, Any]]], AsyncIterator[bytes]],
+    headers: dict[str, str] | None = None,
+) -> StreamingResponse:
+    # The first line is awaited here so request validation and core snapshot errors are still
+    # returned as regular error responses instead of a truncated stream.
+    first = await anext(lines)
+
+    async def _lines() -> AsyncIterator[dict[str, Any]]:
+        yield first
+        async for line in lines:
+            yield line
+
+    return StreamingResponse(encode(_lines()), media_type=media_type, headers=headers)
+
+
+async def _ndjson_lines(lines: AsyncIterator[dict[str, Any]]) -> AsyncIterator[bytes]:
+    async for line in lines:
+        yield codec.dumps(line) + b"\n"
+
+
+def _sse_event(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + codec.dumps(data) + b"\n\n"
+
+
+async def _review_events(fragments: AsyncIterator[dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Review fragments as SSE: ``review``, then one ``section`` per section, then ``complete``."""
+    section_status: dict[str, Any] = {}
+    async for fragment in fragments:
+        if "portfolio_id" in fragment:
+            yield _sse_event("review", fragment)
+        elif "sectionStatus" in fragment:
+            section_status = fragment["sectionStatus"]
+        else:
+            for section, data in fragment.items():
+                yield _sse_event("section", {"section": section, "data": data})
+    yield _sse_event("complete", {"sectionStatus": section_status})
 
 
 def _apply_section_limit(payload: dict[str, Any], section_limit: int) -> dict[str, Any]:
@@ -35,6 +141,41 @@ def generate_report(request: ReportRequest) -> ReportResponse:
     return ReportService().generate_report(request)
 
 
+@router.post(
+    "/portfolios/review:batch",
+    response_model=dict[str, Any],
+    responses=_NDJSON_RESPONSES,
+    summary="Get portfolio review reports for several portfolios",
+    description=(
+        "Runs the portfolio review for each of `portfolio_ids` with a shared as-of date, sections "
+        "and review options, with bounded concurrency. Each portfolio has its own result and "
+        "status, so one failing portfolio does not fail the batch. With "
+        "`Accept: application/x-ndjson` each result is streamed as its own line as soon as it "
+        "finishes, followed by a line with the batch status."
+    ),
+)
+async def get_portfolio_reviews(
+    request: dict[str, Any],
+    section_limit: Annotated[
+        int, Query(alias="sectionLimit", ge=1, le=20, description="pagination")
+    ] = 10,
+    service: ReportingReadService = Depends(get_reporting_read_service),
+    correlation_id: Annotated[str | None, Header(alias="X-Correlation-ID")] = None,
+    accept: Annotated[str | None, Header(alias="Accept")] = None,
+) -> dict[str, Any] | StreamingResponse:
+    request_payload = _apply_section_limit(request, section_limit)
+    if _streaming_media_type(accept, (NDJSON_MEDIA_TYPE,)):
+        return await _streaming_response(
+            service.stream_portfolio_reviews(request_payload, correlation_id),
+            NDJSON_MEDIA_TYPE,
+            _ndjson_lines,
+        )
+    return await service.get_portfolio_reviews(
+        request_payload=request_payload,
+        correlation_id=correlation_id,
+    )
+
+
 @router.post(
     "/portfolios/{portfolio_id}/summary",
     response_model=dict[str, Any],
@@ -63,10 +204,13 @@ async def get_portfolio_summary(
 @router.post(
     "/portfolios/{portfolio_id}/review",
     response_model=dict[str, Any],
+    responses=_REVIEW_RESPONSES,
     summary="Get portfolio review report (lotus-report-owned)",
     description=(
         "lotus-report-owned reporting endpoint for portfolio review report payload. "
-        "Phase-1 source is lotus-core upstream while ownership moves to lotus-report."
+        "Phase-1 source is lotus-core upstream while ownership moves to lotus-report. With "
+        "`Accept: application/x-ndjson` each section is streamed as its own line as soon as it "
+        "is ready, and with `Accept: text/event-stream` as its own server-sent event."
     ),
 )
 async def get_portfolio_review(
@@ -77,9 +221,25 @@ async def get_portfolio_review(
     ] = 10,
     service: ReportingReadService = Depends(get_reporting_read_service),
     correlation_id: Annotated[str | None, Header(alias="X-Correlation-ID")] = None,
-) -> dict[str, Any]:
+    accept: Annotated[str | None, Header(alias="Accept")] = None,
+) -> dict[str, Any] | StreamingResponse:
+    request_payload = _apply_section_limit(request, section_limit)
+    media_type = _streaming_media_type(accept, (SSE_MEDIA_TYPE, NDJSON_MEDIA_TYPE))
+    if media_type == SSE_MEDIA_TYPE:
+        return await _streaming_response(
+            service.stream_portfolio_review(portfolio_id, request_payload, correlation_id),
+            SSE_MEDIA_TYPE,
+            _review_events,
+            headers=_SSE_HEADERS,
+        )
+    if media_type == NDJSON_MEDIA_TYPE:
+        return await _streaming_response(
+            service.stream_portfolio_review(portfolio_id, request_payload, correlation_id),
+            NDJSON_MEDIA_TYPE,
+            _ndjson_lines,
+        )
     return await service.get_portfolio_review(
         portfolio_id=portfolio_id,
-        request_payload=_apply_section_limit(request, section_limit),
+        request_payload=request_payload,
         correlation_id=correlation_id,
     )
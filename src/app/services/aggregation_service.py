@@ -1,12 +1,18 @@
+import asyncio
+import logging
 from datetime import UTC, datetime
-from typing import Any
+from typing import Any, Awaitable
 
 from app.clients.pa_client import PaClient
 from app.clients.pas_client import PasClient
+from app.clients.revalidation_cache import upstream_revalidation_cache
+from app.clients.snapshot_cache import core_snapshot_cache
 from app.config import settings
 from app.models.contracts import AggregationRow, AggregationScope, PortfolioAggregationResponse
 from app.precision_policy import quantize_money, quantize_performance, quantize_quantity, to_decimal
 
+logger = logging.getLogger(__name__)
+
 
 class AggregationService:
     def __init__(self, pas_client: PasClient | None = None, pa_client: PaClient | None = None):
@@ -15,33 +21,62 @@ class AggregationService:
             timeout_seconds=settings.upstream_timeout_seconds,
             max_retries=settings.upstream_max_retries,
             retry_backoff_seconds=settings.upstream_retry_backoff_seconds,
+            snapshot_cache=core_snapshot_cache,
+            revalidation_cache=upstream_revalidation_cache,
         )
         self._pa_client = pa_client or PaClient(
             base_url=settings.pa_base_url,
             timeout_seconds=settings.upstream_timeout_seconds,
             max_retries=settings.upstream_max_retries,
             retry_backoff_seconds=settings.upstream_retry_backoff_seconds,
+            revalidation_cache=upstream_revalidation_cache,
         )
 
     async def _fetch_inputs(
         self, portfolio_id: str, as_of_date: str
-    ) -> tuple[dict[str, Any], dict[str, Any]]:
-        pas_status, pas_payload = await self._pas_client.get_core_snapshot(
-            portfolio_id=portfolio_id,
-            as_of_date=as_of_date,
-            include_sections=["OVERVIEW", "HOLDINGS"],
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        return await asyncio.gather(
+            self._fetch_source(
+                self._pas_client.get_core_snapshot(
+                    portfolio_id=portfolio_id,
+                    as_of_date=as_of_date,
+                    include_sections=["OVERVIEW", "HOLDINGS"],
+                ),
+                source="lotus-core",
+                timeout_seconds=settings.aggregation_core_timeout_seconds,
+            ),
+            self._fetch_source(
+                self._pa_client.get_pas_input_twr(
+                    portfolio_id=portfolio_id,
+                    as_of_date=as_of_date,
+                    periods=["YTD"],
+                ),
+                source="lotus-performance",
+                timeout_seconds=settings.aggregation_performance_timeout_seconds,
+            ),
         )
-        if pas_status >= 400:
-            pas_payload = {}
 
-        pa_status, pa_payload = await self._pa_client.get_pas_input_twr(
-            portfolio_id=portfolio_id,
-            as_of_date=as_of_date,
-            periods=["YTD"],
-        )
-        if pa_status >= 400:
-            pa_payload = {}
-        return pas_payload, pa_payload
+    async def _fetch_source(
+        self,
+        fetch: Awaitable[tuple[int, dict[str, Any]]],
+        source: str,
+        timeout_seconds: float,
+    ) -> dict[str, Any] | None:
+        try:
+            async with asyncio.timeout(timeout_seconds):
+                status_code, payload = await fetch
+        except TimeoutError:
+            return None
+        except Exception:
+            # A failing source degrades the aggregation instead of failing it.
+            logger.exception(
+                "aggregation source failed",
+                extra={"extra_fields": {"source": source}},
+            )
+            return None
+        if status_code >= 400:
+            return None
+        return payload
 
     def _parse_market_value(self, position: dict[str, Any]) -> float | None:
         valuation = position.get("valuation")
@@ -64,6 +99,20 @@ class AggregationService:
                 continue
         return None
 
+    def _core_total_market_value(self, pas_payload: dict[str, Any]) -> Any:
+        return pas_payload.get("snapshot", {}).get("overview", {}).get("total_market_value")
+
+    def _core_position_count(self, pas_payload: dict[str, Any]) -> int:
+        position_count = 0
+        holdings = pas_payload.get("snapshot", {}).get("holdings", {})
+        if isinstance(holdings, dict):
+            by_asset_class = holdings.get("holdingsByAssetClass", {})
+            if isinstance(by_asset_class, dict):
+                for items in by_asset_class.values():
+                    if isinstance(items, list):
+                        position_count += len(items)
+        return position_count
+
     def _build_asset_class_rows(
         self, pas_payload: dict[str, Any], total_mv: float
     ) -> list[AggregationRow]:
@@ -132,50 +181,56 @@ class AggregationService:
         scope = AggregationScope(portfolioId=portfolio_id, asOfDate=as_of_date)
         pas_payload, pa_payload = await self._fetch_inputs(portfolio_id, as_of_date)
 
-        total_mv = pas_payload.get("snapshot", {}).get("overview", {}).get("total_market_value")
-        if total_mv is None:
-            total_mv = 1_250_000.0
+        degraded_sources: list[str] = []
+        if pas_payload is None:
+            degraded_sources.append("lotus-core")
+        if pa_payload is None:
+            degraded_sources.append("lotus-performance")
 
-        ytd_return = (
-            pa_payload.get("resultsByPeriod", {}).get("YTD", {}).get("net_cumulative_return")
-        )
-        if ytd_return is None:
-            ytd_return = 0.0
+        rows: list[AggregationRow] = []
+        total_mv = None
+        if pas_payload is not None:
+            total_mv = self._core_total_market_value(pas_payload)
+            if total_mv is not None:
+                rows.append(
+                    AggregationRow(
+                        bucket="TOTAL",
+                        metric="market_value_base",
+                        value=float(quantize_money(total_mv)),
+                    )
+                )
+            position_count = self._core_position_count(pas_payload)
+            rows.append(
+                AggregationRow(
+                    bucket="TOTAL",
+                    metric="position_count",
+                    value=float(quantize_quantity(position_count)),
+                )
+            )
 
-        position_count = 0
-        holdings = pas_payload.get("snapshot", {}).get("holdings", {})
-        if isinstance(holdings, dict):
-            by_asset_class = holdings.get("holdingsByAssetClass", {})
-            if isinstance(by_asset_class, dict):
-                for items in by_asset_class.values():
-                    if isinstance(items, list):
-                        position_count += len(items)
+        if pa_payload is not None:
+            ytd_return = (
+                pa_payload.get("resultsByPeriod", {}).get("YTD", {}).get("net_cumulative_return")
+            )
+            if ytd_return is not None:
+                rows.append(
+                    AggregationRow(
+                        bucket="TOTAL",
+                        metric="return_ytd_pct",
+                        value=float(quantize_performance(ytd_return)),
+                    )
+                )
 
-        rows = [
-            AggregationRow(
-                bucket="TOTAL",
-                metric="market_value_base",
-                value=float(quantize_money(total_mv)),
-            ),
-            AggregationRow(
-                bucket="TOTAL",
-                metric="position_count",
-                value=float(quantize_quantity(position_count)),
-            ),
-            AggregationRow(
-                bucket="TOTAL",
-                metric="return_ytd_pct",
-                value=float(quantize_performance(ytd_return)),
-            ),
-        ]
-        rows.extend(
-            self._build_asset_class_rows(
-                pas_payload=pas_payload,
-                total_mv=float(quantize_money(total_mv)),
+        if pas_payload is not None and total_mv is not None:
+            rows.extend(
+                self._build_asset_class_rows(
+                    pas_payload=pas_payload,
+                    total_mv=float(quantize_money(total_mv)),
+                )
             )
-        )
         return PortfolioAggregationResponse(
             scope=scope,
             generatedAt=datetime.now(UTC),
             rows=rows,
+            degradedSources=degraded_sources,
         )
@@ -0,0 +1,54 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, Mapping
+
+from app.analytics.periods import period_start
+
+
+@dataclass(frozen=True)
+class LookbackPlan:
+    """Smallest performance-input window that still covers every requested period.
+
+    ``start_date`` is the first day any period needs and ``lookback_days`` the calendar days from
+    it to the as-of date, inclusive. Since-inception periods take the whole allowed lookback
+    because the inception date is only known once performance input has been read; returns are
+    then calculated from the later of ``start_date`` and the portfolio's performance start date.
+
+    ``clamped`` is set when some period may start before ``start_date`` because the window was
+    capped at the allowed lookback: a fixed period reaching further back, or a since-inception
+    period. Those periods must not be served from this window unless the portfolio turns out to
+    be younger than it.
+    """
+
+    start_date: str
+    lookback_days: int
+    clamped: bool = False
+
+
+def plan_lookback(
+    as_of_date: str,
+    periods: Iterable[Mapping[str, str]],
+    max_lookback_days: int,
+) -> LookbackPlan:
+    as_of = date.fromisoformat(as_of_date)
+    earliest = as_of - timedelta(days=max(1, max_lookback_days) - 1)
+    start = as_of
+    clamped = False
+    for period in periods:
+        explicit_start = period.get("start_date")
+        if explicit_start:
+            begin = date.fromisoformat(explicit_start)
+        elif period["type"] == "SI":
+            begin = earliest
+            clamped = True
+        else:
+            begin = date.fromisoformat(period_start(period["type"], as_of_date))
+        start = min(start, begin)
+    if start < earliest:
+        start = earliest
+        clamped = True
+    return LookbackPlan(
+        start_date=start.isoformat(),
+        lookback_days=(as_of - start).days + 1,
+        clamped=clamped,
+    )
@@ -1,9 +1,76 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from typing import Any, AsyncIterator, Awaitable, Mapping, Sequence, TypeVar
+
+import httpx
 from fastapi import HTTPException, status
 
+from app.analytics.periods import NAMED_PERIODS
+from app.analytics.return_index import ReturnIndex, ReturnIndexCache
+from app.analytics.return_series import ReturnSeries
+from app.analytics.risk import RISK_METRICS, RISK_PERIODS, window_start
 from app.clients.pa_client import PaClient
 from app.clients.pas_client import PasClient
+from app.clients.revalidation_cache import upstream_revalidation_cache
 from app.clients.risk_client import RiskClient
+from app.clients.snapshot_cache import core_snapshot_cache
+from app.clients.valuation_cache import valuation_series_cache
 from app.config import settings
+from app.observability import remaining_budget_seconds
+from app.precision_policy import quantize_performance
+from app.services.lookback_planner import LookbackPlan, plan_lookback
+from app.services.section_planner import SectionFetch, SectionPlanner
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+SECTION_COMPLETE = "COMPLETE"
+SECTION_UNAVAILABLE = "UNAVAILABLE"
+SECTION_PARTIAL = "PARTIAL"
+SECTION_DEADLINE_EXCEEDED = "DEADLINE_EXCEEDED"
+DEFAULT_RETURN_PERIODS = ("MTD", "QTD", "YTD", "THREE_YEAR", "SI")
+DEFAULT_REVIEW_SECTIONS = (
+    "OVERVIEW",
+    "ALLOCATION",
+    "PERFORMANCE",
+    "RISK_ANALYTICS",
+    "INCOME_AND_ACTIVITY",
+    "HOLDINGS",
+    "TRANSACTIONS",
+)
+# Review sections read from the core snapshot and their response keys.
+_SNAPSHOT_REVIEW_SECTIONS = (
+    ("OVERVIEW", "overview"),
+    ("ALLOCATION", "allocation"),
+    ("INCOME_AND_ACTIVITY", "incomeAndActivity"),
+    ("HOLDINGS", "holdings"),
+    ("TRANSACTIONS", "transactions"),
+)
+BATCH_ITEM_COMPLETE = "COMPLETE"
+BATCH_ITEM_FAILED = "FAILED"
+
+# Optional review sections and the planner fetches that feed them.
+_OPTIONAL_REVIEW_SECTIONS = {
+    "PERFORMANCE": ("performance", ("performance",)),
+    "RISK_ANALYTICS": (
+        "risk_analytics",
+        ("performance_input", "daily_returns", "risk_analytics"),
+    ),
+    "PERIOD_RETURNS": (
+        "period_returns",
+        ("performance_input", "daily_returns", "period_returns"),
+    ),
+}
+_OPTIONAL_REVIEW_KEYS = {
+    "performance": "performance",
+    "risk_analytics": "riskAnalytics",
+    "period_returns": "periodReturns",
+}
 
 
 class ReportingReadService:
@@ -12,18 +79,23 @@ class ReportingReadService:
         pas_client: PasClient | None = None,
         pa_client: PaClient | None = None,
         risk_client: RiskClient | None = None,
+        return_index_cache: ReturnIndexCache | None = None,
     ):
         self._pas_client = pas_client or PasClient(
             base_url=settings.pas_base_url,
             timeout_seconds=settings.upstream_timeout_seconds,
             max_retries=settings.upstream_max_retries,
             retry_backoff_seconds=settings.upstream_retry_backoff_seconds,
+            snapshot_cache=core_snapshot_cache,
+            revalidation_cache=upstream_revalidation_cache,
+            valuation_cache=valuation_series_cache,
         )
         self._pa_client = pa_client or PaClient(
             base_url=settings.pa_base_url,
             timeout_seconds=settings.upstream_timeout_seconds,
             max_retries=settings.upstream_max_retries,
             retry_backoff_seconds=settings.upstream_retry_backoff_seconds,
+            revalidation_cache=upstream_revalidation_cache,
         )
         self._risk_client = risk_client or RiskClient(
             base_url=settings.risk_base_url,
@@ -31,6 +103,7 @@ class ReportingReadService:
             max_retries=settings.upstream_max_retries,
             retry_backoff_seconds=settings.upstream_retry_backoff_seconds,
         )
+        self._return_index_cache = return_index_cache
 
     async def get_portfolio_summary(
         self,
@@ -85,73 +158,412 @@ class ReportingReadService:
         request_payload: dict[str, object],
         correlation_id: str | None,
     ) -> dict[str, object]:
+        response: dict[str, object] = {}
+        async for fragment in self.stream_portfolio_review(
+            portfolio_id, request_payload, correlation_id
+        ):
+            response.update(fragment)
+        return response
+
+    async def stream_portfolio_review(
+        self,
+        portfolio_id: str,
+        request_payload: dict[str, object],
+        correlation_id: str | None,
+    ) -> AsyncIterator[dict[str, object]]:
+        """The portfolio review as fragments, each yielded as soon as its data is ready.
+
+        Nothing is yielded until the core snapshot has been read, so a failed snapshot still
+        raises before any output. Then come the portfolio id and as-of date, one fragment per core
+        snapshot section, one per optional section as its fetch finishes and ``sectionStatus``
+        last. Merging the fragments in order gives the :meth:`get_portfolio_review` response.
+        """
         as_of_date = self._required_string(request_payload, "as_of_date", "asOfDate")
         requested_sections = self._requested_sections(
             request_payload=request_payload,
-            default_sections=[
-                "OVERVIEW",
-                "ALLOCATION",
-                "PERFORMANCE",
-                "RISK_ANALYTICS",
-                "INCOME_AND_ACTIVITY",
-                "HOLDINGS",
-                "TRANSACTIONS",
-            ],
+            default_sections=list(DEFAULT_REVIEW_SECTIONS),
         )
 
-        status_code, payload = await self._pas_client.get_core_snapshot(
+        risk_periods = (
+            self._risk_periods(request_payload) if "RISK_ANALYTICS" in requested_sections else []
+        )
+        return_periods = (
+            self._return_periods(request_payload) if "PERIOD_RETURNS" in requested_sections else []
+        )
+        lookback = plan_lookback(
+            as_of_date,
+            [{"type": period} for period in risk_periods] + return_periods,
+            settings.performance_input_max_lookback_days,
+        )
+
+        timed_out: set[str] = set()
+        planner = self._review_planner(
             portfolio_id=portfolio_id,
             as_of_date=as_of_date,
-            include_sections=[
-                "OVERVIEW",
-                "ALLOCATION",
-                "INCOME_AND_ACTIVITY",
-                "HOLDINGS",
-                "TRANSACTIONS",
-            ],
+            section_deadline=self._section_deadline(),
+            timed_out=timed_out,
+            lookback=lookback,
+            risk_periods=risk_periods,
+            return_periods=return_periods,
         )
-        snapshot = self._unwrap_pas_snapshot(status_code=status_code, payload=payload)
-        response: dict[str, object] = {"portfolio_id": portfolio_id, "as_of_date": as_of_date}
+        targets = ["core_snapshot"]
+        for section, (target, _) in _OPTIONAL_REVIEW_SECTIONS.items():
+            if section in requested_sections:
+                targets.append(target)
 
-        if "OVERVIEW" in requested_sections:
-            response["overview"] = snapshot.get("overview")
-        if "ALLOCATION" in requested_sections:
-            response["allocation"] = snapshot.get("allocation")
-        if "INCOME_AND_ACTIVITY" in requested_sections:
-            response["incomeAndActivity"] = snapshot.get("incomeAndActivity")
-        if "HOLDINGS" in requested_sections:
-            response["holdings"] = snapshot.get("holdings")
-        if "TRANSACTIONS" in requested_sections:
-            response["transactions"] = snapshot.get("transactions")
-
-        if "PERFORMANCE" in requested_sections:
-            pa_status, pa_payload = await self._pa_client.get_pas_input_twr(
-                portfolio_id=portfolio_id,
-                as_of_date=as_of_date,
-                periods=["MTD", "QTD", "YTD", "THREE_YEAR", "SI"],
-            )
-            if pa_status < status.HTTP_400_BAD_REQUEST:
-                response["performance"] = self._map_pa_performance(pa_payload)
+        results: dict[str, object] = {}
+        async for target, result in planner.as_completed(targets):
+            results[target] = result
+            if target == "core_snapshot":
+                yield {"portfolio_id": portfolio_id, "as_of_date": as_of_date}
+                snapshot = self._as_dict(result)
+                for section, key in _SNAPSHOT_REVIEW_SECTIONS:
+                    if section in requested_sections:
+                        yield {key: snapshot.get(key)}
+                # Optional sections that finished before the snapshot.
+                for finished, finished_result in list(results.items()):
+                    if finished != "core_snapshot":
+                        yield {_OPTIONAL_REVIEW_KEYS[finished]: finished_result}
+            elif "core_snapshot" in results:
+                yield {_OPTIONAL_REVIEW_KEYS[target]: result}
+
+        section_status: dict[str, str] = {}
+        requested_periods: dict[str, Sequence[object]] = {
+            "RISK_ANALYTICS": risk_periods,
+            "PERIOD_RETURNS": return_periods,
+        }
+        for section, (target, fetches) in _OPTIONAL_REVIEW_SECTIONS.items():
+            if section not in requested_sections:
+                continue
+            if results[target] is not None:
+                # Periods left out because the lookback cap cut their window short.
+                partial = lookback.clamped and self._missing_periods(
+                    results[target], requested_periods.get(section, [])
+                )
+                section_status[section] = SECTION_PARTIAL if partial else SECTION_COMPLETE
+            elif timed_out.intersection(fetches):
+                section_status[section] = SECTION_DEADLINE_EXCEEDED
+            else:
+                section_status[section] = SECTION_UNAVAILABLE
+        if section_status:
+            yield {"sectionStatus": section_status}
+
+    async def get_portfolio_reviews(
+        self,
+        request_payload: dict[str, object],
+        correlation_id: str | None,
+    ) -> dict[str, object]:
+        """Reviews of several portfolios for one as-of date and set of sections.
+
+        Portfolios run concurrently, at most ``REVIEW_BATCH_CONCURRENCY`` at a time, through the
+        same clients, so identical upstream reads are shared through single-flight and the
+        snapshot, valuation series and return index caches. A portfolio whose review fails is
+        reported in its own result and does not fail the batch.
+        """
+        response: dict[str, object] = {}
+        results: list[dict[str, object]] = []
+        async for item in self.stream_portfolio_reviews(request_payload, correlation_id):
+            if "batchStatus" in item:
+                response.update(item)
             else:
-                response["performance"] = None
+                results.append(item)
+        order = {
+            portfolio_id: position
+            for position, portfolio_id in enumerate(self._batch_portfolio_ids(request_payload))
+        }
+        results.sort(key=lambda item: order[str(item["portfolio_id"])])
+        return {
+            "as_of_date": response["as_of_date"],
+            "results": results,
+            "batchStatus": response["batchStatus"],
+        }
 
+    async def stream_portfolio_reviews(
+        self,
+        request_payload: dict[str, object],
+        correlation_id: str | None,
+    ) -> AsyncIterator[dict[str, object]]:
+        """Batch review results in completion order, then the batch status.
+
+        At most ``REVIEW_BATCH_CONCURRENCY`` reviews are in flight, and the next one starts only
+        once a finished result has been taken, so a slow reader holds the batch back instead of
+        results piling up in memory. Stopping early cancels the reviews in flight.
+        """
+        portfolio_ids = self._batch_portfolio_ids(request_payload)
+        review_payload = {
+            key: value
+            for key, value in request_payload.items()
+            if key not in ("portfolio_ids", "portfolioIds")
+        }
+        as_of_date = self._required_string(review_payload, "as_of_date", "asOfDate")
+        requested_sections = self._requested_sections(
+            request_payload=review_payload,
+            default_sections=list(DEFAULT_REVIEW_SECTIONS),
+        )
+        # Shared options are validated once so an invalid request fails as a whole.
         if "RISK_ANALYTICS" in requested_sections:
-            response["riskAnalytics"] = await self._build_risk_analytics(
+            self._risk_periods(review_payload)
+        if "PERIOD_RETURNS" in requested_sections:
+            self._return_periods(review_payload)
+
+        concurrency = max(1, settings.review_batch_concurrency)
+        queued = iter(portfolio_ids)
+        in_flight: set[asyncio.Task[dict[str, object]]] = set()
+        complete = 0
+        try:
+            while True:
+                for portfolio_id in islice(queued, concurrency - len(in_flight)):
+                    in_flight.add(
+                        asyncio.create_task(
+                            self._batch_item(portfolio_id, review_payload, correlation_id)
+                        )
+                    )
+                if not in_flight:
+                    break
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = task.result()
+                    complete += item["status"] == BATCH_ITEM_COMPLETE
+                    yield item
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+        yield {
+            "as_of_date": as_of_date,
+            "batchStatus": {
+                "requested": len(portfolio_ids),
+                "complete": complete,
+                "failed": len(portfolio_ids) - complete,
+            },
+        }
+
+    async def _batch_item(
+        self,
+        portfolio_id: str,
+        review_payload: dict[str, object],
+        correlation_id: str | None,
+    ) -> dict[str, object]:
+        try:
+            review = await self.get_portfolio_review(portfolio_id, review_payload, correlation_id)
+        except HTTPException as exc:
+            return {
+                "portfolio_id": portfolio_id,
+                "status": BATCH_ITEM_FAILED,
+                "error": {"statusCode": exc.status_code, "detail": exc.detail},
+            }
+        except Exception as exc:
+            # Any other failure stays with its portfolio instead of ending the whole batch.
+            logger.exception(
+                "portfolio review failed in batch",
+                extra={"extra_fields": {"portfolio_id": portfolio_id}},
+            )
+            if isinstance(exc, httpx.HTTPError):
+                status_code = status.HTTP_502_BAD_GATEWAY
+                detail = f"upstream request failed: {type(exc).__name__}"
+            else:
+                status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+                detail = "portfolio review failed"
+            return {
+                "portfolio_id": portfolio_id,
+                "status": BATCH_ITEM_FAILED,
+                "error": {"statusCode": status_code, "detail": detail},
+            }
+        return {"portfolio_id": portfolio_id, "status": BATCH_ITEM_COMPLETE, "review": review}
+
+    @staticmethod
+    def _batch_portfolio_ids(request_payload: dict[str, object]) -> list[str]:
+        raw_ids = request_payload.get("portfolio_ids", request_payload.get("portfolioIds"))
+        max_portfolios = settings.review_batch_max_portfolios
+        if (
+            not isinstance(raw_ids, list)
+            or not raw_ids
+            or not all(isinstance(item, str) and item for item in raw_ids)
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="portfolio_ids must be a non-empty list of portfolio identifiers",
+            )
+        portfolio_ids = list(dict.fromkeys(raw_ids))
+        if len(portfolio_ids) > max_portfolios:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"portfolio_ids supports at most {max_portfolios} portfolios per batch",
+            )
+        return portfolio_ids
+
+    def _section_deadline(self) -> float:
+        budget = settings.review_section_budget_seconds
+        remaining = remaining_budget_seconds()
+        if remaining is not None:
+            budget = min(budget, remaining)
+        return time.monotonic() + budget
+
+    @staticmethod
+    async def _within_section_budget(
+        name: str,
+        section_deadline: float,
+        timed_out: set[str],
+        fetch: Awaitable[T | None],
+    ) -> T | None:
+        try:
+            async with asyncio.timeout(max(0.0, section_deadline - time.monotonic())):
+                result = await fetch
+        except TimeoutError:
+            timed_out.add(name)
+            return None
+        if result is None and time.monotonic() >= section_deadline:
+            timed_out.add(name)
+        return result
+
+    def _review_planner(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        section_deadline: float,
+        timed_out: set[str],
+        lookback: LookbackPlan,
+        risk_periods: list[str],
+        return_periods: list[dict[str, str]],
+    ) -> SectionPlanner:
+        def _bounded(name: str, fetch: Awaitable[T | None]) -> Awaitable[T | None]:
+            return self._within_section_budget(name, section_deadline, timed_out, fetch)
+
+        async def _core_snapshot(_: Mapping[str, Any]) -> dict[str, object]:
+            status_code, payload = await self._pas_client.get_core_snapshot(
                 portfolio_id=portfolio_id,
                 as_of_date=as_of_date,
+                include_sections=[
+                    "OVERVIEW",
+                    "ALLOCATION",
+                    "INCOME_AND_ACTIVITY",
+                    "HOLDINGS",
+                    "TRANSACTIONS",
+                ],
             )
+            return self._unwrap_pas_snapshot(status_code=status_code, payload=payload)
 
-        return response
+        async def _performance(_: Mapping[str, Any]) -> dict[str, object] | None:
+            return await _bounded(
+                "performance",
+                self._fetch_performance(portfolio_id=portfolio_id, as_of_date=as_of_date),
+            )
+
+        async def _performance_input(_: Mapping[str, Any]) -> dict[str, object] | None:
+            return await _bounded(
+                "performance_input",
+                self._fetch_performance_input(
+                    portfolio_id=portfolio_id,
+                    as_of_date=as_of_date,
+                    lookback_days=lookback.lookback_days,
+                ),
+            )
+
+        async def _daily_returns(inputs: Mapping[str, Any]) -> ReturnSeries | None:
+            perf_payload = inputs["performance_input"]
+            if perf_payload is None:
+                return None
+            return await _bounded(
+                "daily_returns",
+                self._fetch_daily_returns(
+                    portfolio_id=portfolio_id,
+                    as_of_date=as_of_date,
+                    perf_payload=perf_payload,
+                    start_date=lookback.start_date,
+                ),
+            )
+
+        async def _risk_analytics(inputs: Mapping[str, Any]) -> dict[str, object] | None:
+            perf_payload = inputs["performance_input"]
+            returns = inputs["daily_returns"]
+            if perf_payload is None or not returns:
+                return None
+            periods = self._covered_risk_periods(risk_periods, as_of_date, perf_payload, lookback)
+            if not periods:
+                return None
+            return await _bounded(
+                "risk_analytics",
+                self._fetch_risk_analytics(
+                    as_of_date=as_of_date,
+                    perf_payload=perf_payload,
+                    returns=returns,
+                    periods=periods,
+                ),
+            )
+
+        async def _period_returns(inputs: Mapping[str, Any]) -> list[dict[str, object]] | None:
+            perf_payload = inputs["performance_input"]
+            returns = inputs["daily_returns"]
+            if perf_payload is None or not returns:
+                return None
+            index = self._return_index(portfolio_id, as_of_date, returns, lookback.start_date)
+            inception_date = str(perf_payload.get("performanceStartDate"))
+            return self._period_returns(index, as_of_date, return_periods, inception_date)
+
+        return SectionPlanner(
+            [
+                SectionFetch("core_snapshot", _core_snapshot),
+                SectionFetch("performance", _performance),
+                SectionFetch("performance_input", _performance_input),
+                SectionFetch("daily_returns", _daily_returns, ("performance_input",)),
+                SectionFetch(
+                    "risk_analytics", _risk_analytics, ("performance_input", "daily_returns")
+                ),
+                SectionFetch(
+                    "period_returns", _period_returns, ("performance_input", "daily_returns")
+                ),
+            ]
+        )
+
+    @staticmethod
+    def _covered_risk_periods(
+        periods: list[str],
+        as_of_date: str,
+        perf_payload: Mapping[str, Any],
+        lookback: LookbackPlan,
+    ) -> list[str]:
+        """Risk periods whose window, from the portfolio's open date, lies inside the lookback."""
+        if not lookback.clamped:
+            return periods
+        open_date = perf_payload.get("performanceStartDate")
+        inception_date = open_date if isinstance(open_date, str) else None
+        return [
+            period
+            for period in periods
+            if window_start(period, as_of_date, inception_date) >= lookback.start_date
+        ]
+
+    @staticmethod
+    def _missing_periods(result: object, requested: Sequence[object]) -> bool:
+        if isinstance(result, dict):
+            return len(ReportingReadService._as_dict(result.get("results"))) < len(requested)
+        return isinstance(result, list) and len(result) < len(requested)
+
+    async def _fetch_performance(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+    ) -> dict[str, object] | None:
+        pa_status, pa_payload = await self._pa_client.get_pas_input_twr(
+            portfolio_id=portfolio_id,
+            as_of_date=as_of_date,
+            periods=["MTD", "QTD", "YTD", "THREE_YEAR", "SI"],
+        )
+        if pa_status >= status.HTTP_400_BAD_REQUEST:
+            return None
+        return self._map_pa_performance(pa_payload)
 
-    async def _build_risk_analytics(
+    async def _fetch_performance_input(
         self,
         portfolio_id: str,
         as_of_date: str,
+        lookback_days: int | None = None,
     ) -> dict[str, object] | None:
         perf_status, perf_payload = await self._pas_client.get_performance_input(
             portfolio_id=portfolio_id,
             as_of_date=as_of_date,
-            lookback_days=1200,
+            lookback_days=lookback_days or settings.performance_input_max_lookback_days,
         )
         if perf_status >= status.HTTP_400_BAD_REQUEST:
             return None
@@ -162,31 +574,64 @@ class ReportingReadService:
             return None
         if not isinstance(performance_start_date, str):
             return None
+        return perf_payload
+
+    async def _fetch_daily_returns(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        perf_payload: dict[str, object],
+        start_date: str | None = None,
+    ) -> ReturnSeries | None:
+        if self._return_index_cache is not None:
+            cached = self._return_index_cache.get(portfolio_id, as_of_date, start_date)
+            if cached is not None:
+                return cached[0]
+        returns = await self._calculate_daily_returns(
+            portfolio_id, as_of_date, perf_payload, start_date
+        )
+        if returns:
+            self._return_index(portfolio_id, as_of_date, returns, start_date)
+        return returns
 
+    async def _calculate_daily_returns(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        perf_payload: dict[str, object],
+        start_date: str | None = None,
+    ) -> ReturnSeries | None:
+        performance_start_date = str(perf_payload.get("performanceStartDate"))
+        report_start_date = max(start_date or "", performance_start_date[:10])
+        valuation_points = perf_payload.get("valuationPoints")
         twr_payload = {
             "portfolio_id": portfolio_id,
             "performance_start_date": performance_start_date,
             "metric_basis": "NET",
-            "report_start_date": performance_start_date,
+            "report_start_date": report_start_date,
             "report_end_date": as_of_date,
             "analyses": [{"period": "EXPLICIT", "frequencies": ["daily"]}],
-            "valuation_points": valuation_points,
+            "valuation_points": self._points_from(valuation_points, report_start_date),
             "currency": perf_payload.get("baseCurrency", "USD"),
-            "output": {"include_cumulative": True, "include_timeseries": True},
+            "output": {"include_cumulative": False, "include_timeseries": True},
         }
         twr_status, twr_response = await self._pa_client.calculate_twr(twr_payload)
         if twr_status >= status.HTTP_400_BAD_REQUEST:
             return None
+        return self._extract_daily_returns_from_twr(twr_response)
 
-        returns = self._extract_daily_returns_from_twr(twr_response)
-        if not returns:
-            return None
-
+    async def _fetch_risk_analytics(
+        self,
+        as_of_date: str,
+        perf_payload: dict[str, object],
+        returns: ReturnSeries,
+        periods: list[str] | tuple[str, ...] = RISK_PERIODS,
+    ) -> dict[str, object] | None:
         risk_payload = {
             "scope": {"asOfDate": as_of_date, "netOrGross": "NET"},
-            "periods": [{"type": "YTD"}, {"type": "THREE_YEAR"}],
-            "metrics": ["VOLATILITY", "SHARPE", "DRAWDOWN", "VAR"],
-            "portfolioOpenDate": performance_start_date,
+            "periods": [{"type": period} for period in periods],
+            "metrics": list(RISK_METRICS),
+            "portfolioOpenDate": perf_payload.get("performanceStartDate"),
             "returns": returns,
             "benchmarkReturns": [],
         }
@@ -197,31 +642,79 @@ class ReportingReadService:
         results = self._as_dict(risk_response.get("results"))
         return {"results": results}
 
+    @staticmethod
+    def _points_from(valuation_points: object, start_date: str) -> object:
+        if not isinstance(valuation_points, list):
+            return valuation_points
+        return [
+            point
+            for point in valuation_points
+            if not isinstance(point, dict) or str(point.get("perf_date", ""))[:10] >= start_date
+        ]
+
+    def _return_index(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        returns: ReturnSeries,
+        start_date: str | None = None,
+    ) -> ReturnIndex:
+        cache = self._return_index_cache
+        if cache is not None:
+            cached = cache.get(portfolio_id, as_of_date, start_date)
+            if cached is not None and cached[0] is returns:
+                return cached[1]
+        index = ReturnIndex.from_returns(returns.decimals(), covers_from=start_date)
+        if cache is not None:
+            cache.store(portfolio_id, as_of_date, returns, index, start_date)
+        return index
+
+    def _period_returns(
+        self,
+        index: ReturnIndex,
+        as_of_date: str,
+        return_periods: list[dict[str, str]],
+        inception_date: str | None = None,
+    ) -> list[dict[str, object]]:
+        rows: list[dict[str, object]] = []
+        for period in return_periods:
+            period_type = period["type"]
+            end_date = period.get("end_date", as_of_date)
+            linked = index.period_returns(
+                period_type, end_date, period.get("start_date"), inception_date
+            )
+            if linked is None:
+                continue
+            start_date, cumulative, annualized = linked
+            rows.append(
+                {
+                    "type": period_type,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "cumulative_return": self._performance_number(cumulative),
+                    "annualized_return": self._performance_number(annualized),
+                }
+            )
+        return rows
+
+    @staticmethod
+    def _performance_number(pct: Decimal) -> float:
+        return float(quantize_performance(pct))
+
     def _extract_daily_returns_from_twr(
         self,
         twr_payload: dict[str, object],
-    ) -> list[dict[str, object]]:
+    ) -> ReturnSeries:
         results_by_period = self._as_dict(twr_payload.get("results_by_period"))
         period_payload = next(iter(results_by_period.values()), None)
         if not isinstance(period_payload, dict):
-            return []
+            return ReturnSeries()
 
         breakdowns = self._as_dict(period_payload.get("breakdowns"))
         daily_items = breakdowns.get("daily")
         if not isinstance(daily_items, list):
-            return []
-
-        returns: list[dict[str, object]] = []
-        for item in daily_items:
-            if not isinstance(item, dict):
-                continue
-            period = item.get("period")
-            summary = self._as_dict(item.get("summary"))
-            value = summary.get("period_return_pct")
-            if not isinstance(period, str) or not isinstance(value, (int, float)):
-                continue
-            returns.append({"date": period[:10], "value": float(value)})
-        return returns
+            return ReturnSeries()
+        return ReturnSeries.from_twr_daily(daily_items)
 
     def _unwrap_pas_snapshot(
         self, status_code: int, payload: dict[str, object]
@@ -236,6 +729,10 @@ class ReportingReadService:
             )
         if status_code == status.HTTP_404_NOT_FOUND:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=payload.get("detail"))
+        if status_code == status.HTTP_504_GATEWAY_TIMEOUT:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=payload.get("detail")
+            )
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"lotus-core core snapshot upstream failure: {payload}",
@@ -270,6 +767,56 @@ class ReportingReadService:
                 sections.add(item.upper())
         return sections or set(default_sections)
 
+    def _risk_periods(self, request_payload: dict[str, object]) -> list[str]:
+        raw_periods = request_payload.get("risk_periods", request_payload.get("riskPeriods"))
+        if raw_periods is None:
+            return list(RISK_PERIODS)
+        if not isinstance(raw_periods, list) or not raw_periods:
+            raise self._invalid_risk_periods(raw_periods)
+        periods = [str(period).upper() for period in raw_periods]
+        if any(period not in RISK_PERIODS for period in periods):
+            raise self._invalid_risk_periods(raw_periods)
+        return list(dict.fromkeys(periods))
+
+    @staticmethod
+    def _invalid_risk_periods(raw_periods: object) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid risk periods: {raw_periods!r}; supported: {list(RISK_PERIODS)}",
+        )
+
+    def _return_periods(self, request_payload: dict[str, object]) -> list[dict[str, str]]:
+        raw_periods = request_payload.get("return_periods", request_payload.get("returnPeriods"))
+        if raw_periods is None:
+            return [{"type": period} for period in DEFAULT_RETURN_PERIODS]
+        if not isinstance(raw_periods, list):
+            raise self._invalid_return_period(raw_periods)
+        periods: list[dict[str, str]] = []
+        for item in raw_periods:
+            raw = {"type": item} if isinstance(item, str) else self._as_dict(item)
+            period_type = str(raw.get("type", "")).upper()
+            period = {"type": period_type}
+            for field, alias in (("start_date", "startDate"), ("end_date", "endDate")):
+                value = raw.get(field, raw.get(alias))
+                if value is None:
+                    continue
+                try:
+                    period[field] = date.fromisoformat(str(value)).isoformat()
+                except ValueError:
+                    raise self._invalid_return_period(item) from None
+            explicit = period_type == "EXPLICIT" and "start_date" in period
+            if not explicit and (period_type not in NAMED_PERIODS or "start_date" in period):
+                raise self._invalid_return_period(item)
+            periods.append(period)
+        return periods
+
+    @staticmethod
+    def _invalid_return_period(item: object) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid return period: {item!r}",
+        )
+
     def _required_string(self, payload: dict[str, object], *keys: str) -> str:
         for key in keys:
             value = payload.get(key)
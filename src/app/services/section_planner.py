@@ -0,0 +1,106 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Mapping
+
+FetchRunner = Callable[[Mapping[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class SectionFetch:
+    name: str
+    run: FetchRunner
+    depends_on: tuple[str, ...] = ()
+
+
+class SectionPlanner:
+    """Runs section fetches as a dependency graph.
+
+    Independent fetches run concurrently inside one task group, so an exception raised by any
+    fetch (for example a core snapshot 404) cancels every fetch still in flight.
+    """
+
+    def __init__(self, fetches: Iterable[SectionFetch]):
+        self._fetches: dict[str, SectionFetch] = {}
+        for fetch in fetches:
+            if fetch.name in self._fetches:
+                raise ValueError(f"Duplicate section fetch: {fetch.name}")
+            self._fetches[fetch.name] = fetch
+        for fetch in self._fetches.values():
+            unknown = [dep for dep in fetch.depends_on if dep not in self._fetches]
+            if unknown:
+                raise ValueError(f"Section fetch {fetch.name} depends on unknown {unknown}")
+        self.resolve(self._fetches)
+
+    def resolve(self, targets: Iterable[str]) -> list[str]:
+        ordered: list[str] = []
+        visiting: set[str] = set()
+
+        def _visit(name: str) -> None:
+            if name in ordered:
+                return
+            if name in visiting:
+                raise ValueError(f"Section fetch dependency cycle at {name}")
+            if name not in self._fetches:
+                raise ValueError(f"Unknown section fetch: {name}")
+            visiting.add(name)
+            for dep in self._fetches[name].depends_on:
+                _visit(dep)
+            visiting.discard(name)
+            ordered.append(name)
+
+        for target in targets:
+            _visit(target)
+        return ordered
+
+    async def run(self, targets: Iterable[str]) -> dict[str, Any]:
+        tasks: dict[str, asyncio.Task[Any]] = {}
+
+        async def _run_fetch(fetch: SectionFetch) -> Any:
+            inputs = {dep: await tasks[dep] for dep in fetch.depends_on}
+            return await fetch.run(inputs)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for name in self.resolve(targets):
+                    tasks[name] = group.create_task(
+                        _run_fetch(self._fetches[name]), name=f"section-fetch:{name}"
+                    )
+        except BaseExceptionGroup as exc_group:
+            raise _first_error(exc_group) from None
+        return {name: task.result() for name, task in tasks.items()}
+
+    async def as_completed(self, targets: Iterable[str]) -> AsyncIterator[tuple[str, Any]]:
+        """Yields ``(target, result)`` pairs as each target's fetch finishes.
+
+        The first error raised by a target (or by a fetch it depends on) is raised here; fetches
+        still in flight are cancelled then, and when the caller stops iterating early.
+        """
+        target_names = list(dict.fromkeys(targets))
+        tasks: dict[str, asyncio.Task[Any]] = {}
+
+        async def _run_fetch(fetch: SectionFetch) -> Any:
+            inputs = {dep: await tasks[dep] for dep in fetch.depends_on}
+            return await fetch.run(inputs)
+
+        for name in self.resolve(target_names):
+            tasks[name] = asyncio.create_task(
+                _run_fetch(self._fetches[name]), name=f"section-fetch:{name}"
+            )
+        waiting = {tasks[name]: name for name in target_names}
+        try:
+            while waiting:
+                done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield waiting.pop(task), task.result()
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+
+def _first_error(exc_group: BaseExceptionGroup[BaseException]) -> BaseException:
+    for exc in exc_group.exceptions:
+        if isinstance(exc, BaseExceptionGroup):
+            return _first_error(exc)
+        return exc
+    return exc_group
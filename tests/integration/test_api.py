@@ -2,6 +2,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from prometheus_client.parser import text_string_to_metric_families
 
 from app.main import app
 from app.routers.reports import get_reporting_read_service
@@ -52,6 +53,22 @@ def test_metrics_endpoint_available():
     assert "http_requests_total" in response.text or "http_request_duration" in response.text
 
 
+def test_metrics_endpoint_exports_upstream_pool_stats():
+    try:
+        with TestClient(app) as local_client:
+            response = local_client.get("/metrics")
+    finally:
+        app.state.is_draining = False
+
+    assert response.status_code == 200
+    samples = {
+        (sample.name, sample.labels.get("upstream"), sample.labels.get("state"))
+        for family in text_string_to_metric_families(response.text)
+        for sample in family.samples
+    }
+    assert ("lotus_report_upstream_pool_connections", "pas", "open") in samples
+
+
 def test_load_concurrency_health_live_requests():
     def call_live() -> int:
         return client.get("/health/live").status_code
@@ -1,3 +1,6 @@
+import asyncio
+
+import httpx
 import pytest
 
 from app.services.aggregation_service import AggregationService
@@ -78,13 +81,89 @@ class _FailingPaClient:
 
 
 @pytest.mark.asyncio
-async def test_live_aggregation_has_deterministic_fallbacks():
+async def test_live_aggregation_reports_degraded_sources_instead_of_fallbacks():
     service = AggregationService(pas_client=_FailingPasClient(), pa_client=_FailingPaClient())
     response = await service.get_portfolio_aggregation_live(
         portfolio_id="P1",
         as_of_date="2026-02-24",
     )
+    assert response.rows == []
+    assert response.degraded_sources == ["lotus-core", "lotus-performance"]
+
+
+@pytest.mark.asyncio
+async def test_live_aggregation_keeps_core_rows_when_performance_degraded():
+    service = AggregationService(pas_client=_StubPasClient(), pa_client=_FailingPaClient())
+    response = await service.get_portfolio_aggregation_live(
+        portfolio_id="P1",
+        as_of_date="2026-02-24",
+    )
+    metric_map = {row.metric: row.value for row in response.rows}
+    assert metric_map["market_value_base"] == 999_999.0
+    assert "return_ytd_pct" not in metric_map
+    assert response.degraded_sources == ["lotus-performance"]
+
+
+class _SlowPasClient(_StubPasClient):
+    def __init__(self, pa_started: asyncio.Event | None = None, delay_seconds: float = 0.0):
+        self._pa_started = pa_started
+        self._delay_seconds = delay_seconds
+
+    async def get_core_snapshot(
+        self, portfolio_id: str, as_of_date: str, include_sections: list[str]
+    ):
+        if self._pa_started is not None:
+            await asyncio.wait_for(self._pa_started.wait(), timeout=1.0)
+        await asyncio.sleep(self._delay_seconds)
+        return await super().get_core_snapshot(portfolio_id, as_of_date, include_sections)
+
+
+class _SignallingPaClient(_StubPaClient):
+    def __init__(self, started: asyncio.Event):
+        self._started = started
+
+    async def get_pas_input_twr(self, portfolio_id: str, as_of_date: str, periods: list[str]):
+        self._started.set()
+        return await super().get_pas_input_twr(portfolio_id, as_of_date, periods)
+
+
+@pytest.mark.asyncio
+async def test_live_aggregation_fetches_sources_concurrently():
+    pa_started = asyncio.Event()
+    service = AggregationService(
+        pas_client=_SlowPasClient(pa_started=pa_started),
+        pa_client=_SignallingPaClient(pa_started),
+    )
+    response = await service.get_portfolio_aggregation_live("P1", "2026-02-24")
+    assert response.degraded_sources == []
+    assert {row.metric for row in response.rows} >= {"market_value_base", "return_ytd_pct"}
+
+
+@pytest.mark.asyncio
+async def test_live_aggregation_times_out_slow_source_independently(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.aggregation_service.settings.aggregation_core_timeout_seconds", 0.01
+    )
+    service = AggregationService(
+        pas_client=_SlowPasClient(delay_seconds=1.0),
+        pa_client=_StubPaClient(),
+    )
+    response = await service.get_portfolio_aggregation_live("P1", "2026-02-24")
+    metric_map = {row.metric: row.value for row in response.rows}
+    assert response.degraded_sources == ["lotus-core"]
+    assert metric_map == {"return_ytd_pct": 4.2}
+
+
+class _DisconnectingPaClient:
+    async def get_pas_input_twr(self, portfolio_id: str, as_of_date: str, periods: list[str]):
+        raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+
+
+@pytest.mark.asyncio
+async def test_live_aggregation_degrades_a_source_that_raises():
+    service = AggregationService(pas_client=_StubPasClient(), pa_client=_DisconnectingPaClient())
+    response = await service.get_portfolio_aggregation_live("P1", "2026-02-24")
     metric_map = {row.metric: row.value for row in response.rows}
-    assert metric_map["market_value_base"] == 1_250_000.0
-    assert metric_map["position_count"] == 0.0
-    assert metric_map["return_ytd_pct"] == 0.0
+    assert response.degraded_sources == ["lotus-performance"]
+    assert "market_value_base" in metric_map
+    assert "return_ytd_pct" not in metric_map
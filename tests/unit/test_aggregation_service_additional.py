@@ -92,8 +92,8 @@ def test_build_asset_class_rows_handles_non_conforming_payloads(payload, total_m
 async def test_fetch_inputs_drops_upstream_payloads_when_services_fail():
     service = AggregationService(pas_client=_PasFailClient(), pa_client=_PaFailClient())
     pas_payload, pa_payload = await service._fetch_inputs("P1", "2026-02-24")
-    assert pas_payload == {}
-    assert pa_payload == {}
+    assert pas_payload is None
+    assert pa_payload is None
 
 
 def test_get_portfolio_aggregation_non_live_returns_deterministic_rows():
@@ -0,0 +1,203 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from app.clients.http_resilience import post_with_retry
+from app.clients.pa_client import PaClient
+from app.services.reporting_read_service import ReportingReadService
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: _Clock, **overrides) -> CircuitBreaker:
+    options = {
+        "window_size": 4,
+        "minimum_calls": 4,
+        "failure_threshold": 0.5,
+        "open_seconds": 10.0,
+        "half_open_max_calls": 2,
+    }
+    options.update(overrides)
+    return CircuitBreaker(upstream="cb-test", clock=clock, **options)
+
+
+def _state_gauge(upstream: str, state: str) -> float:
+    return REGISTRY.get_sample_value(
+        "lotus_report_upstream_circuit_state", {"upstream": upstream, "state": state}
+    )
+
+
+def test_breaker_stays_closed_until_minimum_calls():
+    breaker = _breaker(_Clock())
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    assert breaker.allow_request() is True
+
+
+def test_breaker_opens_when_failure_ratio_reaches_threshold():
+    breaker = _breaker(_Clock())
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.allow_request() is False
+    assert _state_gauge("cb-test", OPEN) == 1
+    assert _state_gauge("cb-test", CLOSED) == 0
+
+
+def test_breaker_half_open_probes_close_circuit_after_successes():
+    clock = _Clock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10.0
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+
+    breaker.record_success()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failure_ratio() == 0.0
+
+
+def test_breaker_half_open_failure_reopens_circuit():
+    clock = _Clock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow_request() is True
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    clock.now = 15.0
+    assert breaker.allow_request() is False
+
+
+def test_breaker_release_returns_half_open_probe_slot():
+    clock = _Clock()
+    breaker = _breaker(clock, half_open_max_calls=1)
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 10.0
+
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.release()
+    assert breaker.allow_request() is True
+
+
+def test_get_circuit_breaker_respects_enabled_setting(monkeypatch):
+    reset_circuit_breakers()
+    monkeypatch.setattr("app.clients.circuit_breaker.settings.circuit_breaker_enabled", False)
+    assert get_circuit_breaker("pa") is None
+    monkeypatch.setattr("app.clients.circuit_breaker.settings.circuit_breaker_enabled", True)
+    assert get_circuit_breaker("pa") is get_circuit_breaker("pa")
+    reset_circuit_breakers()
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_fails_fast_when_circuit_open(monkeypatch):
+    reset_circuit_breakers()
+    breaker = get_circuit_breaker("risk")
+    for _ in range(20):
+        breaker.record_failure()
+
+    async def _unexpected_send(*args, **kwargs):
+        raise AssertionError("open circuit must not reach upstream")
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _unexpected_send)
+    status, payload = await post_with_retry(
+        url="http://risk/analytics/risk/calculate",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="risk",
+    )
+    reset_circuit_breakers()
+
+    assert status == 503
+    assert payload == {"detail": "upstream circuit open: risk"}
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_records_server_errors_as_failures(monkeypatch):
+    reset_circuit_breakers()
+
+    class _Response:
+        status_code = 502
+        text = "bad gateway"
+        content = b"bad gateway"
+
+        def json(self):
+            raise ValueError("not json")
+
+    async def _send(*args, **kwargs):
+        return _Response()
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    for _ in range(10):
+        await post_with_retry(
+            url="http://pa/performance/twr",
+            timeout_seconds=1.0,
+            json_body={},
+            headers={},
+            upstream="pa",
+        )
+
+    assert get_circuit_breaker("pa").state == OPEN
+    reset_circuit_breakers()
+
+
+class _PasClientForOpenCircuit:
+    async def get_core_snapshot(self, portfolio_id: str, as_of_date: str, include_sections):
+        return 200, {"snapshot": {"overview": {"total_market_value": 1.0}}}
+
+    async def get_performance_input(
+        self, portfolio_id: str, as_of_date: str, lookback_days: int = 1200
+    ):
+        return 404, {"detail": "no performance input"}
+
+
+@pytest.mark.asyncio
+async def test_review_performance_section_is_none_when_pa_circuit_open(monkeypatch):
+    reset_circuit_breakers()
+    breaker = get_circuit_breaker("pa")
+    for _ in range(20):
+        breaker.record_failure()
+
+    async def _unexpected_send(*args, **kwargs):
+        raise AssertionError("open circuit must not reach upstream")
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _unexpected_send)
+    service = ReportingReadService(
+        pas_client=_PasClientForOpenCircuit(),
+        pa_client=PaClient(base_url="http://pa", timeout_seconds=10.0),
+        risk_client=None,
+    )
+    response = await service.get_portfolio_review(
+        "P1", {"as_of_date": "2026-02-24", "sections": ["OVERVIEW", "PERFORMANCE"]}, None
+    )
+    reset_circuit_breakers()
+
+    assert response["overview"] == {"total_market_value": 1.0}
+    assert response["performance"] is None
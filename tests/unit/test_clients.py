@@ -1,3 +1,6 @@
+import asyncio
+import json
+
 import pytest
 
 from app.clients.pa_client import PaClient
@@ -12,6 +15,12 @@ class _FakeResponse:
         self._payload = payload
         self.text = text
 
+    @property
+    def content(self) -> bytes:
+        if isinstance(self._payload, Exception):
+            return self.text.encode("utf-8")
+        return json.dumps(self._payload).encode("utf-8")
+
     def json(self):
         if isinstance(self._payload, Exception):
             raise self._payload
@@ -207,3 +216,34 @@ async def test_risk_client_calculate_risk_posts_expected_contract(monkeypatch):
     assert status_code == 200
     assert payload == {"results": {}}
     assert kwargs["url"] == "http://risk/analytics/risk/calculate"
+
+
+@pytest.mark.asyncio
+async def test_pas_client_coalesces_identical_concurrent_core_snapshot_calls(monkeypatch):
+    calls: list[dict] = []
+    release = asyncio.Event()
+
+    async def _fake_post_with_retry(**kwargs):
+        calls.append(kwargs)
+        await release.wait()
+        return 200, {"snapshot": {"overview": {}}}
+
+    monkeypatch.setattr("app.clients.pas_client.post_with_retry", _fake_post_with_retry)
+    client = PasClient(base_url="http://pas/", timeout_seconds=3.0)
+
+    waiters = [
+        asyncio.create_task(
+            client.get_core_snapshot(
+                portfolio_id="P-SF",
+                as_of_date="2026-02-24",
+                include_sections=["OVERVIEW"],
+            )
+        )
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert len(calls) == 1
+    assert results[0] == results[1] == (200, {"snapshot": {"overview": {}}})
@@ -0,0 +1,70 @@
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+
+from app import codec as codec_module
+from app.codec import CodecJSONResponse, build_codec, codec
+
+_PAYLOAD = {
+    "portfolio_id": "P1",
+    "as_of_date": date(2026, 2, 24),
+    "generated_at": datetime(2026, 2, 24, 8, 30, tzinfo=UTC),
+    "overview": {"total_market_value": Decimal("1000000.10"), "total_cash": 50_000.5},
+    "holdings": [{"id": index, "quantity": Decimal("12.000001")} for index in range(3)],
+    "name": "Zürich",
+}
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson", "msgspec"])
+def test_codec_backends_encode_decimals_exactly_and_agree(backend):
+    if backend != "stdlib":
+        pytest.importorskip(backend)
+    built = build_codec(backend)
+    assert built.name == backend
+
+    decoded = built.loads(built.dumps(_PAYLOAD))
+
+    assert decoded["overview"]["total_market_value"] == "1000000.10"
+    assert decoded["holdings"][0]["quantity"] == "12.000001"
+    assert decoded["as_of_date"] == "2026-02-24"
+    assert decoded["name"] == "Zürich"
+    assert decoded == build_codec("stdlib").loads(build_codec("stdlib").dumps(_PAYLOAD))
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson", "msgspec"])
+def test_codec_backends_raise_value_error_on_malformed_input(backend):
+    if backend != "stdlib":
+        pytest.importorskip(backend)
+    with pytest.raises(ValueError):
+        build_codec(backend).loads(b'{"a": ')
+
+
+@pytest.mark.parametrize("backend", ["stdlib", "orjson", "msgspec"])
+def test_codec_backends_write_non_finite_numbers_as_null(backend):
+    if backend != "stdlib":
+        pytest.importorskip(backend)
+    payload = {"metrics": [float("nan"), float("inf"), -float("inf"), 1.5], "ok": (2.0,)}
+
+    assert build_codec(backend).loads(build_codec(backend).dumps(payload)) == {
+        "metrics": [None, None, None, 1.5],
+        "ok": [2.0],
+    }
+
+
+def test_stdlib_codec_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        build_codec("stdlib").dumps({"value": object()})
+
+
+def test_build_codec_falls_back_to_stdlib_when_backend_missing(monkeypatch):
+    monkeypatch.setitem(codec_module._BACKEND_FACTORIES, "orjson", lambda: None)
+    assert build_codec("orjson").name == "stdlib"
+    with pytest.raises(ValueError):
+        build_codec("simdjson")
+
+
+def test_codec_json_response_renders_through_codec():
+    response = CodecJSONResponse({"total_market_value": Decimal("10.50")})
+    assert codec.loads(response.body) == {"total_market_value": "10.50"}
+    assert response.media_type == "application/json"
@@ -0,0 +1,227 @@
+import json
+
+import pytest
+
+from app.analytics.return_series import ReturnSeries
+from app.clients.columnar import (
+    columnar_series_enabled,
+    from_columnar,
+    rejects_columnar,
+    reset_columnar_upstreams,
+    to_columnar,
+)
+from app.clients.pa_client import PaClient
+from app.clients.risk_client import RiskClient
+
+_POINTS = [
+    {"day": 1, "perf_date": "2026-01-02", "begin_mv": 100.0, "end_mv": 101.5},
+    {"day": 2, "perf_date": "2026-01-05", "begin_mv": 101.5, "end_mv": 100.25},
+    {"day": 3, "perf_date": "2026-01-06", "begin_mv": 100.25, "end_mv": 102.0},
+]
+_RETURNS = [{"date": "2026-01-02", "value": 1.5}, {"date": "2026-01-05", "value": -0.2}]
+
+
+class _StandInUpstream:
+    """Test upstream for lotus-performance and risk that reads row or columnar series."""
+
+    def __init__(self, field: str, columnar: bool):
+        self.field = field
+        self.columnar = columnar
+        self.bodies: list[dict] = []
+
+    async def post_with_retry(self, **kwargs):
+        body = json.loads(json.dumps(kwargs["json_body"]))
+        self.bodies.append(body)
+        series = body[self.field]
+        if isinstance(series, dict):
+            if not self.columnar:
+                return 422, {"detail": f"{self.field}: Input should be a valid list"}
+            series = from_columnar(series)
+        return 200, {"rows": series}
+
+
+def test_columnar_series_round_trips_rows():
+    encoded = to_columnar(_POINTS, "perf_date")
+
+    assert encoded == {
+        "encoding": "columnar",
+        "date_key": "perf_date",
+        "start_date": "2026-01-02",
+        "day_offsets": [0, 3, 4],
+        "columns": {
+            "day": [1, 2, 3],
+            "begin_mv": [100.0, 101.5, 100.25],
+            "end_mv": [101.5, 100.25, 102.0],
+        },
+    }
+    assert from_columnar(encoded) == _POINTS
+    assert from_columnar(to_columnar(_RETURNS, "date")) == _RETURNS
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [],
+        [{"date": "2026-01-02"}, {"date": "2026-01-05", "value": 1.0}],
+        [{"date": "2026-01-02T00:00:00", "value": 1.0}],
+        [{"date": "2026-W01-1", "value": 1.0}],
+        [{"value": 1.0}],
+        "not-a-series",
+    ],
+)
+def test_columnar_series_leaves_irregular_rows_alone(rows):
+    assert to_columnar(rows, "date") is None
+
+
+def test_columnar_series_needs_matching_column_lengths():
+    encoded = to_columnar(_RETURNS, "date")
+    encoded["columns"]["value"].pop()
+
+    with pytest.raises(ValueError):
+        from_columnar(encoded)
+    with pytest.raises(ValueError):
+        from_columnar({"encoding": "packed"})
+
+
+@pytest.mark.asyncio
+async def test_clients_send_columnar_series_to_upstreams_that_take_it(monkeypatch):
+    monkeypatch.setattr("app.clients.columnar.settings.upstream_columnar_series", "pa, risk")
+    pa_upstream = _StandInUpstream("valuation_points", columnar=True)
+    risk_upstream = _StandInUpstream("returns", columnar=True)
+    monkeypatch.setattr("app.clients.pa_client.post_with_retry", pa_upstream.post_with_retry)
+    monkeypatch.setattr("app.clients.risk_client.post_with_retry", risk_upstream.post_with_retry)
+    reset_columnar_upstreams()
+
+    twr = await PaClient("http://pa", 1.0).calculate_twr({"valuation_points": _POINTS})
+    risk = await RiskClient("http://risk", 1.0).calculate_risk({"returns": _RETURNS})
+
+    assert twr == (200, {"rows": _POINTS})
+    assert risk == (200, {"rows": _RETURNS})
+    assert pa_upstream.bodies[0]["valuation_points"]["encoding"] == "columnar"
+    assert risk_upstream.bodies[0]["returns"]["day_offsets"] == [0, 3]
+
+
+@pytest.mark.asyncio
+async def test_risk_client_encodes_a_return_series_at_the_boundary(monkeypatch):
+    series = ReturnSeries.from_pairs((row["date"], row["value"]) for row in _RETURNS)
+    monkeypatch.setattr("app.clients.columnar.settings.upstream_columnar_series", "risk")
+    columnar_upstream = _StandInUpstream("returns", columnar=True)
+    monkeypatch.setattr(
+        "app.clients.risk_client.post_with_retry", columnar_upstream.post_with_retry
+    )
+    reset_columnar_upstreams()
+
+    assert await RiskClient("http://risk", 1.0).calculate_risk({"returns": series}) == (
+        200,
+        {"rows": _RETURNS},
+    )
+    assert columnar_upstream.bodies[0]["returns"] == to_columnar(_RETURNS, "date")
+
+    rows_upstream = _StandInUpstream("returns", columnar=False)
+    monkeypatch.setattr("app.clients.risk_client.post_with_retry", rows_upstream.post_with_retry)
+    for _ in range(2):
+        assert await RiskClient("http://risk", 1.0).calculate_risk({"returns": series}) == (
+            200,
+            {"rows": _RETURNS},
+        )
+    assert [body["returns"] for body in rows_upstream.bodies[1:]] == [_RETURNS, _RETURNS]
+    reset_columnar_upstreams()
+
+
+@pytest.mark.asyncio
+async def test_client_falls_back_to_rows_for_upstreams_without_columnar(monkeypatch):
+    monkeypatch.setattr("app.clients.columnar.settings.upstream_columnar_series", "pa")
+    upstream = _StandInUpstream("valuation_points", columnar=False)
+    monkeypatch.setattr("app.clients.pa_client.post_with_retry", upstream.post_with_retry)
+    reset_columnar_upstreams()
+    client = PaClient("http://pa", 1.0)
+
+    for _ in range(2):
+        assert await client.calculate_twr({"valuation_points": _POINTS}) == (200, {"rows": _POINTS})
+
+    assert [type(body["valuation_points"]) for body in upstream.bodies] == [dict, list, list]
+    reset_columnar_upstreams()
+
+
+@pytest.mark.parametrize(
+    ("status_code", "response", "rejected"),
+    [
+        (415, {"detail": "Unsupported Media Type"}, True),
+        (
+            422,
+            {
+                "detail": [
+                    {
+                        "loc": ["body", "returns"],
+                        "type": "list_type",
+                        "msg": "Input should be a valid list",
+                    }
+                ]
+            },
+            True,
+        ),
+        (400, {"detail": "returns: expected an array"}, True),
+        (
+            422,
+            {
+                "detail": [
+                    {
+                        "loc": ["body", "scope", "asOfDate"],
+                        "type": "missing",
+                        "msg": "Field required",
+                    }
+                ]
+            },
+            False,
+        ),
+        (400, {"detail": "portfolioOpenDate is after asOfDate"}, False),
+        (422, {"detail": "returns: too few observations"}, False),
+        (500, {"detail": "returns: expected an array"}, False),
+        (422, ["returns"], False),
+    ],
+)
+def test_only_explicit_rejections_count_against_columnar(status_code, response, rejected):
+    assert rejects_columnar(status_code, response, "returns") is rejected
+
+
+@pytest.mark.asyncio
+async def test_client_keeps_columnar_for_unrelated_validation_errors(monkeypatch):
+    monkeypatch.setattr("app.clients.columnar.settings.upstream_columnar_series", "risk")
+    bodies: list[dict] = []
+
+    async def post_with_retry(**kwargs):
+        bodies.append(kwargs["json_body"])
+        return 422, {
+            "detail": [{"loc": ["body", "scope"], "type": "missing", "msg": "Field required"}]
+        }
+
+    monkeypatch.setattr("app.clients.risk_client.post_with_retry", post_with_retry)
+    reset_columnar_upstreams()
+
+    status_code, _ = await RiskClient("http://risk", 1.0).calculate_risk({"returns": _RETURNS})
+
+    assert status_code == 422
+    assert len(bodies) == 1
+    assert columnar_series_enabled("risk")
+
+
+@pytest.mark.asyncio
+async def test_client_remembers_a_columnar_rejection_even_when_rows_fail(monkeypatch):
+    monkeypatch.setattr("app.clients.columnar.settings.upstream_columnar_series", "risk")
+    bodies: list[object] = []
+
+    async def post_with_retry(**kwargs):
+        bodies.append(kwargs["json_body"]["returns"])
+        if isinstance(kwargs["json_body"]["returns"], dict):
+            return 415, {"detail": "Unsupported Media Type"}
+        return 503, {"detail": "unavailable"}
+
+    monkeypatch.setattr("app.clients.risk_client.post_with_retry", post_with_retry)
+    reset_columnar_upstreams()
+    client = RiskClient("http://risk", 1.0)
+
+    for _ in range(2):
+        assert (await client.calculate_risk({"returns": _RETURNS}))[0] == 503
+
+    assert [type(body) for body in bodies] == [dict, list, list]
+    reset_columnar_upstreams()
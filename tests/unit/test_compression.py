@@ -0,0 +1,195 @@
+import gzip
+import json as jsonlib
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.http_resilience import post_with_retry
+from app.compression import (
+    ResponseCompressionMiddleware,
+    compress_body,
+    negotiate_encoding,
+    reset_upstream_request_encodings,
+    supported_encodings,
+)
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _json_app(body: bytes, content_type: bytes = b"application/json"):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", content_type),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+async def _call(app, path: str, accept_encoding: str | None = "gzip"):
+    headers = [] if accept_encoding is None else [(b"accept-encoding", accept_encoding.encode())]
+    sent: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "path": path, "headers": headers}, receive, send)
+    start_headers = dict(sent[0]["headers"])
+    body = b"".join(message.get("body", b"") for message in sent[1:])
+    return start_headers, body
+
+
+def test_negotiate_encoding_honours_quality_values():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("*") == supported_encodings()[0]
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding(None) is None
+
+
+@pytest.mark.asyncio
+async def test_compress_body_records_bytes_saved_and_cpu(monkeypatch):
+    monkeypatch.setattr("app.compression.settings.compression_offload_min_bytes", 0)
+    labels = {"direction": "test", "encoding": "gzip"}
+    saved_before = _sample("lotus_report_compression_bytes_saved_total", labels)
+    input_before = _sample("lotus_report_compression_input_bytes_total", labels)
+    data = b'{"holdings":[' + b'{"quantity":"100.00"},' * 2000 + b"{}]}"
+
+    compressed = await compress_body(data, "gzip", direction="test")
+
+    assert gzip.decompress(compressed) == data
+    assert _sample("lotus_report_compression_bytes_saved_total", labels) - saved_before == len(
+        data
+    ) - len(compressed)
+    assert _sample("lotus_report_compression_input_bytes_total", labels) - input_before == len(data)
+    assert REGISTRY.get_sample_value("lotus_report_compression_cpu_seconds_total", labels) >= 0
+
+
+@pytest.mark.asyncio
+async def test_response_compression_middleware_compresses_large_report_bodies():
+    body = jsonlib.dumps({"rows": [{"value": "1.00"}] * 500}).encode()
+    app = ResponseCompressionMiddleware(_json_app(body), minimum_size=1024)
+
+    headers, compressed = await _call(app, "/reports/portfolios/P1/review")
+
+    assert headers[b"content-encoding"] == b"gzip"
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert headers[b"content-length"] == str(len(compressed)).encode()
+    assert gzip.decompress(compressed) == body
+
+
+@pytest.mark.asyncio
+async def test_response_compression_middleware_passes_through_small_and_unmatched_bodies():
+    large = b"[" + b"1," * 2000 + b"1]"
+    app = ResponseCompressionMiddleware(_json_app(b'{"ok":true}'), minimum_size=1024)
+    headers, body = await _call(app, "/aggregations/portfolios/P1")
+    assert b"content-encoding" not in headers
+    assert headers[b"vary"] == b"Accept-Encoding"
+    assert body == b'{"ok":true}'
+
+    app = ResponseCompressionMiddleware(_json_app(large), minimum_size=1024)
+    for path, accept_encoding, vary in (
+        ("/health", "gzip", None),
+        ("/reports/x", None, b"Accept-Encoding"),
+    ):
+        headers, body = await _call(app, path, accept_encoding)
+        assert b"content-encoding" not in headers
+        assert headers.get(b"vary") == vary
+        assert body == large
+
+
+@pytest.mark.asyncio
+async def test_response_compression_middleware_leaves_streaming_media_types_alone():
+    lines = b'{"row":1}\n' * 500
+    app = ResponseCompressionMiddleware(
+        _json_app(lines, content_type=b"application/x-ndjson"), minimum_size=1024
+    )
+
+    headers, body = await _call(app, "/reports/stream")
+
+    assert b"content-encoding" not in headers
+    assert body == lines
+
+
+class _RecordingSend:
+    def __init__(self, *statuses: int):
+        self._statuses = list(statuses)
+        self.calls: list[tuple[dict[str, str], bytes | None]] = []
+
+    async def __call__(self, shared_client, url, timeout, json_body, headers, stream, content):
+        self.calls.append((headers, content))
+        return httpx.Response(
+            status_code=self._statuses.pop(0),
+            content=b'{"ok":true}',
+            headers={"Content-Type": "application/json"},
+            request=httpx.Request("POST", url),
+        )
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_compresses_bodies_for_opted_in_upstreams(monkeypatch):
+    reset_upstream_request_encodings()
+    monkeypatch.setattr("app.compression.settings.upstream_request_compression", "cmp-pa")
+    monkeypatch.setattr("app.compression.settings.upstream_request_compression_encoding", "gzip")
+    monkeypatch.setattr(
+        "app.clients.http_resilience.settings.upstream_request_compression_min_bytes", 64
+    )
+    send = _RecordingSend(200)
+    monkeypatch.setattr("app.clients.http_resilience._send", send)
+    json_body = {"valuation_points": [{"day": day, "end_mv": "100.00"} for day in range(50)]}
+
+    status, _ = await post_with_retry(
+        url="http://pa/performance/twr",
+        timeout_seconds=1.0,
+        json_body=json_body,
+        headers={},
+        upstream="cmp-pa",
+    )
+
+    headers, content = send.calls[0]
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert content is not None
+    assert jsonlib.loads(gzip.decompress(content)) == json_body
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_resends_plain_body_after_415(monkeypatch):
+    reset_upstream_request_encodings()
+    monkeypatch.setattr("app.compression.settings.upstream_request_compression", "cmp-415")
+    monkeypatch.setattr(
+        "app.clients.http_resilience.settings.upstream_request_compression_min_bytes", 0
+    )
+    send = _RecordingSend(415, 200, 200)
+    monkeypatch.setattr("app.clients.http_resilience._send", send)
+
+    async def _post():
+        return await post_with_retry(
+            url="http://pa/performance/twr",
+            timeout_seconds=1.0,
+            json_body={"portfolioId": "P1"},
+            headers={},
+            upstream="cmp-415",
+        )
+
+    first = await _post()
+    second = await _post()
+    reset_upstream_request_encodings()
+
+    assert first[0] == 200
+    assert second[0] == 200
+    assert [content is None for _, content in send.calls] == [False, True, True]
+    assert "Content-Encoding" not in send.calls[1][0]
@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceeded,
+    get_concurrency_limiter,
+    reset_concurrency_limiters,
+)
+from app.clients.http_resilience import post_with_retry
+
+
+def _limiter(**overrides) -> AdaptiveConcurrencyLimiter:
+    options = {
+        "initial_limit": 2,
+        "min_limit": 1,
+        "max_limit": 4,
+        "max_queue": 1,
+        "queue_timeout_seconds": 0.05,
+        "latency_tolerance": 2.0,
+        "backoff_ratio": 0.5,
+    }
+    options.update(overrides)
+    return AdaptiveConcurrencyLimiter(upstream="cl-test", **options)
+
+
+def _rejections(upstream: str, reason: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "lotus_report_upstream_concurrency_rejections_total",
+        {"upstream": upstream, "reason": reason},
+    )
+    return value or 0.0
+
+
+def test_limiter_grows_additively_on_fast_successes():
+    limiter = _limiter(initial_limit=2)
+    for _ in range(6):
+        limiter._in_flight += 1
+        limiter.release(0.01, succeeded=True)
+    assert limiter.limit == 4
+    assert (
+        REGISTRY.get_sample_value(
+            "lotus_report_upstream_concurrency_limit", {"upstream": "cl-test"}
+        )
+        == 4
+    )
+
+
+def test_limiter_backs_off_multiplicatively_on_errors_and_slow_calls():
+    limiter = _limiter(initial_limit=4)
+    limiter._in_flight = 3
+    limiter.release(0.01, succeeded=True)
+    limiter.release(0.01, succeeded=False)
+    assert limiter.limit == 2
+    limiter.release(0.05, succeeded=True)
+    assert limiter.limit == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_beyond_limit_and_hands_over_released_slot():
+    limiter = _limiter(initial_limit=1, queue_timeout_seconds=1.0)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+
+    limiter.release()
+    await waiter
+    assert limiter.in_flight == 1
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_full_or_wait_times_out():
+    limiter = _limiter(initial_limit=1)
+    full_before = _rejections("cl-test", "queue_full")
+    timeout_before = _rejections("cl-test", "queue_timeout")
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await limiter.acquire()
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await waiter
+
+    assert limiter.queued == 0
+    assert limiter.in_flight == 1
+    assert _rejections("cl-test", "queue_full") - full_before == 1
+    assert _rejections("cl-test", "queue_timeout") - timeout_before == 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_cancelled_waiter_leaves_queue():
+    limiter = _limiter(initial_limit=1, queue_timeout_seconds=1.0)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    limiter.release()
+    assert limiter.queued == 0
+    assert limiter.in_flight == 0
+
+
+def test_get_concurrency_limiter_isolates_upstreams(monkeypatch):
+    reset_concurrency_limiters()
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_enabled", False)
+    assert get_concurrency_limiter("risk") is None
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_enabled", True)
+    assert get_concurrency_limiter("risk") is get_concurrency_limiter("risk")
+    assert get_concurrency_limiter("risk") is not get_concurrency_limiter("pas")
+    reset_concurrency_limiters()
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_sheds_load_when_upstream_saturated(monkeypatch):
+    reset_concurrency_limiters()
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_initial", 1)
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_min", 1)
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_max_queue", 0)
+    gate = asyncio.Event()
+
+    class _Response:
+        status_code = 200
+        content = b'{"ok": true}'
+
+        def json(self):
+            return {"ok": True}
+
+    async def _send(*args, **kwargs):
+        await gate.wait()
+        return _Response()
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+
+    async def _call(upstream: str):
+        return await post_with_retry(
+            url="http://upstream/calculate",
+            timeout_seconds=1.0,
+            json_body={},
+            headers={},
+            upstream=upstream,
+        )
+
+    first = asyncio.create_task(_call("risk"))
+    await asyncio.sleep(0)
+    shed = await _call("risk")
+    other = asyncio.create_task(_call("pas"))
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert shed[0] == 503
+    assert shed[1]["detail"].startswith("upstream concurrency limit exceeded: risk")
+    assert await first == (200, {"ok": True})
+    assert await other == (200, {"ok": True})
+    assert get_concurrency_limiter("risk").in_flight == 0
+    reset_concurrency_limiters()
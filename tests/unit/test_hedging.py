@@ -0,0 +1,234 @@
+import asyncio
+import json
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.concurrency_limiter import get_concurrency_limiter, reset_concurrency_limiters
+from app.clients.hedging import Hedger, get_hedger, reset_hedgers
+from app.clients.http_resilience import post_with_retry
+
+
+def _outcomes(endpoint: str, outcome: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "lotus_report_upstream_hedged_requests_total",
+        {"upstream": "pas", "endpoint": endpoint, "outcome": outcome},
+    )
+    return value or 0.0
+
+
+def _warm_hedger(hedger: Hedger, latency_seconds: float, samples: int = 20) -> None:
+    for _ in range(samples):
+        hedger.record_latency(latency_seconds)
+        hedger.record_request()
+
+
+class _Response:
+    def __init__(self, status_code: int, body: dict):
+        self.status_code = status_code
+        self._body = body
+        self.content = json.dumps(body).encode("utf-8")
+
+    def json(self):
+        return self._body
+
+
+def test_hedge_delay_tracks_latency_percentile_after_min_samples():
+    hedger = Hedger(upstream="pas", endpoint="h-test", min_samples=10, min_delay_seconds=0.0)
+    for index in range(9):
+        hedger.record_latency(index / 100)
+    assert hedger.hedge_delay() is None
+
+    hedger.record_latency(0.5)
+    assert hedger.hedge_delay() == 0.5
+    assert Hedger(upstream="pas", endpoint="h-test", min_samples=1).hedge_delay() is None
+
+
+def test_hedge_budget_caps_extra_load():
+    hedger = Hedger(upstream="pas", endpoint="h-budget", budget_ratio=0.25)
+    exhausted_before = _outcomes("h-budget", "budget_exhausted")
+    for _ in range(4):
+        hedger.record_request()
+
+    assert hedger.try_spend() is True
+    assert hedger.try_spend() is False
+    assert _outcomes("h-budget", "budget_exhausted") - exhausted_before == 1
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_hedges_slow_idempotent_read(monkeypatch):
+    reset_hedgers()
+    monkeypatch.setattr("app.clients.hedging.settings.hedging_enabled", True)
+    _warm_hedger(get_hedger("pas", "h-slow"), latency_seconds=0.01)
+    won_before = _outcomes("h-slow", "won")
+    calls = []
+    primary_cancelled = asyncio.Event()
+
+    async def _send(*args, **kwargs):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return _Response(200, {"attempt": len(calls)})
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    status, payload = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="pas",
+        idempotent=True,
+        endpoint="h-slow",
+    )
+    await asyncio.wait_for(primary_cancelled.wait(), timeout=1.0)
+    reset_hedgers()
+
+    assert (status, payload) == (200, {"attempt": 2})
+    assert len(calls) == 2
+    assert _outcomes("h-slow", "won") - won_before == 1
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_does_not_hedge_fast_or_non_idempotent_calls(monkeypatch):
+    reset_hedgers()
+    monkeypatch.setattr("app.clients.hedging.settings.hedging_enabled", True)
+    _warm_hedger(get_hedger("pas", "h-fast"), latency_seconds=0.01)
+    calls = []
+
+    async def _send(*args, **kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.05)
+        return _Response(200, {"ok": True})
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    await post_with_retry(
+        url="http://pas/portfolios/P1/summary",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="pas",
+        endpoint="h-fast",
+    )
+    assert len(calls) == 1
+
+    monkeypatch.setattr("app.clients.hedging.settings.hedging_enabled", False)
+    await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="pas",
+        idempotent=True,
+        endpoint="h-fast",
+    )
+    assert len(calls) == 2
+    reset_hedgers()
+
+
+@pytest.mark.asyncio
+async def test_hedged_read_falls_back_to_surviving_attempt_on_error(monkeypatch):
+    reset_hedgers()
+    monkeypatch.setattr("app.clients.hedging.settings.hedging_enabled", True)
+    _warm_hedger(get_hedger("pas", "h-error"), latency_seconds=0.01)
+    calls = []
+
+    async def _send(*args, **kwargs):
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(0.1)
+            return _Response(200, {"attempt": 1})
+        raise RuntimeError("hedge failed")
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    status, payload = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/performance-input",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="pas",
+        idempotent=True,
+        endpoint="h-error",
+    )
+    reset_hedgers()
+
+    assert (status, payload) == (200, {"attempt": 1})
+    assert len(calls) == 2
+
+
+def test_hedging_is_off_by_default():
+    reset_hedgers()
+    assert get_hedger("pas", "h-default") is None
+
+
+@pytest.mark.asyncio
+async def test_hedge_needs_a_free_concurrency_slot(monkeypatch):
+    reset_hedgers()
+    reset_concurrency_limiters()
+    monkeypatch.setattr("app.clients.hedging.settings.hedging_enabled", True)
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_initial", 1)
+    monkeypatch.setattr("app.clients.concurrency_limiter.settings.concurrency_limit_min", 1)
+    _warm_hedger(get_hedger("pas", "h-slot"), latency_seconds=0.01)
+    no_slot_before = _outcomes("h-slot", "no_slot")
+    calls = []
+
+    async def _send(*args, **kwargs):
+        calls.append(len(calls))
+        await asyncio.sleep(0.2)
+        return _Response(200, {"attempt": len(calls)})
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    status, _ = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="pas",
+        idempotent=True,
+        endpoint="h-slot",
+    )
+    limiter = get_concurrency_limiter("pas")
+    reset_hedgers()
+    reset_concurrency_limiters()
+
+    assert status == 200
+    assert len(calls) == 1
+    assert _outcomes("h-slot", "no_slot") - no_slot_before == 1
+    assert limiter is not None and limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_holds_a_concurrency_slot_until_it_finishes(monkeypatch):
+    reset_hedgers()
+    reset_concurrency_limiters()
+    monkeypatch.setattr("app.clients.hedging.settings.hedging_enabled", True)
+    _warm_hedger(get_hedger("pas", "h-held"), latency_seconds=0.01)
+    limiter = get_concurrency_limiter("pas")
+    assert limiter is not None
+    in_flight_seen = []
+
+    async def _send(*args, **kwargs):
+        in_flight_seen.append(limiter.in_flight)
+        await asyncio.sleep(10 if len(in_flight_seen) == 1 else 0)
+        return _Response(200, {"attempt": len(in_flight_seen)})
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    status, payload = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=10.0,
+        json_body={},
+        headers={},
+        upstream="pas",
+        idempotent=True,
+        endpoint="h-held",
+    )
+    await asyncio.sleep(0)
+    reset_hedgers()
+    reset_concurrency_limiters()
+
+    assert (status, payload) == (200, {"attempt": 2})
+    assert in_flight_seen == [1, 2]
+    assert limiter.in_flight == 0
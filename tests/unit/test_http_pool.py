@@ -0,0 +1,73 @@
+import pytest
+
+from app.clients import http_pool
+from app.clients.http_pool import (
+    build_upstream_limits,
+    close_upstream_clients,
+    get_upstream_client,
+    open_upstream_clients,
+    upstream_pool_stats,
+)
+from app.config import Settings
+
+
+def _settings(**overrides) -> Settings:
+    values = {
+        "UPSTREAM_POOL_MAX_CONNECTIONS": 12,
+        "UPSTREAM_POOL_MAX_KEEPALIVE_CONNECTIONS": 4,
+        "UPSTREAM_POOL_KEEPALIVE_EXPIRY_SECONDS": 7.5,
+    }
+    values.update(overrides)
+    return Settings(**values)
+
+
+def test_build_upstream_limits_uses_settings():
+    limits = build_upstream_limits(_settings())
+    assert limits.max_connections == 12
+    assert limits.max_keepalive_connections == 4
+    assert limits.keepalive_expiry == 7.5
+
+
+@pytest.mark.asyncio
+async def test_open_and_close_upstream_clients_lifecycle():
+    assert get_upstream_client("pas") is None
+
+    clients = open_upstream_clients(_settings())
+    assert set(clients) == {"pas", "pa", "risk"}
+    pas_client = get_upstream_client("pas")
+    assert pas_client is clients["pas"]
+
+    # Re-opening keeps the existing pooled clients.
+    open_upstream_clients(_settings())
+    assert get_upstream_client("pas") is pas_client
+
+    await close_upstream_clients()
+    assert get_upstream_client("pas") is None
+    assert pas_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_upstream_pool_stats_reports_configured_limits():
+    assert upstream_pool_stats("pa") == {}
+    open_upstream_clients(_settings())
+    try:
+        stats = upstream_pool_stats("pa")
+        assert stats["open"] == 0
+        assert stats["active"] == 0
+        assert stats["max_connections"] == 12
+    finally:
+        await close_upstream_clients()
+
+
+@pytest.mark.asyncio
+async def test_pool_collector_exports_per_upstream_gauges():
+    open_upstream_clients(_settings())
+    try:
+        families = {family.name: family for family in http_pool._UpstreamPoolCollector().collect()}
+    finally:
+        await close_upstream_clients()
+
+    connection_samples = families["lotus_report_upstream_pool_connections"].samples
+    assert {sample.labels["upstream"] for sample in connection_samples} == {"pas", "pa", "risk"}
+    max_samples = families["lotus_report_upstream_pool_max_connections"].samples
+    assert all(sample.value == 12 for sample in max_samples)
@@ -1,9 +1,15 @@
 import json as jsonlib
+import time
 
 import httpx
 import pytest
 
-from app.clients.http_resilience import post_with_retry, response_payload
+from app.clients.http_resilience import (
+    DEADLINE_EXCEEDED_DETAIL,
+    post_with_retry,
+    response_payload,
+)
+from app.observability import DEADLINE_HEADER, deadline_var
 
 
 class _FlakyAsyncClient:
@@ -112,3 +118,109 @@ def test_response_payload_maps_non_dict_and_text_fallback():
         request=httpx.Request("POST", "http://test"),
     )
     assert response_payload(non_json) == {"detail": "bad upstream"}
+
+
+class _SharedAsyncClient:
+    def __init__(self):
+        self.calls: list[dict] = []
+
+    async def post(self, url: str, json=None, headers=None, timeout=None):
+        self.calls.append({"url": url, "json": json, "headers": headers, "timeout": timeout})
+        return httpx.Response(
+            status_code=200,
+            content=jsonlib.dumps({"pooled": True}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            request=httpx.Request("POST", url),
+        )
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_uses_shared_upstream_client(monkeypatch):
+    shared = _SharedAsyncClient()
+    monkeypatch.setattr(
+        "app.clients.http_resilience.get_upstream_client",
+        lambda upstream: shared if upstream == "pas" else None,
+    )
+    monkeypatch.setattr("httpx.AsyncClient", _AlwaysTimeoutAsyncClient)
+
+    status, payload = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=1.5,
+        json_body={"asOfDate": "2026-02-25"},
+        headers={},
+        max_retries=0,
+        backoff_seconds=0.0,
+        upstream="pas",
+    )
+
+    assert status == 200
+    assert payload == {"pooled": True}
+    assert shared.calls[0]["timeout"] == 1.5
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_caps_timeout_and_propagates_remaining_deadline(monkeypatch):
+    shared = _SharedAsyncClient()
+    monkeypatch.setattr("app.clients.http_resilience.get_upstream_client", lambda upstream: shared)
+    token = deadline_var.set(time.monotonic() + 0.5)
+    try:
+        status, _ = await post_with_retry(
+            url="http://pas/portfolios/P1/summary",
+            timeout_seconds=10.0,
+            json_body={},
+            headers={"X-Correlation-Id": "corr-1"},
+            upstream="pas",
+        )
+    finally:
+        deadline_var.reset(token)
+
+    assert status == 200
+    assert shared.calls[0]["timeout"] <= 0.5
+    assert 0 < int(shared.calls[0]["headers"][DEADLINE_HEADER]) <= 500
+    assert shared.calls[0]["headers"]["X-Correlation-Id"] == "corr-1"
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_skips_upstream_when_deadline_spent(monkeypatch):
+    shared = _SharedAsyncClient()
+    monkeypatch.setattr("app.clients.http_resilience.get_upstream_client", lambda upstream: shared)
+    token = deadline_var.set(time.monotonic() - 1.0)
+    try:
+        status, payload = await post_with_retry(
+            url="http://pas/portfolios/P1/summary",
+            timeout_seconds=10.0,
+            json_body={},
+            headers={},
+            upstream="pas",
+        )
+    finally:
+        deadline_var.reset(token)
+
+    assert status == 504
+    assert payload == {"detail": DEADLINE_EXCEEDED_DETAIL}
+    assert shared.calls == []
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_does_not_sleep_past_deadline(monkeypatch):
+    monkeypatch.setattr("httpx.AsyncClient", _FlakyAsyncClient)
+    monkeypatch.setattr(
+        "app.clients.http_resilience.full_jitter_backoff", lambda base, attempt, cap: 10.0
+    )
+    _FlakyAsyncClient.attempts = 0
+    token = deadline_var.set(time.monotonic() + 5.0)
+    try:
+        status, payload = await post_with_retry(
+            url="http://pas/portfolios/P1/review",
+            timeout_seconds=1.0,
+            json_body={},
+            headers={},
+            max_retries=2,
+            backoff_seconds=10.0,
+        )
+    finally:
+        deadline_var.reset(token)
+
+    assert status == 504
+    assert payload == {"detail": DEADLINE_EXCEEDED_DETAIL}
+    assert _FlakyAsyncClient.attempts == 1
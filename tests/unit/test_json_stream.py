@@ -0,0 +1,173 @@
+import json as jsonlib
+
+import pytest
+
+from app.clients.http_resilience import post_with_retry
+from app.clients.json_stream import JsonStreamDecoder, decode_json_stream
+from app.clients.pas_client import core_snapshot_keep_spec
+
+_SNAPSHOT = {
+    "portfolioId": "P1",
+    "asOfDate": "2026-02-24",
+    "snapshot": {
+        "overview": {"total_market_value": 1_000_000.0, "name": 'quote " and \\ brace }'},
+        "holdings": {
+            "holdingsByAssetClass": {"Equity": [{"id": i, "tags": ["a{", "]"]} for i in range(50)]}
+        },
+        "transactions": {"transactionsByAssetClass": {"Equity": [[1, 2], {"x": None}]}},
+        "allocation": [],
+    },
+    "flags": [True, False, None, -1.5e3],
+}
+
+
+def _decode(document: bytes, keep, chunk_size: int):
+    decoder = JsonStreamDecoder(keep)
+    for index in range(0, len(document), chunk_size):
+        decoder.feed(document[index : index + chunk_size])
+    return decoder.close()
+
+
+@pytest.mark.parametrize("keep", [None, {"*": None}])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 64, 1 << 20])
+def test_decoder_keeping_everything_matches_json_loads(keep, chunk_size):
+    document = jsonlib.dumps(_SNAPSHOT, ensure_ascii=False).encode("utf-8")
+    assert _decode(document, keep, chunk_size) == _SNAPSHOT
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 20])
+def test_decoder_prunes_members_outside_keep_spec(chunk_size):
+    document = jsonlib.dumps(_SNAPSHOT, indent=2).encode("utf-8")
+    keep = {"*": None, "snapshot": {"overview": None, "allocation": None}}
+
+    decoded = _decode(document, keep, chunk_size)
+
+    assert decoded == {
+        "portfolioId": "P1",
+        "asOfDate": "2026-02-24",
+        "snapshot": {
+            "overview": _SNAPSHOT["snapshot"]["overview"],
+            "allocation": [],
+        },
+        "flags": [True, False, None, -1500.0],
+    }
+
+
+def test_decoder_handles_scalars_unicode_and_escaped_keys():
+    assert _decode(b" 42 ", {}, 1) == 42
+    assert _decode(b"null", {}, 2) is None
+    assert _decode('{"na\\"me": "Zürich €"}'.encode("utf-8"), {'na"me': None}, 1) == {
+        'na"me': "Zürich €"
+    }
+
+
+@pytest.mark.parametrize(
+    "document",
+    [b"", b"{", b'{"a" 1}', b'{"a": 1,}', b'{"a": 1} {}', b'{"a": tru}', b"[1, 2"],
+)
+@pytest.mark.parametrize("keep", [None, {"*": None}])
+def test_decoder_rejects_malformed_documents(document, keep):
+    with pytest.raises(ValueError):
+        _decode(document, keep, 2)
+
+
+def test_core_snapshot_keep_spec_maps_sections():
+    assert core_snapshot_keep_spec(["OVERVIEW", "HOLDINGS"]) == {
+        "*": None,
+        "snapshot": {"overview": None, "holdings": None},
+    }
+    assert core_snapshot_keep_spec(["OVERVIEW", "UNKNOWN"]) is None
+
+
+@pytest.mark.asyncio
+async def test_decode_json_stream_consumes_async_chunks():
+    async def _chunks():
+        yield b'{"snapshot": {"overview": {"a": 1}, '
+        yield b'"holdings": {"big": [1, 2, 3]}}}'
+
+    decoded = await decode_json_stream(_chunks(), {"snapshot": {"overview": None}})
+    assert decoded == {"snapshot": {"overview": {"a": 1}}}
+
+
+class _StreamingResponse:
+    def __init__(self, status_code: int, chunks: list[bytes]):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json"}
+        self._chunks = chunks
+        self.closed = False
+        self.content = b"".join(chunks)
+
+    async def aiter_bytes(self):
+        for chunk in self._chunks:
+            yield chunk
+
+    async def aread(self):
+        return self.content
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    async def aclose(self):
+        self.closed = True
+
+
+class _StreamingClient:
+    def __init__(self, response: _StreamingResponse):
+        self.response = response
+        self.sent: list[dict] = []
+
+    def build_request(self, method, url, json=None, headers=None, timeout=None):
+        return {"method": method, "url": url, "json": json, "timeout": timeout}
+
+    async def send(self, request, stream=False):
+        self.sent.append({**request, "stream": stream})
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_stream_decodes_kept_sections(monkeypatch):
+    document = jsonlib.dumps(_SNAPSHOT).encode("utf-8")
+    chunks = [document[index : index + 100] for index in range(0, len(document), 100)]
+    response = _StreamingResponse(200, chunks)
+    client = _StreamingClient(response)
+    monkeypatch.setattr("app.clients.http_resilience.get_upstream_client", lambda upstream: client)
+
+    status, payload = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=1.0,
+        json_body={},
+        headers={},
+        upstream="pas-stream-test",
+        stream_decode=True,
+        keep=core_snapshot_keep_spec(["OVERVIEW"]),
+    )
+
+    assert status == 200
+    assert payload["snapshot"] == {"overview": _SNAPSHOT["snapshot"]["overview"]}
+    assert client.sent[0]["stream"] is True
+    assert response.closed is True
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_stream_reads_error_bodies_whole(monkeypatch):
+    response = _StreamingResponse(404, [b'{"detail": "Portfolio ', b'not found"}'])
+    monkeypatch.setattr(
+        "app.clients.http_resilience.get_upstream_client",
+        lambda upstream: _StreamingClient(response),
+    )
+
+    status, payload = await post_with_retry(
+        url="http://pas/integration/portfolios/P1/core-snapshot",
+        timeout_seconds=1.0,
+        json_body={},
+        headers={},
+        upstream="pas-stream-test",
+        stream_decode=True,
+    )
+
+    assert (status, payload) == (404, {"detail": "Portfolio not found"})
+    assert response.closed is True
@@ -0,0 +1,150 @@
+import pytest
+from fastapi import HTTPException
+
+from app.analytics.return_index import ReturnIndex, ReturnIndexCache
+from app.services.lookback_planner import LookbackPlan, plan_lookback
+from app.services.reporting_read_service import ReportingReadService
+
+
+def test_plan_lookback_covers_the_earliest_requested_period():
+    assert plan_lookback("2026-02-24", [{"type": "YTD"}], 1200) == LookbackPlan("2026-01-01", 55)
+    risk_periods = [{"type": "YTD"}, {"type": "THREE_YEAR"}]
+    assert plan_lookback("2026-02-24", risk_periods, 1200) == LookbackPlan("2023-02-25", 1096)
+    assert plan_lookback(
+        "2026-02-24", [{"type": "EXPLICIT", "start_date": "2025-06-30"}], 1200
+    ) == LookbackPlan("2025-06-30", 240)
+    assert plan_lookback("2026-02-24", [{"type": "SI"}], 1200) == LookbackPlan(
+        "2022-11-13", 1200, clamped=True
+    )
+    assert plan_lookback("2026-02-24", [{"type": "THREE_YEAR"}], 400) == LookbackPlan(
+        "2025-01-21", 400, clamped=True
+    )
+    assert plan_lookback("2026-02-24", [], 1200) == LookbackPlan("2026-02-24", 1)
+
+
+def test_return_index_cache_only_serves_windows_it_covers():
+    cache = ReturnIndexCache(ttl_seconds=60.0, max_entries=8)
+    index = ReturnIndex.from_returns([])
+    cache.store("P1", "2026-02-24", [], index, "2026-01-01")
+
+    assert cache.get("P1", "2026-02-24", "2026-02-01") is not None
+    assert cache.get("P1", "2026-02-24", "2023-02-25") is None
+
+
+class _RecordingPasClient:
+    def __init__(self):
+        self.lookback_days: list[int] = []
+
+    async def get_core_snapshot(self, portfolio_id, as_of_date, include_sections):
+        return 200, {"snapshot": {"overview": {}}}
+
+    async def get_performance_input(self, portfolio_id, as_of_date, lookback_days=1200):
+        self.lookback_days.append(lookback_days)
+        points = [
+            {"perf_date": day, "begin_mv": 100.0, "end_mv": 101.0}
+            for day in ("2025-12-31", "2026-01-02", "2026-02-24")
+        ]
+        return 200, {"performanceStartDate": "2025-06-30", "valuationPoints": points}
+
+
+class _RecordingPaClient:
+    def __init__(self):
+        self.twr_payloads: list[dict] = []
+
+    async def calculate_twr(self, payload):
+        self.twr_payloads.append(payload)
+        daily = [
+            {"period": point["perf_date"], "summary": {"period_return_pct": 1.0}}
+            for point in payload["valuation_points"]
+        ]
+        return 200, {"results_by_period": {"EXPLICIT": {"breakdowns": {"daily": daily}}}}
+
+
+class _RecordingRiskClient:
+    def __init__(self):
+        self.payloads: list[dict] = []
+
+    async def calculate_risk(self, payload):
+        self.payloads.append(payload)
+        return 200, {"results": {"YTD": {"metrics": {}}}}
+
+
+@pytest.mark.asyncio
+async def test_ytd_only_review_reads_and_calculates_the_ytd_window(monkeypatch):
+    pas_client = _RecordingPasClient()
+    pa_client = _RecordingPaClient()
+    risk_client = _RecordingRiskClient()
+    service = ReportingReadService(
+        pas_client=pas_client, pa_client=pa_client, risk_client=risk_client
+    )
+
+    response = await service.get_portfolio_review(
+        "P1",
+        {"as_of_date": "2026-02-24", "sections": ["RISK_ANALYTICS"], "riskPeriods": ["ytd"]},
+        None,
+    )
+
+    assert response["sectionStatus"] == {"RISK_ANALYTICS": "COMPLETE"}
+    assert pas_client.lookback_days == [55]
+    assert pa_client.twr_payloads[0]["report_start_date"] == "2026-01-01"
+    assert pa_client.twr_payloads[0]["performance_start_date"] == "2025-06-30"
+    assert [point["perf_date"] for point in pa_client.twr_payloads[0]["valuation_points"]] == [
+        "2026-01-02",
+        "2026-02-24",
+    ]
+    assert risk_client.payloads[0]["periods"] == [{"type": "YTD"}]
+    assert list(risk_client.payloads[0]["returns"].dates()) == [
+        "2026-01-02",
+        "2026-02-24",
+    ]
+
+
+class _OldPortfolioPasClient(_RecordingPasClient):
+    async def get_performance_input(self, portfolio_id, as_of_date, lookback_days=1200):
+        self.lookback_days.append(lookback_days)
+        points = [
+            {"perf_date": day, "begin_mv": 100.0, "end_mv": 101.0}
+            for day in ("2022-11-14", "2024-06-03", "2026-01-02", "2026-02-24")
+        ]
+        return 200, {"performanceStartDate": "2018-01-01", "valuationPoints": points}
+
+
+@pytest.mark.asyncio
+async def test_review_does_not_serve_periods_from_a_truncated_window(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.reporting_read_service.settings.performance_input_max_lookback_days", 400
+    )
+    pas_client = _OldPortfolioPasClient()
+    risk_client = _RecordingRiskClient()
+    service = ReportingReadService(
+        pas_client=pas_client, pa_client=_RecordingPaClient(), risk_client=risk_client
+    )
+
+    response = await service.get_portfolio_review(
+        "P1",
+        {
+            "as_of_date": "2026-02-24",
+            "sections": ["PERIOD_RETURNS", "RISK_ANALYTICS"],
+            "returnPeriods": ["YTD", "FIVE_YEAR", "SI"],
+            "riskPeriods": ["YTD", "THREE_YEAR"],
+        },
+        None,
+    )
+
+    assert pas_client.lookback_days == [400]
+    assert [row["type"] for row in response["periodReturns"]] == ["YTD"]
+    assert risk_client.payloads[0]["periods"] == [{"type": "YTD"}]
+    assert response["sectionStatus"] == {
+        "RISK_ANALYTICS": "PARTIAL",
+        "PERIOD_RETURNS": "PARTIAL",
+    }
+
+
+def test_review_rejects_unsupported_risk_periods():
+    service = ReportingReadService(pas_client=object(), pa_client=object(), risk_client=object())
+
+    assert service._risk_periods({}) == ["YTD", "THREE_YEAR"]
+    for invalid in ([], ["SI"], "YTD"):
+        with pytest.raises(HTTPException) as exc:
+            service._risk_periods({"risk_periods": invalid})
+        assert exc.value.status_code == 422
@@ -0,0 +1,183 @@
+import asyncio
+import json as jsonlib
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.micro_batcher import MicroBatcher, reset_micro_batchers, split_batch_response
+from app.clients.risk_client import RiskClient
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class _RecordingBatch:
+    def __init__(self, supported: bool = True):
+        self.supported = supported
+        self.batches: list[list] = []
+
+    async def __call__(self, items):
+        self.batches.append(items)
+        if not self.supported:
+            return None
+        return [(200, {"portfolioId": item}) for item in items]
+
+
+def _single(portfolio_id: str, log: list[str], delay: float = 0.0):
+    async def call():
+        log.append(portfolio_id)
+        await asyncio.sleep(delay)
+        return 200, {"portfolioId": portfolio_id, "single": True}
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_sends_one_batch_and_fans_results_out():
+    batcher = MicroBatcher(endpoint="mb-batch", window_seconds=0.01)
+    batch = _RecordingBatch()
+    singles: list[str] = []
+
+    results = await asyncio.gather(
+        *(
+            batcher.load(portfolio_id, portfolio_id, _single(portfolio_id, singles), batch)
+            for portfolio_id in ("P1", "P2", "P3", "P2")
+        )
+    )
+
+    assert batch.batches == [["P1", "P2", "P3"]]
+    assert singles == []
+    assert [payload["portfolioId"] for _, payload in results] == ["P1", "P2", "P3", "P2"]
+    assert results[1] is results[3]
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_flushes_when_window_is_full():
+    batcher = MicroBatcher(endpoint="mb-full", window_seconds=10.0, max_batch_size=2)
+    batch = _RecordingBatch()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(
+                batcher.load(portfolio_id, portfolio_id, _single(portfolio_id, []), batch)
+                for portfolio_id in ("P1", "P2", "P3", "P4")
+            )
+        ),
+        timeout=1.0,
+    )
+
+    assert batch.batches == [["P1", "P2"], ["P3", "P4"]]
+    assert len(results) == 4
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_falls_back_to_bounded_parallel_single_calls():
+    batcher = MicroBatcher(endpoint="mb-fallback", window_seconds=0.01, max_parallel=2)
+    batch = _RecordingBatch(supported=False)
+    singles: list[str] = []
+    in_flight = 0
+    peak = 0
+
+    def _tracked(portfolio_id: str):
+        async def call():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            singles.append(portfolio_id)
+            return 200, {"portfolioId": portfolio_id}
+
+        return call
+
+    parallel_before = _sample(
+        "lotus_report_upstream_micro_batches_total",
+        {"endpoint": "mb-fallback", "mode": "parallel"},
+    )
+    first = await asyncio.gather(
+        *(batcher.load(pid, pid, _tracked(pid), batch) for pid in ("P1", "P2", "P3", "P4"))
+    )
+    second = await asyncio.gather(
+        *(batcher.load(pid, pid, _tracked(pid), batch) for pid in ("P5", "P6"))
+    )
+
+    assert len(batch.batches) == 1
+    assert sorted(singles) == ["P1", "P2", "P3", "P4", "P5", "P6"]
+    assert peak == 2
+    assert [payload["portfolioId"] for _, payload in first + second] == [
+        "P1",
+        "P2",
+        "P3",
+        "P4",
+        "P5",
+        "P6",
+    ]
+    assert (
+        _sample(
+            "lotus_report_upstream_micro_batches_total",
+            {"endpoint": "mb-fallback", "mode": "parallel"},
+        )
+        - parallel_before
+        == 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_micro_batcher_propagates_batch_errors_to_every_caller():
+    batcher = MicroBatcher(endpoint="mb-error", window_seconds=0.01)
+
+    async def _failing_batch(items):
+        raise RuntimeError("batch failed")
+
+    results = await asyncio.gather(
+        *(batcher.load(pid, pid, _single(pid, []), _failing_batch) for pid in ("P1", "P2")),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_split_batch_response_maps_results_and_failures():
+    payload = {"results": [{"status": 200, "body": {"a": 1}}, {"status": 404, "body": "gone"}]}
+    assert split_batch_response(200, payload, 2) == [(200, {"a": 1}), (404, {"detail": "gone"})]
+    assert split_batch_response(404, {"detail": "no route"}, 2) is None
+    assert split_batch_response(503, {"detail": "down"}, 2) == [(503, {"detail": "down"})] * 2
+    assert split_batch_response(200, {"results": []}, 2)[0][0] == 502
+
+
+@pytest.mark.asyncio
+async def test_risk_client_batches_concurrent_calculations(monkeypatch):
+    reset_micro_batchers()
+    monkeypatch.setattr("app.clients.micro_batcher.settings.micro_batching_enabled", True)
+    monkeypatch.setattr("app.clients.micro_batcher.settings.micro_batch_window_seconds", 0.01)
+    monkeypatch.setattr(
+        "app.clients.risk_client.settings.risk_calculate_batch_path",
+        "/analytics/risk/calculate:batch",
+    )
+    requests: list[tuple[str, dict]] = []
+
+    async def _send(shared_client, url, timeout, json_body, headers, *args):
+        requests.append((url, json_body))
+        results = [{"status": 200, "body": {"echo": item["id"]}} for item in json_body["requests"]]
+        return httpx.Response(
+            status_code=200,
+            content=jsonlib.dumps({"results": results}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            request=httpx.Request("POST", url),
+        )
+
+    monkeypatch.setattr("app.clients.http_resilience._send", _send)
+    client = RiskClient(base_url="http://risk", timeout_seconds=1.0)
+
+    results = await asyncio.gather(
+        client.calculate_risk({"id": 1}),
+        client.calculate_risk({"id": 2}),
+    )
+    reset_micro_batchers()
+
+    assert results == [(200, {"echo": 1}), (200, {"echo": 2})]
+    assert requests == [
+        ("http://risk/analytics/risk/calculate:batch", {"requests": [{"id": 1}, {"id": 2}]})
+    ]
@@ -1,14 +1,18 @@
 import json
 import logging
+import time
 
 from fastapi import Request
 
 from app.observability import (
     JsonFormatter,
     correlation_id_var,
+    deadline_var,
     propagation_headers,
+    remaining_budget_seconds,
     request_id_var,
     resolve_correlation_id,
+    resolve_deadline,
     resolve_request_id,
     resolve_trace_id,
     setup_logging,
@@ -58,6 +62,43 @@ def test_resolve_trace_id_uses_x_trace_id_when_traceparent_malformed():
     assert resolve_trace_id(request) == "trace-x"
 
 
+def _request_for_path(path: str, headers: dict[str, str]) -> Request:
+    asgi_headers = [(k.lower().encode("utf-8"), v.encode("utf-8")) for k, v in headers.items()]
+    scope = {"type": "http", "path": path, "query_string": b"", "headers": asgi_headers}
+    return Request(scope)
+
+
+def test_resolve_deadline_uses_per_endpoint_default(monkeypatch):
+    monkeypatch.setattr("app.observability.settings.request_deadline_seconds", 15.0)
+    monkeypatch.setattr("app.observability.settings.review_request_deadline_seconds", 25.0)
+    now = time.monotonic()
+
+    review = resolve_deadline(_request_for_path("/reports/portfolios/P1/review", {}))
+    summary = resolve_deadline(_request_for_path("/reports/portfolios/P1/summary", {}))
+
+    assert 24.0 < review - now <= 25.5
+    assert 14.0 < summary - now <= 15.5
+    assert resolve_deadline(_request_for_path("/health", {})) is None
+
+
+def test_resolve_deadline_honours_shorter_incoming_header():
+    now = time.monotonic()
+    request = _request_for_path("/reports/portfolios/P1/review", {"X-Request-Timeout-Ms": "2000"})
+    assert 1.0 < resolve_deadline(request) - now <= 2.5
+
+    malformed = _request_for_path("/health", {"X-Request-Timeout-Ms": "soon"})
+    assert resolve_deadline(malformed) is None
+
+
+def test_remaining_budget_seconds_reads_deadline_context():
+    assert remaining_budget_seconds() is None
+    token = deadline_var.set(time.monotonic() - 1.0)
+    try:
+        assert remaining_budget_seconds() == 0.0
+    finally:
+        deadline_var.reset(token)
+
+
 def test_propagation_headers_include_context_values():
     correlation_id_var.set("corr-ctx")
     request_id_var.set("req-ctx")
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from fastapi import HTTPException
 
@@ -179,6 +181,35 @@ async def test_review_composes_pas_pa_and_risk():
     assert response["holdings"]["holdingsByAssetClass"] is not None
 
 
+@pytest.mark.asyncio
+async def test_review_stream_yields_sections_that_merge_into_the_review():
+    service = ReportingReadService(
+        pas_client=_PasClientSuccess(),
+        pa_client=_PaClientSuccess(),
+        risk_client=_RiskClientSuccess(),
+    )
+    request = {
+        "as_of_date": "2026-02-24",
+        "sections": ["OVERVIEW", "PERFORMANCE", "RISK_ANALYTICS", "HOLDINGS"],
+    }
+
+    fragments = [
+        fragment async for fragment in service.stream_portfolio_review("P1", request, None)
+    ]
+
+    assert fragments[0] == {"portfolio_id": "P1", "as_of_date": "2026-02-24"}
+    assert [list(fragment) for fragment in fragments[1:3]] == [["overview"], ["holdings"]]
+    assert sorted(key for fragment in fragments[3:5] for key in fragment) == [
+        "performance",
+        "riskAnalytics",
+    ]
+    assert list(fragments[-1]) == ["sectionStatus"]
+    merged: dict[str, object] = {}
+    for fragment in fragments:
+        merged.update(fragment)
+    assert merged == await service.get_portfolio_review("P1", request, None)
+
+
 @pytest.mark.asyncio
 async def test_review_sets_performance_none_when_pa_unavailable():
     service = ReportingReadService(
@@ -231,3 +262,180 @@ async def test_pas_failure_maps_to_502():
     with pytest.raises(HTTPException) as exc:
         await service.get_portfolio_review("P1", {"as_of_date": "2026-02-24"}, None)
     assert exc.value.status_code == 502
+
+
+class _PasClientSlowNotFound(_PasClientNotFound):
+    async def get_core_snapshot(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        include_sections: list[str],
+    ):
+        await asyncio.sleep(0.01)
+        return 404, {"detail": "Portfolio not found"}
+
+
+class _PaClientBlocking:
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def get_pas_input_twr(self, portfolio_id: str, as_of_date: str, periods: list[str]):
+        self.started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return 200, {"resultsByPeriod": {}}
+
+
+@pytest.mark.asyncio
+async def test_review_core_snapshot_not_found_cancels_in_flight_performance_call():
+    pa_client = _PaClientBlocking()
+    service = ReportingReadService(
+        pas_client=_PasClientSlowNotFound(),
+        pa_client=pa_client,
+        risk_client=_RiskClientSuccess(),
+    )
+    with pytest.raises(HTTPException) as exc:
+        await service.get_portfolio_review(
+            "P404",
+            {"as_of_date": "2026-02-24", "sections": ["OVERVIEW", "PERFORMANCE"]},
+            None,
+        )
+    assert exc.value.status_code == 404
+    assert pa_client.started.is_set()
+    assert pa_client.cancelled is True
+
+
+class _PasClientWaitsForPerformance(_PasClientSuccess):
+    def __init__(self, performance_started: asyncio.Event):
+        self._performance_started = performance_started
+
+    async def get_core_snapshot(
+        self,
+        portfolio_id: str,
+        as_of_date: str,
+        include_sections: list[str],
+    ):
+        await asyncio.wait_for(self._performance_started.wait(), timeout=1.0)
+        return await super().get_core_snapshot(portfolio_id, as_of_date, include_sections)
+
+
+class _PaClientSignalsStart(_PaClientSuccess):
+    def __init__(self, performance_started: asyncio.Event):
+        self._performance_started = performance_started
+
+    async def get_pas_input_twr(self, portfolio_id: str, as_of_date: str, periods: list[str]):
+        self._performance_started.set()
+        return await super().get_pas_input_twr(portfolio_id, as_of_date, periods)
+
+
+@pytest.mark.asyncio
+async def test_review_fetches_core_snapshot_and_performance_concurrently():
+    performance_started = asyncio.Event()
+    service = ReportingReadService(
+        pas_client=_PasClientWaitsForPerformance(performance_started),
+        pa_client=_PaClientSignalsStart(performance_started),
+        risk_client=_RiskClientSuccess(),
+    )
+    response = await service.get_portfolio_review(
+        "P1",
+        {"as_of_date": "2026-02-24", "sections": ["OVERVIEW", "PERFORMANCE", "RISK_ANALYTICS"]},
+        None,
+    )
+    assert response["overview"]["total_market_value"] == 1_000_000.0
+    assert "YTD" in response["performance"]["summary"]
+    assert "YTD" in response["riskAnalytics"]["results"]
+
+
+class _RiskClientSlow:
+    async def calculate_risk(self, payload: dict[str, object]):
+        await asyncio.sleep(5)
+        return 200, {"results": {}}
+
+
+class _PaClientPerformanceUnavailable(_PaClientSuccess):
+    async def get_pas_input_twr(self, portfolio_id: str, as_of_date: str, periods: list[str]):
+        return 503, {"detail": "upstream unavailable"}
+
+
+@pytest.mark.asyncio
+async def test_review_marks_sections_that_miss_their_budget(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.reporting_read_service.settings.review_section_budget_seconds", 0.05
+    )
+    service = ReportingReadService(
+        pas_client=_PasClientSuccess(),
+        pa_client=_PaClientPerformanceUnavailable(),
+        risk_client=_RiskClientSlow(),
+    )
+    response = await service.get_portfolio_review(
+        "P1",
+        {"as_of_date": "2026-02-24", "sections": ["OVERVIEW", "PERFORMANCE", "RISK_ANALYTICS"]},
+        None,
+    )
+
+    assert response["overview"]["total_market_value"] == 1_000_000.0
+    assert response["performance"] is None
+    assert response["riskAnalytics"] is None
+    assert response["sectionStatus"] == {
+        "PERFORMANCE": "UNAVAILABLE",
+        "RISK_ANALYTICS": "DEADLINE_EXCEEDED",
+    }
+
+
+@pytest.mark.asyncio
+async def test_review_reports_complete_sections():
+    service = ReportingReadService(
+        pas_client=_PasClientSuccess(),
+        pa_client=_PaClientSuccess(),
+        risk_client=_RiskClientSuccess(),
+    )
+    response = await service.get_portfolio_review(
+        "P1", {"as_of_date": "2026-02-24", "sections": ["OVERVIEW", "PERFORMANCE"]}, None
+    )
+    assert response["sectionStatus"] == {"PERFORMANCE": "COMPLETE"}
+
+
+@pytest.mark.asyncio
+async def test_review_core_snapshot_deadline_maps_to_gateway_timeout():
+    class _PasClientDeadline(_PasClientSuccess):
+        async def get_core_snapshot(self, portfolio_id, as_of_date, include_sections):
+            return 504, {"detail": "upstream call skipped: request deadline exceeded"}
+
+    service = ReportingReadService(
+        pas_client=_PasClientDeadline(),
+        pa_client=_PaClientSuccess(),
+        risk_client=_RiskClientSuccess(),
+    )
+    with pytest.raises(HTTPException) as exc:
+        await service.get_portfolio_review("P1", {"as_of_date": "2026-02-24"}, None)
+    assert exc.value.status_code == 504
+
+
+class _RecordingRiskClient:
+    def __init__(self):
+        self.payloads: list[dict[str, object]] = []
+
+    async def calculate_risk(self, payload: dict[str, object]):
+        self.payloads.append(payload)
+        return 200, {"results": {"YTD": {"metrics": {}}}}
+
+
+@pytest.mark.asyncio
+async def test_review_sends_lotus_performance_daily_returns_to_risk():
+    risk_client = _RecordingRiskClient()
+    service = ReportingReadService(
+        pas_client=_PasClientSuccess(),
+        pa_client=_PaClientSuccess(),
+        risk_client=risk_client,
+    )
+    response = await service.get_portfolio_review(
+        "P1",
+        {"as_of_date": "2026-02-24", "sections": ["RISK_ANALYTICS"]},
+        None,
+    )
+    assert response["riskAnalytics"] == {"results": {"YTD": {"metrics": {}}}}
+    assert risk_client.payloads[0]["returns"].to_rows() == [{"date": "2025-01-02", "value": 1.0}]
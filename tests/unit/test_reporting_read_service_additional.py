@@ -258,70 +258,72 @@ class _RiskStatusError(_RiskSuccess):
         return 500, {"detail": "risk failed"}
 
 
+async def _assert_risk_section_unavailable(service: ReportingReadService) -> None:
+    response = await service.get_portfolio_review(
+        "P1", {"as_of_date": "2026-02-24", "sections": ["RISK_ANALYTICS"]}, None
+    )
+    assert response["riskAnalytics"] is None
+    assert response["sectionStatus"] == {"RISK_ANALYTICS": "UNAVAILABLE"}
+
+
 @pytest.mark.asyncio
-async def test_build_risk_analytics_returns_none_on_performance_input_failure():
+async def test_review_risk_section_returns_none_on_performance_input_failure():
     service = ReportingReadService(
         pas_client=_PasPerfStatusError(),
         pa_client=_PaSuccessEmpty(),
         risk_client=_RiskSuccess(),
     )
-    result = await service._build_risk_analytics("P1", "2026-02-24")
-    assert result is None
+    await _assert_risk_section_unavailable(service)
 
 
 @pytest.mark.asyncio
-async def test_build_risk_analytics_returns_none_on_invalid_valuation_points():
+async def test_review_risk_section_returns_none_on_invalid_valuation_points():
     service = ReportingReadService(
         pas_client=_PasPerfInvalidPoints(),
         pa_client=_PaSuccessEmpty(),
         risk_client=_RiskSuccess(),
     )
-    result = await service._build_risk_analytics("P1", "2026-02-24")
-    assert result is None
+    await _assert_risk_section_unavailable(service)
 
 
 @pytest.mark.asyncio
-async def test_build_risk_analytics_returns_none_on_invalid_performance_start_date():
+async def test_review_risk_section_returns_none_on_invalid_performance_start_date():
     service = ReportingReadService(
         pas_client=_PasPerfInvalidStart(),
         pa_client=_PaSuccessEmpty(),
         risk_client=_RiskSuccess(),
     )
-    result = await service._build_risk_analytics("P1", "2026-02-24")
-    assert result is None
+    await _assert_risk_section_unavailable(service)
 
 
 @pytest.mark.asyncio
-async def test_build_risk_analytics_returns_none_when_twr_call_fails():
+async def test_review_risk_section_returns_none_when_twr_call_fails():
     service = ReportingReadService(
         pas_client=_PasSuccessMinimal(),
         pa_client=_PaTwrStatusError(),
         risk_client=_RiskSuccess(),
     )
-    result = await service._build_risk_analytics("P1", "2026-02-24")
-    assert result is None
+    await _assert_risk_section_unavailable(service)
 
 
 @pytest.mark.asyncio
-async def test_build_risk_analytics_returns_none_when_daily_returns_empty():
+async def test_review_risk_section_returns_none_when_daily_returns_empty():
     service = ReportingReadService(
         pas_client=_PasSuccessMinimal(),
         pa_client=_PaTwrNoReturns(),
         risk_client=_RiskSuccess(),
     )
-    result = await service._build_risk_analytics("P1", "2026-02-24")
-    assert result is None
+    await _assert_risk_section_unavailable(service)
 
 
 @pytest.mark.asyncio
-async def test_build_risk_analytics_returns_none_when_risk_call_fails():
+async def test_review_risk_section_returns_none_when_risk_call_fails():
     service = ReportingReadService(
         pas_client=_PasSuccessMinimal(),
         pa_client=_PaSuccessEmpty(),
         risk_client=_RiskStatusError(),
     )
-    result = await service._build_risk_analytics("P1", "2026-02-24")
-    assert result is None
+    await _assert_risk_section_unavailable(service)
 
 
 def test_extract_daily_returns_skips_invalid_items():
@@ -345,4 +347,4 @@ def test_extract_daily_returns_skips_invalid_items():
         }
     }
     returns = service._extract_daily_returns_from_twr(twr_payload)
-    assert returns == [{"date": "2025-01-04", "value": 0.4}]
+    assert returns.to_rows() == [{"date": "2025-01-04", "value": 0.4}]
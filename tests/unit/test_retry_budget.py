@@ -0,0 +1,155 @@
+import json as jsonlib
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.http_resilience import post_with_retry
+from app.clients.retry_budget import (
+    RetryBudget,
+    full_jitter_backoff,
+    parse_retry_after,
+    reset_retry_budgets,
+)
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _response(status_code: int, headers: dict[str, str] | None = None) -> httpx.Response:
+    return httpx.Response(
+        status_code=status_code,
+        content=jsonlib.dumps({"status": status_code}).encode("utf-8"),
+        headers={"Content-Type": "application/json", **(headers or {})},
+        request=httpx.Request("POST", "http://test"),
+    )
+
+
+class _ScriptedSend:
+    def __init__(self, *outcomes):
+        self._outcomes = list(outcomes)
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+        outcome = self._outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def test_retry_budget_caps_retries_to_fraction_of_successes():
+    budget = RetryBudget(upstream="rb-test", ratio=0.5, max_tokens=2.0)
+    exhausted_before = _sample(
+        "lotus_report_upstream_retry_budget_exhausted_total", {"upstream": "rb-test"}
+    )
+    assert budget.try_withdraw() is True
+    assert budget.try_withdraw() is True
+    assert budget.try_withdraw() is False
+
+    budget.record_success()
+    budget.record_success()
+    assert budget.try_withdraw() is True
+    assert (
+        _sample("lotus_report_upstream_retry_budget_exhausted_total", {"upstream": "rb-test"})
+        - exhausted_before
+        == 1
+    )
+
+
+def test_full_jitter_backoff_stays_within_capped_window():
+    delays = [full_jitter_backoff(0.2, 5, cap_seconds=1.0) for _ in range(100)]
+    assert all(0.0 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:05 GMT", now=1445412480.0) == 5.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:05 GMT", now=1445412490.0) == 0.0
+    assert parse_retry_after("later") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_honours_retry_after(monkeypatch):
+    reset_retry_budgets()
+    sleeps: list[float] = []
+
+    async def _sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    send = _ScriptedSend(_response(503, {"Retry-After": "2"}), _response(200))
+    monkeypatch.setattr("app.clients.http_resilience._send", send)
+    monkeypatch.setattr("app.clients.http_resilience.asyncio.sleep", _sleep)
+    retries_before = _sample(
+        "lotus_report_upstream_retries_total", {"upstream": "rb-pa", "trigger": "retry_after"}
+    )
+
+    status, payload = await post_with_retry(
+        url="http://pa/performance/twr",
+        timeout_seconds=1.0,
+        json_body={},
+        headers={},
+        upstream="rb-pa",
+    )
+    reset_retry_budgets()
+
+    assert (status, payload) == (200, {"status": 200})
+    assert send.calls == 2
+    assert sleeps == [2]
+    assert (
+        _sample(
+            "lotus_report_upstream_retries_total", {"upstream": "rb-pa", "trigger": "retry_after"}
+        )
+        - retries_before
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_returns_response_when_retry_after_too_long(monkeypatch):
+    send = _ScriptedSend(_response(429, {"Retry-After": "600"}))
+    monkeypatch.setattr("app.clients.http_resilience._send", send)
+
+    status, _ = await post_with_retry(
+        url="http://pa/performance/twr",
+        timeout_seconds=1.0,
+        json_body={},
+        headers={},
+        upstream="rb-pa",
+    )
+    assert status == 429
+    assert send.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_post_with_retry_stops_retrying_when_budget_spent(monkeypatch):
+    reset_retry_budgets()
+    monkeypatch.setattr("app.clients.retry_budget.settings.retry_budget_max_tokens", 1.0)
+    monkeypatch.setattr("app.clients.http_resilience.full_jitter_backoff", lambda *args: 0.0)
+    send = _ScriptedSend(
+        httpx.ConnectError("down"),
+        httpx.ConnectError("down"),
+        httpx.ConnectError("down"),
+        httpx.ConnectError("down"),
+    )
+    monkeypatch.setattr("app.clients.http_resilience._send", send)
+
+    async def _call():
+        return await post_with_retry(
+            url="http://risk/analytics/risk/calculate",
+            timeout_seconds=1.0,
+            json_body={},
+            headers={},
+            max_retries=2,
+            upstream="rb-risk",
+        )
+
+    first = await _call()
+    second = await _call()
+    reset_retry_budgets()
+
+    assert first[0] == second[0] == 503
+    assert send.calls == 3
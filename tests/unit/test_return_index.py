@@ -0,0 +1,192 @@
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.analytics.return_index import ReturnIndex, ReturnIndexCache
+from app.analytics.twr import chain_link
+from app.precision_policy import quantize_performance
+from app.services.reporting_read_service import ReportingReadService
+
+_SERIES = [
+    ("2024-12-31", Decimal("2")),
+    ("2025-01-02", Decimal("1")),
+    ("2025-01-03", Decimal("-2")),
+    ("2025-02-03", Decimal("0.5")),
+    ("2026-02-02", Decimal("3")),
+    ("2026-02-24", Decimal("-1")),
+]
+
+
+def test_return_index_links_any_window_from_two_lookups():
+    index = ReturnIndex.from_returns(reversed(_SERIES))
+
+    for first in range(len(_SERIES)):
+        for last in range(first, len(_SERIES)):
+            window = [value for _, value in _SERIES[first : last + 1]]
+            cumulative = index.cumulative_return(_SERIES[first][0], _SERIES[last][0])
+            assert quantize_performance(cumulative) == chain_link(window)
+    assert index.cumulative_return("2025-01-04", "2025-01-31") is None
+    assert len(index) == 6
+    assert (index.first_date, index.last_date) == ("2024-12-31", "2026-02-24")
+
+
+def test_return_index_annualizes_periods_longer_than_a_year():
+    index = ReturnIndex.from_returns(_SERIES)
+
+    assert index.annualized_return("2025-01-02", "2025-02-03") == index.cumulative_return(
+        "2025-01-02", "2025-02-03"
+    )
+    annualized = index.annualized_return("2024-12-31", "2026-02-24")
+    cumulative = index.cumulative_return("2024-12-31", "2026-02-24")
+    growth = ((cumulative / 100 + 1) ** (Decimal(365) / 421) - 1) * 100
+    assert quantize_performance(annualized) == quantize_performance(growth)
+    assert annualized < cumulative
+
+    start, ytd, _ = index.period_returns("YTD", "2026-02-24")
+    assert (start, quantize_performance(ytd)) == ("2026-01-01", Decimal("1.970000"))
+    assert index.period_returns("SI", "2026-02-24") is None
+    assert index.period_returns("SI", "2026-02-24", inception_date="2024-12-31")[0] == "2024-12-31"
+    assert index.period_returns("EXPLICIT", "2025-01-03", "2025-01-02")[1] == Decimal("-1.02")
+    assert index.period_returns("MTD", "2025-12-31") is None
+
+
+def test_return_index_does_not_serve_periods_starting_before_its_window():
+    index = ReturnIndex.from_returns(_SERIES, covers_from="2024-12-01")
+
+    assert index.period_returns("SI", "2026-02-24", inception_date="2018-01-01") is None
+    assert index.period_returns("FIVE_YEAR", "2026-02-24", inception_date="2018-01-01") is None
+    assert index.period_returns("EXPLICIT", "2026-02-24", "2024-11-30") is None
+    # A portfolio younger than the period is covered from its inception.
+    start, cumulative, _ = index.period_returns("FIVE_YEAR", "2026-02-24", None, "2024-12-15")
+    assert start == "2024-12-15"
+    assert cumulative == index.cumulative_return("2024-12-31", "2026-02-24")
+
+
+def test_return_index_cache_expires_and_evicts():
+    now = [0.0]
+    cache = ReturnIndexCache(ttl_seconds=10.0, max_entries=2, clock=lambda: now[0])
+    index = ReturnIndex.from_returns(_SERIES)
+
+    cache.store("P1", "2026-02-24", [], index)
+    cache.store("P2", "2026-02-24", [], index)
+    cache.store("P3", "2026-02-24", [], index)
+    assert cache.get("P1", "2026-02-24") is None
+    assert cache.get("P3", "2026-02-24")[1] is index
+    now[0] = 10.0
+    assert cache.get("P3", "2026-02-24") is None
+    assert len(ReturnIndexCache(ttl_seconds=0.0, max_entries=2)) == 0
+
+
+class _PasClient:
+    async def get_core_snapshot(self, portfolio_id, as_of_date, include_sections):
+        return 200, {"snapshot": {"overview": {}}}
+
+    async def get_performance_input(self, portfolio_id, as_of_date, lookback_days=1200):
+        return 200, {"performanceStartDate": "2024-12-31", "valuationPoints": [{}]}
+
+
+class _PaClient:
+    def __init__(self):
+        self.twr_calls = 0
+
+    async def get_pas_input_twr(self, portfolio_id, as_of_date, periods):
+        raise AssertionError("period returns must not call lotus-performance per period")
+
+    async def calculate_twr(self, payload):
+        self.twr_calls += 1
+        daily = [
+            {"period": day, "summary": {"period_return_pct": float(value)}}
+            for day, value in _SERIES
+        ]
+        return 200, {"results_by_period": {"EXPLICIT": {"breakdowns": {"daily": daily}}}}
+
+
+@pytest.mark.asyncio
+async def test_review_serves_period_returns_from_the_cached_index(monkeypatch):
+    pa_client = _PaClient()
+    cache = ReturnIndexCache(ttl_seconds=60.0, max_entries=8)
+    request = {
+        "as_of_date": "2026-02-24",
+        "sections": ["PERIOD_RETURNS"],
+        "returnPeriods": ["YTD", {"type": "EXPLICIT", "startDate": "2025-01-02"}],
+    }
+
+    responses = []
+    for _ in range(2):
+        service = ReportingReadService(
+            pas_client=_PasClient(),
+            pa_client=pa_client,
+            risk_client=object(),
+            return_index_cache=cache,
+        )
+        responses.append(await service.get_portfolio_review("P1", request, None))
+
+    assert pa_client.twr_calls == 1
+    assert responses[0]["periodReturns"] == responses[1]["periodReturns"]
+    assert responses[0]["periodReturns"][0] == {
+        "type": "YTD",
+        "start_date": "2026-01-01",
+        "end_date": "2026-02-24",
+        "cumulative_return": 1.97,
+        "annualized_return": 1.97,
+    }
+    assert responses[0]["periodReturns"][1]["start_date"] == "2025-01-02"
+    assert responses[0]["sectionStatus"] == {"PERIOD_RETURNS": "COMPLETE"}
+
+
+def test_review_rejects_invalid_return_periods():
+    service = ReportingReadService(pas_client=object(), pa_client=object(), risk_client=object())
+
+    assert [period["type"] for period in service._return_periods({})] == [
+        "MTD",
+        "QTD",
+        "YTD",
+        "THREE_YEAR",
+        "SI",
+    ]
+    for invalid in ("YTD", ["DECADE"], [{"type": "EXPLICIT"}], [{"type": "YTD", "startDate": "x"}]):
+        with pytest.raises(HTTPException) as exc:
+            service._return_periods({"return_periods": invalid})
+        assert exc.value.status_code == 422
+
+
+class _OldPortfolioPasClient:
+    async def get_core_snapshot(self, portfolio_id, as_of_date, include_sections):
+        return 200, {"snapshot": {"overview": {}}}
+
+    async def get_performance_input(self, portfolio_id, as_of_date, lookback_days=1200):
+        points = [
+            {"perf_date": day, "begin_mv": 100.0, "end_mv": 101.0}
+            for day in ("2022-11-14", "2024-06-03", "2026-01-02", "2026-02-24")
+        ]
+        return 200, {"performanceStartDate": "2018-01-01", "valuationPoints": points}
+
+
+class _DailyPaClient:
+    async def calculate_twr(self, payload):
+        daily = [
+            {"period": point["perf_date"], "summary": {"period_return_pct": 1.0}}
+            for point in payload["valuation_points"]
+        ]
+        return 200, {"results_by_period": {"EXPLICIT": {"breakdowns": {"daily": daily}}}}
+
+
+@pytest.mark.asyncio
+async def test_review_skips_periods_older_than_the_lookback_window():
+    service = ReportingReadService(
+        pas_client=_OldPortfolioPasClient(), pa_client=_DailyPaClient(), risk_client=object()
+    )
+
+    response = await service.get_portfolio_review(
+        "P1",
+        {
+            "as_of_date": "2026-02-24",
+            "sections": ["PERIOD_RETURNS"],
+            "returnPeriods": ["YTD", "FIVE_YEAR", "SI"],
+        },
+        None,
+    )
+
+    assert [row["type"] for row in response["periodReturns"]] == ["YTD"]
+    assert response["periodReturns"][0]["start_date"] == "2026-01-01"
@@ -0,0 +1,39 @@
+from decimal import Decimal
+
+import pytest
+
+from app.analytics.return_series import ReturnSeries
+
+
+def test_return_series_reads_twr_daily_breakdown_in_one_pass():
+    series = ReturnSeries.from_twr_daily(
+        [
+            {"period": "2025-01-02", "summary": {"period_return_pct": 1}},
+            "bad",
+            {"period": "2025-01-03T00:00:00", "summary": {"period_return_pct": -0.25}},
+            {"period": "not-a-date", "summary": {"period_return_pct": 0.5}},
+            {"period": "2025-01-06", "summary": None},
+            {"period": "2025-01-07", "summary": {"period_return_pct": "0.5"}},
+        ]
+    )
+
+    assert len(series) == 2
+    assert series.to_rows() == [
+        {"date": "2025-01-02", "value": 1.0},
+        {"date": "2025-01-03", "value": -0.25},
+    ]
+    assert list(series.decimals()) == [
+        ("2025-01-02", Decimal("1.0")),
+        ("2025-01-03", Decimal("-0.25")),
+    ]
+
+
+def test_return_series_shares_its_buffers_read_only():
+    series = ReturnSeries.from_pairs([("2025-01-02", Decimal("1.25")), ("2025-01-03", 0.5)])
+
+    assert series.values.tolist() == [1.25, 0.5]
+    assert series.ordinals.format == "l"
+    assert list(series.dates()) == ["2025-01-02", "2025-01-03"]
+    with pytest.raises(TypeError):
+        series.values[0] = 2.0
+    assert not ReturnSeries()
@@ -0,0 +1,134 @@
+import json as jsonlib
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.pa_client import PaClient
+from app.clients.pas_client import PasClient
+from app.clients.revalidation_cache import RevalidationCache
+
+
+def _sample(name: str, labels: dict[str, str]) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class _ConditionalUpstream:
+    """Answers like an upstream honouring ``If-None-Match`` / ``If-Modified-Since``."""
+
+    def __init__(self, body: dict, etag: str | None = None, last_modified: str | None = None):
+        self.body = jsonlib.dumps(body).encode("utf-8")
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests: list[dict[str, str]] = []
+
+    async def __call__(self, shared_client, url, timeout, json_body, headers, *args):
+        self.requests.append(headers)
+        validators = {"Content-Type": "application/json"}
+        if self.etag:
+            validators["ETag"] = self.etag
+        if self.last_modified:
+            validators["Last-Modified"] = self.last_modified
+        not_modified = (self.etag and headers.get("If-None-Match") == self.etag) or (
+            self.last_modified and headers.get("If-Modified-Since") == self.last_modified
+        )
+        return httpx.Response(
+            status_code=304 if not_modified else 200,
+            content=b"" if not_modified else self.body,
+            headers=validators,
+            request=httpx.Request("POST", url),
+        )
+
+
+def test_revalidation_cache_requires_validators_and_respects_bounds():
+    cache = RevalidationCache(max_entries=2, max_bytes=100)
+    cache.store("no-validators", {"a": 1}, None, None, 10)
+    assert cache.get("no-validators") is None
+
+    cache.store("a", {"a": 1}, '"v1"', None, 40)
+    cache.store("b", {"b": 1}, '"v1"', None, 40)
+    cache.store("c", {"c": 1}, '"v1"', None, 40)
+    assert cache.get("a") is None
+    assert len(cache) == 2
+
+    cache.store("d", {"d": 1}, None, "Tue, 24 Feb 2026 00:00:00 GMT", 90)
+    assert cache.get("d") is not None
+    assert len(cache) == 1
+
+    cache.store("too-big", {"e": 1}, '"v1"', None, 101)
+    assert cache.get("too-big") is None
+
+
+@pytest.mark.asyncio
+async def test_pas_client_reuses_cached_performance_input_on_304(monkeypatch):
+    upstream = _ConditionalUpstream({"valuationPoints": [1, 2, 3]}, etag='"pi-v1"')
+    monkeypatch.setattr("app.clients.http_resilience._send", upstream)
+    client = PasClient(
+        base_url="http://pas",
+        timeout_seconds=1.0,
+        revalidation_cache=RevalidationCache(max_entries=8, max_bytes=1_000_000),
+    )
+    labels = {"endpoint": "performance_input"}
+    hits_before = _sample(
+        "lotus_report_upstream_revalidations_total", {**labels, "outcome": "not_modified"}
+    )
+    avoided_before = _sample("lotus_report_upstream_revalidation_bytes_avoided_total", labels)
+
+    first = await client.get_performance_input("P1", "2026-02-24")
+    second = await client.get_performance_input("P1", "2026-02-24")
+
+    assert first == second == (200, {"valuationPoints": [1, 2, 3]})
+    assert "If-None-Match" not in upstream.requests[0]
+    assert upstream.requests[1]["If-None-Match"] == '"pi-v1"'
+    assert (
+        _sample("lotus_report_upstream_revalidations_total", {**labels, "outcome": "not_modified"})
+        - hits_before
+        == 1
+    )
+    assert _sample(
+        "lotus_report_upstream_revalidation_bytes_avoided_total", labels
+    ) - avoided_before == len(upstream.body)
+
+
+@pytest.mark.asyncio
+async def test_pas_client_replaces_cached_core_snapshot_when_modified(monkeypatch):
+    upstream = _ConditionalUpstream({"snapshot": {"overview": {"v": 1}}}, etag='"s-v1"')
+    monkeypatch.setattr("app.clients.http_resilience._send", upstream)
+    monkeypatch.setattr("app.clients.pas_client.settings.upstream_stream_decode_enabled", False)
+    client = PasClient(
+        base_url="http://pas",
+        timeout_seconds=1.0,
+        revalidation_cache=RevalidationCache(max_entries=8, max_bytes=1_000_000),
+    )
+
+    await client.get_core_snapshot("P1", "2026-02-24", ["OVERVIEW"])
+    upstream.body = jsonlib.dumps({"snapshot": {"overview": {"v": 2}}}).encode("utf-8")
+    upstream.etag = '"s-v2"'
+    status, payload = await client.get_core_snapshot("P1", "2026-02-24", ["OVERVIEW"])
+    _, cached = await client.get_core_snapshot("P1", "2026-02-24", ["OVERVIEW"])
+
+    assert (status, payload) == (200, {"snapshot": {"overview": {"v": 2}}})
+    assert cached == payload
+    assert [request.get("If-None-Match") for request in upstream.requests] == [
+        None,
+        '"s-v1"',
+        '"s-v2"',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_pa_client_revalidates_pas_input_twr_with_last_modified(monkeypatch):
+    last_modified = "Tue, 24 Feb 2026 18:00:00 GMT"
+    upstream = _ConditionalUpstream({"results": []}, last_modified=last_modified)
+    monkeypatch.setattr("app.clients.http_resilience._send", upstream)
+    client = PaClient(
+        base_url="http://pa",
+        timeout_seconds=1.0,
+        revalidation_cache=RevalidationCache(max_entries=8, max_bytes=1_000_000),
+    )
+
+    await client.get_pas_input_twr("P1", "2026-02-24", ["YTD"])
+    status, payload = await client.get_pas_input_twr("P1", "2026-02-24", ["YTD"])
+
+    assert (status, payload) == (200, {"results": []})
+    assert upstream.requests[1]["If-Modified-Since"] == last_modified
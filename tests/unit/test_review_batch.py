@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.observability import default_deadline_seconds
+from app.services.reporting_read_service import ReportingReadService
+
+
+class _PasClient:
+    def __init__(self):
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_core_snapshot(self, portfolio_id, as_of_date, include_sections):
+        self.calls.append(portfolio_id)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if portfolio_id == "MISSING":
+            return 404, {"detail": "portfolio not found"}
+        if portfolio_id == "DROPPED":
+            raise httpx.RemoteProtocolError("Server disconnected without sending a response.")
+        if portfolio_id == "BROKEN":
+            raise RuntimeError("unexpected snapshot state")
+        return 200, {"snapshot": {"overview": {"portfolio": portfolio_id}}}
+
+
+def _service(pas_client: _PasClient) -> ReportingReadService:
+    return ReportingReadService(pas_client=pas_client, pa_client=object(), risk_client=object())
+
+
+@pytest.mark.asyncio
+async def test_review_batch_reports_each_portfolio_with_bounded_concurrency(monkeypatch):
+    monkeypatch.setattr("app.services.reporting_read_service.settings.review_batch_concurrency", 2)
+    pas_client = _PasClient()
+
+    response = await _service(pas_client).get_portfolio_reviews(
+        {
+            "portfolioIds": ["P1", "MISSING", "P2", "P1", "P3"],
+            "asOfDate": "2026-02-24",
+            "sections": ["OVERVIEW"],
+        },
+        None,
+    )
+
+    assert [item["portfolio_id"] for item in response["results"]] == ["P1", "MISSING", "P2", "P3"]
+    assert response["results"][0] == {
+        "portfolio_id": "P1",
+        "status": "COMPLETE",
+        "review": {
+            "portfolio_id": "P1",
+            "as_of_date": "2026-02-24",
+            "overview": {"portfolio": "P1"},
+        },
+    }
+    assert response["results"][1] == {
+        "portfolio_id": "MISSING",
+        "status": "FAILED",
+        "error": {"statusCode": 404, "detail": "portfolio not found"},
+    }
+    assert response["batchStatus"] == {"requested": 4, "complete": 3, "failed": 1}
+    assert sorted(pas_client.calls) == ["MISSING", "P1", "P2", "P3"]
+    assert pas_client.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_review_batch_reports_non_http_failures_per_portfolio(monkeypatch):
+    monkeypatch.setattr("app.services.reporting_read_service.settings.review_batch_concurrency", 2)
+    pas_client = _PasClient()
+
+    response = await _service(pas_client).get_portfolio_reviews(
+        {
+            "portfolioIds": ["P1", "DROPPED", "BROKEN", "P2"],
+            "asOfDate": "2026-02-24",
+            "sections": ["OVERVIEW"],
+        },
+        None,
+    )
+
+    results = {item["portfolio_id"]: item for item in response["results"]}
+    assert results["DROPPED"] == {
+        "portfolio_id": "DROPPED",
+        "status": "FAILED",
+        "error": {"statusCode": 502, "detail": "upstream request failed: RemoteProtocolError"},
+    }
+    assert results["BROKEN"]["error"] == {"statusCode": 500, "detail": "portfolio review failed"}
+    assert results["P1"]["status"] == results["P2"]["status"] == "COMPLETE"
+    assert response["batchStatus"] == {"requested": 4, "complete": 2, "failed": 2}
+
+
+@pytest.mark.asyncio
+async def test_review_batch_stream_yields_results_as_they_finish(monkeypatch):
+    monkeypatch.setattr("app.services.reporting_read_service.settings.review_batch_concurrency", 2)
+
+    class _UnevenPasClient(_PasClient):
+        async def get_core_snapshot(self, portfolio_id, as_of_date, include_sections):
+            snapshot = await super().get_core_snapshot(portfolio_id, as_of_date, include_sections)
+            if portfolio_id == "SLOW":
+                await asyncio.sleep(0.05)
+            return snapshot
+
+    pas_client = _UnevenPasClient()
+    stream = _service(pas_client).stream_portfolio_reviews(
+        {
+            "portfolio_ids": ["SLOW", "P1", "P2"],
+            "as_of_date": "2026-02-24",
+            "sections": ["OVERVIEW"],
+        },
+        None,
+    )
+
+    first = await anext(stream)
+    assert first["portfolio_id"] == "P1"
+    # Only the next queued portfolio starts once a result has been taken.
+    assert pas_client.calls == ["SLOW", "P1"]
+    lines = [first] + [line async for line in stream]
+    assert [line.get("portfolio_id") for line in lines] == ["P1", "P2", "SLOW", None]
+    assert lines[-1] == {
+        "as_of_date": "2026-02-24",
+        "batchStatus": {"requested": 3, "complete": 3, "failed": 0},
+    }
+
+
+@pytest.mark.asyncio
+async def test_review_batch_rejects_invalid_shared_requests(monkeypatch):
+    monkeypatch.setattr(
+        "app.services.reporting_read_service.settings.review_batch_max_portfolios", 2
+    )
+    service = _service(_PasClient())
+    invalid_requests = [
+        {"as_of_date": "2026-02-24"},
+        {"portfolio_ids": [], "as_of_date": "2026-02-24"},
+        {"portfolio_ids": ["P1", ""], "as_of_date": "2026-02-24"},
+        {"portfolio_ids": ["P1", "P2", "P3"], "as_of_date": "2026-02-24"},
+        {"portfolio_ids": ["P1"]},
+        {"portfolio_ids": ["P1"], "as_of_date": "2026-02-24", "risk_periods": ["SI"]},
+    ]
+
+    for request in invalid_requests:
+        with pytest.raises(HTTPException) as exc:
+            await service.get_portfolio_reviews(request, None)
+        assert exc.value.status_code == 422
+
+
+def test_review_batch_has_its_own_request_deadline(monkeypatch):
+    monkeypatch.setattr("app.observability.settings.review_batch_request_deadline_seconds", 90.0)
+
+    assert default_deadline_seconds("/reports/portfolios/review:batch") == 90.0
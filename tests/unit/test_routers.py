@@ -1,7 +1,15 @@
+import json
+
 import pytest
+from fastapi import HTTPException
 
 from app.routers.aggregations import get_portfolio_aggregation
-from app.routers.reports import _apply_section_limit, get_reporting_read_service
+from app.routers.reports import (
+    _apply_section_limit,
+    get_portfolio_review,
+    get_portfolio_reviews,
+    get_reporting_read_service,
+)
 from app.services.reporting_read_service import ReportingReadService
 
 
@@ -42,3 +50,136 @@ def test_apply_section_limit_keeps_non_list_sections():
     payload = {"sections": "ALL"}
     limited = _apply_section_limit(payload, section_limit=2)
     assert limited["sections"] == "ALL"
+
+
+class _BatchReviewServiceStub:
+    async def get_portfolio_reviews(self, request_payload: dict, correlation_id: str | None):
+        return {"request": request_payload, "correlation_id": correlation_id}
+
+
+@pytest.mark.asyncio
+async def test_review_batch_router_applies_section_limit():
+    response = await get_portfolio_reviews(
+        request={"portfolio_ids": ["P1"], "sections": ["OVERVIEW", "HOLDINGS"]},
+        section_limit=1,
+        service=_BatchReviewServiceStub(),
+        correlation_id="cid-batch",
+    )
+    assert response["request"]["sections"] == ["OVERVIEW"]
+    assert response["correlation_id"] == "cid-batch"
+
+
+class _StreamingReviewServiceStub:
+    async def stream_portfolio_review(self, portfolio_id, request_payload, correlation_id):
+        if portfolio_id == "P404":
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+        yield {"portfolio_id": portfolio_id, "as_of_date": request_payload["as_of_date"]}
+        yield {"overview": {"total_market_value": "100.25"}}
+
+    async def get_portfolio_review(self, portfolio_id, request_payload, correlation_id):
+        return {"portfolio_id": portfolio_id, "as_of_date": request_payload["as_of_date"]}
+
+
+@pytest.mark.asyncio
+async def test_review_router_streams_ndjson_when_accepted():
+    response = await get_portfolio_review(
+        portfolio_id="P1",
+        request={"as_of_date": "2026-02-24"},
+        section_limit=10,
+        service=_StreamingReviewServiceStub(),
+        correlation_id=None,
+        accept="application/x-ndjson",
+    )
+    assert response.media_type == "application/x-ndjson"
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {"portfolio_id": "P1", "as_of_date": "2026-02-24"},
+        {"overview": {"total_market_value": "100.25"}},
+    ]
+
+    with pytest.raises(HTTPException) as exc:
+        await get_portfolio_review(
+            portfolio_id="P404",
+            request={"as_of_date": "2026-02-24"},
+            section_limit=10,
+            service=_StreamingReviewServiceStub(),
+            correlation_id=None,
+            accept="application/x-ndjson",
+        )
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "accept",
+    [
+        "application/json, application/x-ndjson;q=0",
+        "application/x-ndjson;q=0.5, */*",
+        "application/x-ndjson-seq",
+    ],
+)
+async def test_review_router_returns_json_when_ndjson_is_not_preferred(accept):
+    response = await get_portfolio_review(
+        portfolio_id="P1",
+        request={"as_of_date": "2026-02-24"},
+        section_limit=10,
+        service=_StreamingReviewServiceStub(),
+        correlation_id=None,
+        accept=accept,
+    )
+    assert response == {"portfolio_id": "P1", "as_of_date": "2026-02-24"}
+
+    batch = await get_portfolio_reviews(
+        request={"portfolio_ids": ["P1"]},
+        section_limit=10,
+        service=_BatchReviewServiceStub(),
+        correlation_id=None,
+        accept=accept,
+    )
+    assert batch["request"] == {"portfolio_ids": ["P1"]}
+
+
+@pytest.mark.asyncio
+async def test_review_router_pushes_sections_as_server_sent_events():
+    response = await get_portfolio_review(
+        portfolio_id="P1",
+        request={"as_of_date": "2026-02-24"},
+        section_limit=10,
+        service=_StreamingReviewServiceStub(),
+        correlation_id=None,
+        accept="text/event-stream",
+    )
+    assert response.media_type == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    body = b"".join([chunk async for chunk in response.body_iterator]).decode()
+    events = [
+        (event.split("\n")[0].removeprefix("event: "), json.loads(event.split("\n")[1][6:]))
+        for event in body.strip().split("\n\n")
+    ]
+    assert events == [
+        ("review", {"portfolio_id": "P1", "as_of_date": "2026-02-24"}),
+        ("section", {"section": "overview", "data": {"total_market_value": "100.25"}}),
+        ("complete", {"sectionStatus": {}}),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("accept", "media_type"),
+    [
+        ("application/x-ndjson, text/event-stream;q=0.1", "application/x-ndjson"),
+        ("application/x-ndjson;q=0.5, text/event-stream", "text/event-stream"),
+        ("text/event-stream;q=0, application/x-ndjson;q=0.2", "application/x-ndjson"),
+        ("application/x-ndjson, text/event-stream", "text/event-stream"),
+    ],
+)
+async def test_review_router_picks_the_stream_format_with_the_highest_q_value(accept, media_type):
+    response = await get_portfolio_review(
+        portfolio_id="P1",
+        request={"as_of_date": "2026-02-24"},
+        section_limit=10,
+        service=_StreamingReviewServiceStub(),
+        correlation_id=None,
+        accept=accept,
+    )
+    assert response.media_type == media_type
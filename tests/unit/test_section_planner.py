@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from app.services.section_planner import SectionFetch, SectionPlanner
+
+
+def _const(value):
+    async def _run(inputs):
+        return value
+
+    return _run
+
+
+@pytest.mark.asyncio
+async def test_planner_runs_independent_fetches_concurrently():
+    first_started = asyncio.Event()
+    second_started = asyncio.Event()
+
+    async def _first(inputs):
+        first_started.set()
+        await asyncio.wait_for(second_started.wait(), timeout=1.0)
+        return "first"
+
+    async def _second(inputs):
+        second_started.set()
+        await asyncio.wait_for(first_started.wait(), timeout=1.0)
+        return "second"
+
+    planner = SectionPlanner([SectionFetch("first", _first), SectionFetch("second", _second)])
+    results = await planner.run(["first", "second"])
+    assert results == {"first": "first", "second": "second"}
+
+
+@pytest.mark.asyncio
+async def test_planner_passes_dependency_results_and_prunes_unrequested_fetches():
+    calls: list[str] = []
+
+    async def _base(inputs):
+        calls.append("base")
+        return 2
+
+    async def _derived(inputs):
+        calls.append("derived")
+        return inputs["base"] * 10
+
+    async def _unused(inputs):
+        calls.append("unused")
+        return None
+
+    planner = SectionPlanner(
+        [
+            SectionFetch("derived", _derived, ("base",)),
+            SectionFetch("base", _base),
+            SectionFetch("unused", _unused),
+        ]
+    )
+    results = await planner.run(["derived"])
+    assert results == {"base": 2, "derived": 20}
+    assert calls == ["base", "derived"]
+
+
+@pytest.mark.asyncio
+async def test_planner_failure_cancels_in_flight_fetches():
+    cancelled = asyncio.Event()
+
+    async def _slow(inputs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def _failing(inputs):
+        await asyncio.sleep(0)
+        raise LookupError("not found")
+
+    planner = SectionPlanner([SectionFetch("slow", _slow), SectionFetch("failing", _failing)])
+    with pytest.raises(LookupError):
+        await planner.run(["slow", "failing"])
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_planner_yields_targets_as_they_complete():
+    release_slow = asyncio.Event()
+
+    async def _slow(inputs):
+        await asyncio.wait_for(release_slow.wait(), timeout=1.0)
+        return "slow"
+
+    async def _fast(inputs):
+        return "fast"
+
+    planner = SectionPlanner([SectionFetch("slow", _slow), SectionFetch("fast", _fast)])
+    completed = []
+    async for target, result in planner.as_completed(["slow", "fast"]):
+        completed.append((target, result))
+        release_slow.set()
+    assert completed == [("fast", "fast"), ("slow", "slow")]
+
+
+@pytest.mark.asyncio
+async def test_planner_cancels_in_flight_fetches_when_iteration_stops():
+    cancelled = asyncio.Event()
+
+    async def _hang(inputs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    planner = SectionPlanner([SectionFetch("hang", _hang), SectionFetch("fast", _const(1))])
+    stream = planner.as_completed(["hang", "fast"])
+    assert await anext(stream) == ("fast", 1)
+    await stream.aclose()
+    assert cancelled.is_set()
+
+
+def test_planner_resolves_dependencies_in_topological_order():
+    planner = SectionPlanner(
+        [
+            SectionFetch("c", _const(3), ("a", "b")),
+            SectionFetch("b", _const(2), ("a",)),
+            SectionFetch("a", _const(1)),
+        ]
+    )
+    assert planner.resolve(["c"]) == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize(
+    "fetches",
+    [
+        [SectionFetch("a", _const(1), ("missing",))],
+        [SectionFetch("a", _const(1), ("b",)), SectionFetch("b", _const(2), ("a",))],
+        [SectionFetch("a", _const(1)), SectionFetch("a", _const(2))],
+    ],
+)
+def test_planner_rejects_invalid_graphs(fetches):
+    with pytest.raises(ValueError):
+        SectionPlanner(fetches)
+
+
+def test_planner_rejects_unknown_targets():
+    planner = SectionPlanner([SectionFetch("a", _const(1))])
+    with pytest.raises(ValueError):
+        planner.resolve(["b"])
@@ -0,0 +1,152 @@
+import asyncio
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.single_flight import SingleFlight, single_flight_key
+from app.observability import DEADLINE_EXCEEDED_DETAIL, deadline_var
+
+
+def _calls(endpoint: str, outcome: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "lotus_report_upstream_single_flight_total",
+        {"endpoint": endpoint, "outcome": outcome},
+    )
+    return value or 0.0
+
+
+class _GatedUpstream:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        self.deadline = deadline_var.get()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return 200, {"snapshot": {"overview": {}}}
+
+
+def test_single_flight_key_normalizes_body_ordering():
+    first = single_flight_key("core_snapshot", "P1", "2026-02-24", {"a": 1, "b": [1, 2]})
+    second = single_flight_key("core_snapshot", "P1", "2026-02-24", {"b": [1, 2], "a": 1})
+    assert first == second
+    assert first != single_flight_key("core_snapshot", "P2", "2026-02-24", {"a": 1, "b": [1, 2]})
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_identical_calls():
+    flight = SingleFlight()
+    upstream = _GatedUpstream()
+    hits_before = _calls("sf_test_coalesce", "hit")
+    misses_before = _calls("sf_test_coalesce", "miss")
+
+    waiters = [
+        asyncio.create_task(flight.do("key", upstream, endpoint="sf_test_coalesce"))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert upstream.calls == 1
+    assert results[0] is results[1] is results[2]
+    assert flight.in_flight() == 0
+    assert _calls("sf_test_coalesce", "hit") - hits_before == 2
+    assert _calls("sf_test_coalesce", "miss") - misses_before == 1
+
+
+@pytest.mark.asyncio
+async def test_single_flight_does_not_share_distinct_keys():
+    flight = SingleFlight()
+    upstream = _GatedUpstream()
+    upstream.release.set()
+
+    await asyncio.gather(
+        flight.do("a", upstream, endpoint="sf_test_distinct"),
+        flight.do("b", upstream, endpoint="sf_test_distinct"),
+    )
+    assert upstream.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_flight_propagates_errors_to_every_waiter():
+    flight = SingleFlight()
+
+    async def _failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("key", _failing, endpoint="sf_test_error"),
+        flight.do("key", _failing, endpoint="sf_test_error"),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_cancelled_original_caller():
+    flight = SingleFlight()
+    upstream = _GatedUpstream()
+
+    leader = asyncio.create_task(flight.do("key", upstream, endpoint="sf_test_cancel"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("key", upstream, endpoint="sf_test_cancel"))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    assert await follower == (200, {"snapshot": {"overview": {}}})
+    assert leader.cancelled()
+    assert upstream.cancelled is False
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_upstream_when_all_callers_leave():
+    flight = SingleFlight()
+    upstream = _GatedUpstream()
+
+    waiter = asyncio.create_task(flight.do("key", upstream, endpoint="sf_test_abandon"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    await asyncio.sleep(0)
+
+    assert upstream.cancelled is True
+    assert flight.in_flight() == 0
+
+
+async def _within(seconds, flight, upstream):
+    deadline_var.set(None if seconds is None else time.monotonic() + seconds)
+    return await flight.do("key", upstream, endpoint="sf_test_deadline")
+
+
+@pytest.mark.asyncio
+async def test_single_flight_bounds_each_waiter_by_its_own_deadline():
+    flight = SingleFlight()
+    upstream = _GatedUpstream()
+
+    short_leader = asyncio.create_task(_within(0.01, flight, upstream))
+    await asyncio.sleep(0)
+    unbounded = asyncio.create_task(_within(None, flight, upstream))
+    short_joiner = asyncio.create_task(_within(0.02, flight, upstream))
+
+    assert await short_leader == (504, {"detail": DEADLINE_EXCEEDED_DETAIL})
+    assert await short_joiner == (504, {"detail": DEADLINE_EXCEEDED_DETAIL})
+    upstream.release.set()
+
+    assert await unbounded == (200, {"snapshot": {"overview": {}}})
+    assert upstream.calls == 1
+    assert upstream.deadline is None
+    assert upstream.cancelled is False
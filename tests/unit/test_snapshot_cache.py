@@ -0,0 +1,148 @@
+import pytest
+
+from app.clients.pas_client import PasClient
+from app.clients.snapshot_cache import CoreSnapshotCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _payload(**sections):
+    return {"portfolioId": "P1", "snapshot": dict(sections)}
+
+
+def test_cache_serves_subset_from_cached_superset():
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=8, clock=_Clock())
+    cache.store(
+        "P1",
+        "2026-02-24",
+        ["OVERVIEW", "ALLOCATION", "HOLDINGS"],
+        _payload(overview={"total_market_value": 10.0}, allocation={}, holdings={"h": []}),
+    )
+
+    cached, missing = cache.lookup("P1", "2026-02-24", ["OVERVIEW", "HOLDINGS"])
+    assert missing == []
+    assert cached == {
+        "portfolioId": "P1",
+        "snapshot": {"overview": {"total_market_value": 10.0}, "holdings": {"h": []}},
+    }
+
+
+def test_cache_reports_missing_sections_and_merges_incremental_fetch():
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=8, clock=_Clock())
+    cache.store("P1", "2026-02-24", ["OVERVIEW"], _payload(overview={"a": 1}))
+
+    cached, missing = cache.lookup("P1", "2026-02-24", ["OVERVIEW", "TRANSACTIONS"])
+    assert cached is None
+    assert missing == ["TRANSACTIONS"]
+
+    cache.store("P1", "2026-02-24", ["TRANSACTIONS"], _payload(transactions={"t": []}))
+    merged = cache.get("P1", "2026-02-24", ["OVERVIEW", "TRANSACTIONS"])
+    assert merged["snapshot"] == {"overview": {"a": 1}, "transactions": {"t": []}}
+
+
+def test_cache_expires_entries_after_ttl_without_extending_on_merge():
+    clock = _Clock()
+    cache = CoreSnapshotCache(ttl_seconds=10.0, max_entries=8, clock=clock)
+    cache.store("P1", "2026-02-24", ["OVERVIEW"], _payload(overview={}))
+
+    clock.now = 8.0
+    cache.store("P1", "2026-02-24", ["HOLDINGS"], _payload(holdings={}))
+    clock.now = 10.5
+
+    cached, missing = cache.lookup("P1", "2026-02-24", ["HOLDINGS"])
+    assert cached is None
+    assert missing == ["HOLDINGS"]
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used_entry_at_capacity():
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=2, clock=_Clock())
+    cache.store("P1", "2026-02-24", ["OVERVIEW"], _payload(overview={}))
+    cache.store("P2", "2026-02-24", ["OVERVIEW"], _payload(overview={}))
+    cache.lookup("P1", "2026-02-24", ["OVERVIEW"])
+    cache.store("P3", "2026-02-24", ["OVERVIEW"], _payload(overview={}))
+
+    assert cache.get("P1", "2026-02-24", ["OVERVIEW"]) is not None
+    assert cache.get("P2", "2026-02-24", ["OVERVIEW"]) is None
+    assert len(cache) == 2
+
+
+def test_cache_invalidate_by_portfolio_and_date():
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=8, clock=_Clock())
+    cache.store("P1", "2026-02-23", ["OVERVIEW"], _payload(overview={}))
+    cache.store("P1", "2026-02-24", ["OVERVIEW"], _payload(overview={}))
+    cache.store("P2", "2026-02-24", ["OVERVIEW"], _payload(overview={}))
+
+    assert cache.invalidate("P1", "2026-02-24") == 1
+    assert cache.invalidate("P1") == 1
+    assert cache.get("P2", "2026-02-24", ["OVERVIEW"]) is not None
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize(
+    ("ttl_seconds", "max_entries", "sections"),
+    [(0.0, 8, ["OVERVIEW"]), (30.0, 0, ["OVERVIEW"]), (30.0, 8, ["OVERVIEW", "UNKNOWN"])],
+)
+def test_cache_bypasses_when_disabled_or_sections_unknown(ttl_seconds, max_entries, sections):
+    cache = CoreSnapshotCache(ttl_seconds=ttl_seconds, max_entries=max_entries, clock=_Clock())
+    cache.store("P1", "2026-02-24", sections, _payload(overview={}))
+    cached, missing = cache.lookup("P1", "2026-02-24", sections)
+    assert cached is None
+    assert missing == sections
+
+
+def test_cache_ignores_payloads_without_snapshot():
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=8, clock=_Clock())
+    cache.store("P1", "2026-02-24", ["OVERVIEW"], {"detail": "unexpected"})
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_pas_client_fetches_only_missing_sections(monkeypatch):
+    calls: list[list[str]] = []
+
+    async def _fake_post_with_retry(**kwargs):
+        sections = kwargs["json_body"]["includeSections"]
+        calls.append(sections)
+        snapshot = {section.lower(): {"from": "upstream"} for section in sections}
+        return 200, {"snapshot": snapshot}
+
+    monkeypatch.setattr("app.clients.pas_client.post_with_retry", _fake_post_with_retry)
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=8, clock=_Clock())
+    client = PasClient(base_url="http://pas", timeout_seconds=1.0, snapshot_cache=cache)
+
+    await client.get_core_snapshot("P-CACHE", "2026-02-24", ["OVERVIEW", "HOLDINGS"])
+    status_code, payload = await client.get_core_snapshot(
+        "P-CACHE", "2026-02-24", ["OVERVIEW", "ALLOCATION"]
+    )
+    await client.get_core_snapshot("P-CACHE", "2026-02-24", ["ALLOCATION"])
+
+    assert calls == [["OVERVIEW", "HOLDINGS"], ["ALLOCATION"]]
+    assert status_code == 200
+    assert set(payload["snapshot"]) == {"overview", "allocation"}
+
+
+@pytest.mark.asyncio
+async def test_pas_client_does_not_cache_upstream_failures(monkeypatch):
+    calls: list[list[str]] = []
+
+    async def _fake_post_with_retry(**kwargs):
+        calls.append(kwargs["json_body"]["includeSections"])
+        return 503, {"detail": "down"}
+
+    monkeypatch.setattr("app.clients.pas_client.post_with_retry", _fake_post_with_retry)
+    cache = CoreSnapshotCache(ttl_seconds=30.0, max_entries=8, clock=_Clock())
+    client = PasClient(base_url="http://pas", timeout_seconds=1.0, snapshot_cache=cache)
+
+    for _ in range(2):
+        status_code, _ = await client.get_core_snapshot("P-FAIL", "2026-02-24", ["OVERVIEW"])
+        assert status_code == 503
+    assert len(calls) == 2
+    assert len(cache) == 0
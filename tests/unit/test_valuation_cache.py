@@ -0,0 +1,220 @@
+from datetime import date, timedelta
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.clients.pas_client import PasClient
+from app.clients.valuation_cache import ValuationSeriesCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _sample(name: str, labels: dict[str, str] | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+class _Upstream:
+    """Performance input source whose history can be extended or restated between reads."""
+
+    def __init__(self, last_day: str, days: int = 30):
+        last = date.fromisoformat(last_day)
+        self.values = {last - timedelta(days=offset): 100.0 + offset for offset in range(days)}
+        self.lookbacks: list[int] = []
+
+    async def fetch(self, as_of_date: str, lookback_days: int):
+        self.lookbacks.append(lookback_days)
+        as_of = date.fromisoformat(as_of_date)
+        start = as_of - timedelta(days=lookback_days - 1)
+        days = sorted(day for day in self.values if start <= day <= as_of)
+        points = [
+            {
+                "day": number,
+                "perf_date": day.isoformat(),
+                "begin_mv": self.values[day],
+                "end_mv": self.values[day] + 1,
+            }
+            for number, day in enumerate(days, start=1)
+        ]
+        return 200, {
+            "portfolioId": "P1",
+            "performanceStartDate": "2025-12-01",
+            "valuationPoints": points,
+        }
+
+
+def _load(cache: ValuationSeriesCache, upstream: _Upstream, as_of_date: str, lookback_days: int):
+    return cache.load(
+        "P1", as_of_date, lookback_days, lambda days: upstream.fetch(as_of_date, days)
+    )
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_fetches_only_new_days():
+    upstream = _Upstream("2026-01-30")
+    cache = ValuationSeriesCache(
+        max_entries=8, max_bytes=1 << 20, restatement_days=3, max_age_seconds=3600
+    )
+    delta_before = _sample("lotus_report_valuation_series_fetches_total", {"mode": "delta"})
+
+    first = await _load(cache, upstream, "2026-01-30", 20)
+    upstream.values[date(2026, 1, 31)] = 90.0
+    upstream.values[date(2026, 2, 1)] = 91.0
+    second = await _load(cache, upstream, "2026-02-01", 22)
+
+    assert upstream.lookbacks == [20, 5]
+    assert second == (await upstream.fetch("2026-02-01", 22))
+    assert first[1]["valuationPoints"] == second[1]["valuationPoints"][:20]
+    assert _sample("lotus_report_valuation_series_fetches_total", {"mode": "delta"}) == (
+        delta_before + 1
+    )
+    assert _sample("lotus_report_valuation_series_cache_bytes") == cache.size_bytes > 0
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_refetches_restated_history():
+    upstream = _Upstream("2026-01-30")
+    cache = ValuationSeriesCache(
+        max_entries=8, max_bytes=1 << 20, restatement_days=3, max_age_seconds=3600
+    )
+    restated_before = _sample("lotus_report_valuation_series_fetches_total", {"mode": "restated"})
+
+    await _load(cache, upstream, "2026-01-30", 20)
+    upstream.values[date(2026, 1, 29)] = 55.5
+    upstream.values[date(2026, 1, 31)] = 90.0
+    status_code, payload = await _load(cache, upstream, "2026-01-31", 21)
+
+    assert status_code == 200
+    assert upstream.lookbacks == [20, 4, 21]
+    assert payload == (await upstream.fetch("2026-01-31", 21))[1]
+    assert _sample("lotus_report_valuation_series_fetches_total", {"mode": "restated"}) == (
+        restated_before + 1
+    )
+    await _load(cache, upstream, "2026-01-31", 21)
+    assert upstream.lookbacks[-1] == 3
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_refetches_history_older_than_max_age():
+    upstream = _Upstream("2026-01-30")
+    clock = _Clock()
+    cache = ValuationSeriesCache(
+        max_entries=8, max_bytes=1 << 20, restatement_days=3, max_age_seconds=60, clock=clock
+    )
+    expired_before = _sample("lotus_report_valuation_series_fetches_total", {"mode": "expired"})
+
+    await _load(cache, upstream, "2026-01-30", 20)
+    upstream.values[date(2026, 1, 15)] = 55.5
+    clock.now = 59.0
+    stale = await _load(cache, upstream, "2026-01-30", 20)
+    clock.now = 60.0
+    status_code, payload = await _load(cache, upstream, "2026-01-30", 20)
+
+    assert upstream.lookbacks == [20, 3, 20]
+    assert stale[1]["valuationPoints"][4]["begin_mv"] == 115.0
+    assert status_code == 200
+    assert payload["valuationPoints"][4]["begin_mv"] == 55.5
+    assert _sample("lotus_report_valuation_series_fetches_total", {"mode": "expired"}) == (
+        expired_before + 1
+    )
+    clock.now = 61.0
+    await _load(cache, upstream, "2026-01-30", 20)
+    assert upstream.lookbacks[-1] == 3
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_fetches_full_history_for_wider_windows():
+    upstream = _Upstream("2026-01-30")
+    cache = ValuationSeriesCache(
+        max_entries=1, max_bytes=1 << 20, restatement_days=3, max_age_seconds=3600
+    )
+
+    await _load(cache, upstream, "2026-01-30", 10)
+    await _load(cache, upstream, "2026-01-30", 20)
+    await _load(cache, upstream, "2026-01-30", 15)
+    assert upstream.lookbacks == [10, 20, 3]
+
+    await cache.load("P2", "2026-01-30", 10, lambda days: upstream.fetch("2026-01-30", days))
+    assert len(cache) == 1
+    await _load(cache, upstream, "2026-01-30", 10)
+    assert upstream.lookbacks[-1] == 10
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_rebuilds_points_identical_to_a_fresh_fetch():
+    upstream = _Upstream("2026-01-30")
+    upstream.values = {day: int(value) for day, value in upstream.values.items()}
+    cache = ValuationSeriesCache(
+        max_entries=8, max_bytes=1 << 20, restatement_days=3, max_age_seconds=3600
+    )
+
+    await _load(cache, upstream, "2026-01-30", 20)
+    upstream.values[date(2026, 1, 31)] = 90
+    served = await _load(cache, upstream, "2026-01-31", 12)
+    fresh = await upstream.fetch("2026-01-31", 12)
+
+    assert upstream.lookbacks[:2] == [20, 4]
+    assert served == fresh
+    assert [type(point["begin_mv"]) for point in served[1]["valuationPoints"]] == [int] * 12
+    assert served[1]["valuationPoints"][0]["day"] == 1
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_refetches_when_number_types_change():
+    upstream = _Upstream("2026-01-30")
+    cache = ValuationSeriesCache(
+        max_entries=8, max_bytes=1 << 20, restatement_days=3, max_age_seconds=3600
+    )
+
+    await _load(cache, upstream, "2026-01-30", 20)
+    upstream.values = {day: int(value) for day, value in upstream.values.items()}
+    upstream.values[date(2026, 1, 31)] = 90
+    served = await _load(cache, upstream, "2026-01-31", 21)
+
+    assert upstream.lookbacks == [20, 4, 21]
+    assert served == (await upstream.fetch("2026-01-31", 21))
+
+
+@pytest.mark.asyncio
+async def test_valuation_series_cache_bypasses_unsupported_points():
+    cache = ValuationSeriesCache(
+        max_entries=8, max_bytes=1 << 20, restatement_days=3, max_age_seconds=3600
+    )
+    calls: list[int] = []
+
+    async def fetch(days: int):
+        calls.append(days)
+        return 200, {"valuationPoints": [{"perf_date": "2026-01-30", "end_mv": "101.00"}]}
+
+    for _ in range(2):
+        assert (await cache.load("P1", "2026-01-30", 10, fetch))[0] == 200
+    assert calls == [10, 10]
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_pas_client_reads_performance_input_through_valuation_cache(monkeypatch):
+    upstream = _Upstream("2026-01-30")
+    client = PasClient(
+        "http://pas",
+        1.0,
+        valuation_cache=ValuationSeriesCache(
+            max_entries=8, max_bytes=1 << 20, restatement_days=2, max_age_seconds=3600
+        ),
+    )
+
+    async def fetch(portfolio_id, as_of_date, lookback_days):
+        return await upstream.fetch(as_of_date, lookback_days)
+
+    monkeypatch.setattr(client, "_fetch_performance_input", fetch)
+    await client.get_performance_input("P1", "2026-01-30", lookback_days=20)
+    status_code, payload = await client.get_performance_input("P1", "2026-01-30", 20)
+
+    assert status_code == 200
+    assert upstream.lookbacks == [20, 2]
+    assert len(payload["valuationPoints"]) == 20